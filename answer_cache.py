@@ -0,0 +1,175 @@
+import hashlib
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from cachetools import TTLCache
+from sqlalchemy.exc import SQLAlchemyError
+from models import db, ChatAnswerCacheModel
+from chatbot_Gem import answer_rule_question, stream_rule_question, fast_answer, rules_text
+
+# Two-tier cache for chatbot answers: an in-process LRU with a TTL in front of
+# the chat_answer_cache table. Keys include a hash of the regulation text, so
+# editing Internal_Regulation_EN.txt invalidates every old answer.
+
+CHAT_CACHE_SIZE = int(os.getenv("CHAT_CACHE_SIZE", 1024))
+CHAT_CACHE_TTL = int(os.getenv("CHAT_CACHE_TTL", 3600))
+CHAT_CACHE_DB_TTL_DAYS = int(os.getenv("CHAT_CACHE_DB_TTL_DAYS", 30))
+
+rules_hash = hashlib.sha256(rules_text.encode("utf-8")).hexdigest()
+
+_memory = TTLCache(maxsize=CHAT_CACHE_SIZE, ttl=CHAT_CACHE_TTL)
+_lock = threading.Lock()
+_stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+PUNCT_RE = re.compile(r"[^\w\s.]|(?<!\d)\.|\.(?!\d)")
+
+
+def _canonical_number(match):
+    value = float(match.group(0))
+    return ("%f" % value).rstrip("0").rstrip(".")
+
+
+def normalize_question(question):
+    text = question.lower()
+    text = PUNCT_RE.sub(" ", text)
+    text = NUMBER_RE.sub(_canonical_number, text)
+    return " ".join(text.split())
+
+
+def cache_key(question):
+    normalized = normalize_question(question)
+    return hashlib.sha256(f"{rules_hash}:{normalized}".encode("utf-8")).hexdigest()
+
+
+def _count(name):
+    with _lock:
+        _stats[name] += 1
+
+
+def get_cached_answer(question):
+    key = cache_key(question)
+    with _lock:
+        result = _memory.get(key)
+    if result is not None:
+        _count("memory_hits")
+        return result
+
+    try:
+        row = ChatAnswerCacheModel.query.filter_by(cache_key=key, rules_hash=rules_hash).first()
+        cutoff = datetime.now(timezone.utc) - timedelta(days=CHAT_CACHE_DB_TTL_DAYS)
+        if row and (row.created_at is None or row.created_at >= cutoff):
+            result = {"answer": row.answer, "articles": row.articles or []}
+            ChatAnswerCacheModel.query.filter_by(cache_key=key).update(
+                {ChatAnswerCacheModel.hits: ChatAnswerCacheModel.hits + 1}
+            )
+            db.session.commit()
+            with _lock:
+                _memory[key] = result
+            _count("db_hits")
+            return result
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        _count("errors")
+        print("Answer cache lookup failed:", str(e))
+
+    _count("misses")
+    return None
+
+
+def store_answer(question, result):
+    key = cache_key(question)
+    value = {"answer": result["answer"], "articles": result.get("articles", [])}
+    with _lock:
+        _memory[key] = value
+    try:
+        row = db.session.get(ChatAnswerCacheModel, key)
+        if row:
+            row.answer = value["answer"]
+            row.articles = value["articles"]
+            row.created_at = datetime.now(timezone.utc)
+        else:
+            db.session.add(ChatAnswerCacheModel(
+                cache_key=key,
+                rules_hash=rules_hash,
+                question=normalize_question(question),
+                answer=value["answer"],
+                articles=value["articles"],
+            ))
+        db.session.commit()
+        _count("stores")
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        _count("errors")
+        print("Answer cache store failed:", str(e))
+
+
+def is_standalone(history):
+    # Follow-up questions depend on the conversation, so only a session's first question is cached
+    return not any(sender == "user" for sender, _ in (history or []))
+
+
+def cached_answer_rule_question(question, timeout=None, history=None):
+    fast = fast_answer(question)
+    if fast is not None:
+        return dict(fast, cached=False)
+
+    standalone = is_standalone(history)
+    if standalone:
+        result = get_cached_answer(question)
+        if result is not None:
+            return dict(result, cached=True, prompt_tokens=0)
+
+    result = answer_rule_question(question, timeout=timeout, history=history)
+    if standalone:
+        store_answer(question, result)
+    return dict(result, cached=False)
+
+
+def _store_when_complete(question, articles, parts):
+    collected = []
+    for part in parts:
+        collected.append(part)
+        yield part
+    # Only reached when the stream ran to the end; a closed or failed stream stores nothing
+    answer = "".join(collected).strip()
+    if answer:
+        store_answer(question, {"answer": answer, "articles": articles})
+
+
+def stream_cached_answer_rule_question(question, history=None):
+    """Streaming counterpart of cached_answer_rule_question.
+
+    Returns (articles, stats, cached, parts). A fresh answer is cached once
+    `parts` has been read to the end, and only if it is not empty.
+    """
+    fast = fast_answer(question)
+    if fast is not None:
+        return fast["articles"], {"prompt_tokens": 0}, False, iter([fast["answer"]])
+
+    standalone = is_standalone(history)
+    if standalone:
+        result = get_cached_answer(question)
+        if result is not None:
+            return result["articles"], {"prompt_tokens": 0}, True, iter([result["answer"]])
+
+    articles, stats, parts = stream_rule_question(question, history=history)
+    if standalone:
+        parts = _store_when_complete(question, articles, parts)
+    return articles, stats, False, parts
+
+
+def cache_stats():
+    with _lock:
+        stats = dict(_stats)
+        stats["memory_size"] = len(_memory)
+    lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+    stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 4) if lookups else 0.0
+    stats["rules_hash"] = rules_hash
+    return stats
+
+
+def clear_memory_cache():
+    with _lock:
+        _memory.clear()
@@ -1,26 +1,38 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_migrate import Migrate
 from flask_restful import Resource, Api, reqparse, fields, marshal_with, abort
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_cors import CORS
 from datetime import datetime, timezone
-from werkzeug.utils import secure_filename
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, aliased
 from sqlalchemy import func 
-from sqlalchemy import text
-import google.generativeai as genai
 import os
+from dotenv import load_dotenv
+# Before the local imports: several modules read their settings at import time
+load_dotenv()
 import uuid
 import base64
+import json
 from models import db, UserRole, ComplaintStatus, SessionStatus, SenderType, ComplaintType, ComplaintDep, SuggestionStatus
 from models import NotificationModel, ComplaintModel, SuggestionModel, ChatMessageModel, ChatSessionModel, UserModel
-from chatbot_Gem import ask_rule_question
+from answer_cache import cached_answer_rule_question, stream_cached_answer_rule_question, get_cached_answer, store_answer, cache_stats, normalize_question
+from chatbot_Gem import answer_rule_question, fast_answer
+from chat_turns import submit_turn, run_batch, wait_for_turn, turn_metrics, QueueFull, DeadlineExceeded
 from email_utils import send_notification_email
-from dotenv import load_dotenv
+from notification_retention import run_maintenance as maintain_notifications
+from notifications import notify_admins, backfill_admin_notifications, notification_changes, decode_sync_cursor, mark_notifications_read, NOTIFICATIONS_MARK_READ_MAX_IDS
+import notification_stream
+from identity_cache import lookup_user, identity_cache_stats, invalidate as invalidate_identity
+from auth_tokens import issue_token, verify_token, caller_identity, token_required, bearer_token, AUTH_TOKEN_MAX_AGE
+from passwords import hash_password, verify_password, needs_rehash
+from counters import read_counters, reconcile_counters, read_user_counters, reconcile_user_counters, COMPLAINTS, SUGGESTIONS, STUDENTS, UNREAD_NOTIFICATIONS
+from uploads import init_uploads, store_upload, public_upload_url, serve_upload
+from pagination import decode_cursor, page_limit, parse_date, parse_enum, keyset_filter, next_cursor
+from collection_versions import list_etag, not_modified, with_etag, GLOBAL_SCOPE, COMPLAINTS as COMPLAINTS_LIST, SUGGESTIONS as SUGGESTIONS_LIST, NOTIFICATIONS as NOTIFICATIONS_LIST, CHAT_SESSIONS as CHAT_SESSIONS_LIST
 import re
 import random
+import time
+import queue
 print("PORT from environment:", os.environ.get("PORT"))
-load_dotenv()
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -28,6 +40,7 @@ def allowed_file(filename):
 app = Flask(__name__, static_folder='static')
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SECRET_KEY'] = os.getenv('SECRET_KEY')
 
 
 db.init_app(app)
@@ -41,6 +54,7 @@ ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'pdf', 'docx'}
 
 app.config['SUGGESTION_UPLOAD_FOLDER'] = os.path.join(app.root_path, 'static/uploads/suggestions')
 app.config['COMPLAINT_UPLOAD_FOLDER'] = os.path.join(app.root_path, 'static/uploads/complaints')
+init_uploads(app, os.path.join(app.root_path, 'static/uploads'))
 
 user_args = reqparse.RequestParser()
 user_args.add_argument('name', type = str, required = True, help = "Name cannot be blank")
@@ -66,10 +80,11 @@ class Users(Resource):
     def post(self):
         args = user_args.parse_args()
         user = UserModel(users_name = args["name"], users_email = args["email"],
-                         users_password = generate_password_hash(args["password"]),
+                         users_password = hash_password(args["password"]),
                          users_role=UserRole(args["role"]) if args["role"] else UserRole.student)
         db.session.add(user)
         db.session.commit()
+        invalidate_identity(args["email"])
         users = UserModel.query.all()
         return users, 201
     
@@ -96,7 +111,7 @@ def login():
     func.lower(UserModel.users_email) == func.lower(email)
     ).first()
 
-    if not user or not check_password_hash(user.users_password, password):
+    if not user or not verify_password(user.users_password, password):
         return jsonify({"message": "Invalid email or password"}), 401
 
     if user.users_role.name.lower() == "student":
@@ -109,31 +124,29 @@ def login():
     if not re.search(r"[A-Za-z]", password) or not re.search(r"[0-9]", password):
         return jsonify({"message": "Password must contain both letters and numbers"}), 400
 
+    # Upgrade hashes made with an older PASSWORD_HASH_METHOD while we have the plaintext
+    if needs_rehash(user.users_password):
+        user.users_password = hash_password(password)
+        db.session.commit()
+
     return jsonify({
         "message": "Login successful",
         "email": user.users_email,
-        "role": user.users_role.name
+        "role": user.users_role.name,
+        "token": issue_token(user),
+        "expires_in": AUTH_TOKEN_MAX_AGE
     }), 200  
 @app.route("/api/admin/dashboard_stats", methods=["GET"])
 def dashboard_stats():
     try:
-        db.session.execute(text('SELECT 1'))  # connection check
-
-        complaints_count = db.session.execute(text("SELECT COUNT(*) FROM complaints")).scalar()
-        suggestions_count = db.session.execute(text("SELECT COUNT(*) FROM suggestions")).scalar()
-        students_count = db.session.execute(
-            text("SELECT COUNT(*) FROM users WHERE users_role = :role"),
-            {"role": "student"}
-        ).scalar()
-        unread_notifications_count = db.session.execute(
-            text("SELECT COUNT(*) FROM notifications WHERE notification_is_read = false")
-        ).scalar()
+        # Counts are maintained by the write paths; see counters.py
+        stats = read_counters()
 
         return jsonify({
-            "complaints": complaints_count,
-            "suggestions": suggestions_count,
-            "students": students_count,
-            "unreadNotifications": unread_notifications_count
+            "complaints": stats[COMPLAINTS],
+            "suggestions": stats[SUGGESTIONS],
+            "students": stats[STUDENTS],
+            "unreadNotifications": stats[UNREAD_NOTIFICATIONS]
         }), 200
 
     except Exception as e:
@@ -146,37 +159,17 @@ def student_dashboard_stats():
         # جلب email الطالب من query parameters
         student_email = request.args.get('student_email')
         
-        if not student_email:
+        if not student_email and not bearer_token():
             return jsonify({"error": "Student email is required"}), 400
 
         # البحث عن ID الطالب باستخدام email
-        student_id_result = db.session.execute(
-            text("SELECT users_id FROM users WHERE users_email = :email AND users_role = 'student'"),
-            {"email": student_email}
-        ).fetchone()
+        student = caller_identity(student_email, role='student')
 
-        if not student_id_result:
+        if not student:
             return jsonify({"error": "Student not found"}), 404
 
-        student_id = student_id_result[0]
-
-        # حساب عدد شكاوى الطالب
-        complaints_count = db.session.execute(
-            text("SELECT COUNT(*) FROM complaints WHERE sender_id = :student_id"),
-            {"student_id": student_id}
-        ).scalar()
-
-        # حساب عدد اقتراحات الطالب
-        suggestions_count = db.session.execute(
-            text("SELECT COUNT(*) FROM suggestions WHERE users_id = :student_id"),
-            {"student_id": student_id}
-        ).scalar()
-
-        # حساب عدد الإشعارات غير المقروءة للطالب
-        unread_notifications_count = db.session.execute(
-            text("SELECT COUNT(*) FROM notifications WHERE user_id = :student_id AND notification_is_read = false"),
-            {"student_id": student_id}
-        ).scalar()
+        # عدادات الطالب من صف واحد في user_counters
+        complaints_count, suggestions_count, unread_notifications_count = read_user_counters(student.users_id)
 
         return jsonify({
             "complaints": complaints_count,
@@ -192,37 +185,37 @@ def student_dashboard_stats():
 def get_complaints():
     student_email = request.args.get("student_email") 
 
-    if not student_email:
+    if not student_email and not bearer_token():
         return jsonify({"message": "Missing email"}), 400
 
-    user = UserModel.query.filter(
-    func.lower(UserModel.users_email) == func.lower(student_email)
-    ).first()
+    user = caller_identity(student_email)
 
     if not user:
         return jsonify([]) 
 
+    etag = list_etag(user.users_id, COMPLAINTS_LIST)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
     complaints = ComplaintModel.query.filter_by(sender_id=user.users_id).all()
     complaints_data = []
     for complaint in complaints:
         data = complaint.to_dict()
         data["complaint_status"] = complaint.complaint_status.value  
-        print(complaint.complaint_status.value)
         complaints_data.append(data)
 
-    return jsonify(complaints_data) 
+    return with_etag(jsonify(complaints_data), etag)
 
 @app.route("/api/student/get_complaint", methods=["GET"])
 def get_single_complaint():
     complaint_id = request.args.get("id")
     student_email = request.args.get("student_email")
 
-    if not complaint_id or not student_email:
+    if not complaint_id or not (student_email or bearer_token()):
         return jsonify({"message": "Missing parameters"}), 400
 
-    user = UserModel.query.filter(
-    func.lower(UserModel.users_email) == func.lower(student_email)
-    ).first()
+    user = caller_identity(student_email)
     if not user:
         return jsonify({"message": "Student not found"}), 404
 
@@ -242,9 +235,7 @@ def get_single_complaint():
 @app.route('/api/student/addcomplaint', methods=['POST'])
 def create_complaint():
     email = request.form.get('student_email')
-    user = UserModel.query.filter(
-    func.lower(UserModel.users_email) == func.lower(email)
-    ).first()
+    user = caller_identity(email)
     if not user:
         return jsonify({"message": "User not found"}), 404
 
@@ -258,15 +249,8 @@ def create_complaint():
     file = request.files.get('file')  
 
     if file:
-        filename = secure_filename(file.filename)
-        file_path = app.config['COMPLAINT_UPLOAD_FOLDER']
-        os.makedirs(file_path, exist_ok=True)
-        full_path = os.path.join(file_path, filename)
-        file.save(full_path)
-
-        file_url = f"https://web-production-93bbb.up.railway.app/static/uploads/complaints/{filename}"
-
-        file_name = filename
+        stored_name, file_name = store_upload(file, app.config['COMPLAINT_UPLOAD_FOLDER'])
+        file_url = public_upload_url('complaints', stored_name)
 
     new_complaint = ComplaintModel(
         complaint_title=complaint_title,
@@ -281,14 +265,7 @@ def create_complaint():
     db.session.add(new_complaint)
     db.session.flush()
 
-    admin = UserModel.query.filter_by(users_role='admin').first()
-    if admin:
-        notification = NotificationModel(
-            user_id=admin.users_id,
-            notifications_message=f"New complaint has been received.",
-            complaint_id=new_complaint.complaint_id
-        )
-        db.session.add(notification)
+    notify_admins(complaint_id=new_complaint.complaint_id)
 
     student_notification = NotificationModel(
         user_id=user.users_id,
@@ -305,17 +282,20 @@ def create_complaint():
 @app.route("/api/student/showsuggestions", methods=["GET"])
 def get_suggestions():
     student_email = request.args.get("student_email")
-    if not student_email:
+    if not student_email and not bearer_token():
         return jsonify({"message": "Missing email"}), 400
 
-    user = UserModel.query.filter(
-    func.lower(UserModel.users_email) == func.lower(student_email)
-    ).first()
+    user = caller_identity(student_email)
     if not user:
         return jsonify([])
 
+    etag = list_etag(user.users_id, SUGGESTIONS_LIST)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
     suggestions = SuggestionModel.query.filter_by(users_id=user.users_id).all()
-    return jsonify([s.to_dict() for s in suggestions]), 200
+    return with_etag(jsonify([s.to_dict() for s in suggestions]), etag)
 
 
 @app.route("/api/student/getsuggestion", methods=["GET"])
@@ -323,12 +303,10 @@ def get_student_suggestion():
     suggestion_id = request.args.get("id")
     student_email = request.args.get("student_email")
 
-    if not suggestion_id or not student_email:
+    if not suggestion_id or not (student_email or bearer_token()):
         return jsonify({"message": "Missing parameters"}), 400
 
-    user = UserModel.query.filter(
-    func.lower(UserModel.users_email) == func.lower(student_email)
-    ).first()
+    user = caller_identity(student_email)
     if not user:
         return jsonify({"message": "Student not found"}), 404
 
@@ -347,9 +325,7 @@ def get_student_suggestion():
 @app.route('/api/student/addsuggestion', methods=['POST'])
 def create_suggestion():
     email = request.form.get('student_email')
-    user = UserModel.query.filter(
-    func.lower(UserModel.users_email) == func.lower(email)
-    ).first()
+    user = caller_identity(email)
     if not user:
         return jsonify({"message": "User not found"}), 404
 
@@ -364,15 +340,8 @@ def create_suggestion():
 
 
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        file_path = app.config['SUGGESTION_UPLOAD_FOLDER']
-        os.makedirs(file_path, exist_ok=True)
-        full_path = os.path.join(file_path, filename)
-        file.save(full_path)
-
-        file_url = f"https://web-production-93bbb.up.railway.app/static/uploads/suggestions/{filename}"
-
-        file_name = filename
+        stored_name, file_name = store_upload(file, app.config['SUGGESTION_UPLOAD_FOLDER'])
+        file_url = public_upload_url('suggestions', stored_name)
 
     new_suggestion = SuggestionModel(
         suggestion_title=title,
@@ -387,16 +356,8 @@ def create_suggestion():
     db.session.add(new_suggestion)
     db.session.flush()
     
-    admin = UserModel.query.filter_by(users_role='admin').first()
-    if admin:
-        admin_notification = NotificationModel(
-            user_id=admin.users_id,
-            notifications_message=f"New suggestion has been received",
-            suggestion_id=new_suggestion.suggestion_id
-        )
-        db.session.add(admin_notification)
+    notify_admins(suggestion_id=new_suggestion.suggestion_id)
 
-   
     student_notification = NotificationModel(
         user_id=user.users_id,
         notifications_message="Your suggestion has been received. Thank you for sharing your thoughts!",
@@ -409,7 +370,7 @@ def create_suggestion():
 
 @app.route('/api/get_admin_name/<admin_email>', methods=['GET'])
 def get_admin_by_email(admin_email):
-    admin = UserModel.query.filter_by(users_email=admin_email).first()
+    admin = caller_identity(admin_email)
     if admin:
         return jsonify({
             'status': 'success',
@@ -452,13 +413,11 @@ def add_student():
     if not re.search(r"[A-Za-z]", password) or not re.search(r"[0-9]", password):
         return jsonify({'status': 'fail', 'message': 'Password must contain both letters and numbers'}), 400
 
-    existing_user = UserModel.query.filter(
-    func.lower(UserModel.users_email) == func.lower(email)
-    ).first()
+    existing_user = lookup_user(email)
     if existing_user:
         return jsonify({'status': 'fail', 'message': 'Email already exists'}), 409
     
-    hashed_password = generate_password_hash(password)
+    hashed_password = hash_password(password)
 
     new_student = UserModel(
         users_name=name,
@@ -469,6 +428,7 @@ def add_student():
 
     db.session.add(new_student)
     db.session.commit()
+    invalidate_identity(email)
 
     return jsonify({'status': 'success', 'message': 'Student added successfully'})
 
@@ -480,9 +440,7 @@ def get_student():
     if not email:
         return jsonify({'status': 'fail', 'message': 'Email is required'}), 400
 
-    student = UserModel.query.filter(
-        func.lower(UserModel.users_email) == func.lower(email)
-    ).first()
+    student = lookup_user(email)
 
     if not student:
         return jsonify({'status': 'fail', 'message': 'Student not found'}), 404
@@ -519,7 +477,7 @@ def update_student():
             return jsonify({'status': 'fail', 'message': 'Password must be at least 6 characters long'}), 400
         if not re.search(r"[A-Za-z]", new_password) or not re.search(r"[0-9]", new_password):
             return jsonify({'status': 'fail', 'message': 'Password must contain both letters and numbers'}), 400
-        student.users_password = generate_password_hash(new_password)
+        student.users_password = hash_password(new_password)
 
     if new_email:
         if not new_email.lower().endswith("@compit.aun.edu.eg"):
@@ -530,6 +488,7 @@ def update_student():
         student.users_email = new_email
 
     db.session.commit()
+    invalidate_identity(old_email, new_email)
     return jsonify({'status': 'success', 'message': 'Student updated successfully'})
 
 @app.route('/api/admin_delete_student', methods=['DELETE'])
@@ -545,23 +504,75 @@ def delete_student():
 
     db.session.delete(student)
     db.session.commit()
+    invalidate_identity(email)
     return jsonify({'status': 'success', 'message': 'Student deleted successfully'})
 
+def list_page_args(status_enum):
+    """Parse the shared cursor/limit/filter query parameters of the admin lists."""
+    return {
+        "limit": page_limit(request.args.get("limit")),
+        "cursor": decode_cursor(request.args["cursor"]) if request.args.get("cursor") else None,
+        "status": parse_enum(status_enum, request.args.get("status")),
+        "type": parse_enum(ComplaintType, request.args.get("type")),
+        "dep": parse_enum(ComplaintDep, request.args.get("dep") or request.args.get("department")),
+        "date_from": parse_date(request.args.get("from")),
+        "date_to": parse_date(request.args.get("to"), end=True),
+    }
+
+
+def admin_complaints_query(args):
+    """The admin complaint list page as one joined query over just the listed columns.
+
+    Also used by explain_hot_queries.py, so the plan it checks is the one the endpoint runs.
+    """
+    query = db.session.query(
+        ComplaintModel.complaint_id,
+        ComplaintModel.reference_code,
+        ComplaintModel.complaint_title,
+        ComplaintModel.complaint_message,
+        ComplaintModel.complaint_dep,
+        ComplaintModel.complaint_type,
+        ComplaintModel.complaint_status,
+        ComplaintModel.complaint_created_at,
+        ComplaintModel.response_message,
+        UserModel.users_email,
+    ).outerjoin(UserModel, UserModel.users_id == ComplaintModel.sender_id)
+    if args["status"]:
+        query = query.filter(ComplaintModel.complaint_status == args["status"])
+    if args["type"]:
+        query = query.filter(ComplaintModel.complaint_type == args["type"])
+    if args["dep"]:
+        query = query.filter(ComplaintModel.complaint_dep == args["dep"])
+    if args["date_from"]:
+        query = query.filter(ComplaintModel.complaint_created_at >= args["date_from"])
+    if args["date_to"]:
+        query = query.filter(ComplaintModel.complaint_created_at < args["date_to"])
+    if args["cursor"]:
+        query = query.filter(keyset_filter(ComplaintModel.complaint_created_at, ComplaintModel.complaint_id, args["cursor"]))
+
+    return query.order_by(
+        ComplaintModel.complaint_created_at.desc(),
+        ComplaintModel.complaint_id.desc()
+    ).limit(args["limit"] + 1)
+
+
 @app.route('/api/admin/get_all_complaints', methods=['GET'])
 def get_all_complaints():
-    complaints = ComplaintModel.query.all()
-    results = []
+    try:
+        args = list_page_args(ComplaintStatus)
+    except ValueError as e:
+        return jsonify({'status': 'fail', 'message': str(e)}), 400
 
-    for c in complaints:
-        student_email = 'Unknown'
-        
-        
-        if c.complaint_dep.name == "private": 
-            student = UserModel.query.filter_by(users_id=c.sender_id).first()
-            if student:
-                student_email = student.users_email
+    etag = list_etag(GLOBAL_SCOPE, COMPLAINTS_LIST)
+    cached = not_modified(etag)
+    if cached:
+        return cached
 
-        results.append({
+    rows = admin_complaints_query(args).all()
+    complaints, cursor = next_cursor(rows, args["limit"], lambda c: c.complaint_created_at, lambda c: c.complaint_id)
+
+    results = [
+        {
             'complaint_id': c.complaint_id,
             'reference_code': c.reference_code,
             'complaint_title': c.complaint_title,
@@ -569,13 +580,15 @@ def get_all_complaints():
             'complaint_dep' : str(c.complaint_dep.name),
             'complaint_type': str(c.complaint_type.name),
             'complaint_status': str(c.complaint_status.value),
-            'complaint_date': c.complaint_created_at.strftime("%Y-%m-%d"),
+            'complaint_date': c.complaint_created_at.strftime("%Y-%m-%d") if c.complaint_created_at else None,
             'response_message': c.response_message,
             'complaint_visibility': str(c.complaint_dep.value),
-            'student_email': student_email
-        })
-        
-    return jsonify(results)
+            'student_email': (c.users_email or 'Unknown') if c.complaint_dep.name == "private" else 'Unknown'
+        }
+        for c in complaints
+    ]
+
+    return with_etag(jsonify({'complaints': results, 'next_cursor': cursor}), etag)
 
 @app.route('/api/admin/get_complaint', methods=['GET'])
 def get_complaint_by_id():
@@ -583,22 +596,38 @@ def get_complaint_by_id():
     if not complaint_id:
         return jsonify({'status': 'fail', 'message': 'Missing complaint ID'}), 400
 
-    complaint = ComplaintModel.query.filter_by(complaint_id=complaint_id).first()
+    try:
+        complaint_uuid = uuid.UUID(complaint_id)
+    except ValueError:
+        return jsonify({'status': 'fail', 'message': 'Invalid complaint ID'}), 400
+
+    sender = aliased(UserModel)
+    responder = aliased(UserModel)
+    complaint = db.session.query(
+        ComplaintModel.complaint_id,
+        ComplaintModel.reference_code,
+        ComplaintModel.complaint_title,
+        ComplaintModel.complaint_message,
+        ComplaintModel.complaint_type,
+        ComplaintModel.complaint_dep,
+        ComplaintModel.complaint_status,
+        ComplaintModel.complaint_created_at,
+        ComplaintModel.complaint_file_name,
+        ComplaintModel.complaint_file_url,
+        ComplaintModel.response_message,
+        ComplaintModel.response_created_at,
+        sender.users_email.label("sender_email"),
+        responder.users_name.label("responder_name"),
+    ).outerjoin(sender, sender.users_id == ComplaintModel.sender_id) \
+     .outerjoin(responder, responder.users_id == ComplaintModel.responder_id) \
+     .filter(ComplaintModel.complaint_id == complaint_uuid).first()
 
     if not complaint:
         return jsonify({'status': 'fail', 'message': 'Complaint not found'}), 404
 
-   
-    responder_name = None
-    if complaint.responder_id:
-        admin = UserModel.query.get(complaint.responder_id)
-        if admin:
-            responder_name = admin.users_name
- 
     student_email = "Unknown"
     if complaint.complaint_dep and complaint.complaint_dep.name.lower() == "private":
-        if complaint.sender:
-            student_email = complaint.sender.users_email
+        student_email = complaint.sender_email or "Unknown"
 
     return jsonify({
         "status": "success",
@@ -615,24 +644,58 @@ def get_complaint_by_id():
         "complaint_file_url": complaint.complaint_file_url,
         "response_message": complaint.response_message if complaint.response_message else None,
         "response_created_at": complaint.response_created_at.isoformat() if complaint.response_created_at else None,
-        "responder_name": responder_name
+        "responder_name": complaint.responder_name
     })
 
+def admin_suggestions_query(args):
+    """The admin suggestion list page (see admin_complaints_query)."""
+    query = db.session.query(
+        SuggestionModel.suggestion_id,
+        SuggestionModel.reference_code,
+        SuggestionModel.suggestion_title,
+        SuggestionModel.suggestion_message,
+        SuggestionModel.suggestion_dep,
+        SuggestionModel.suggestion_type,
+        SuggestionModel.suggestion_status,
+        SuggestionModel.suggestion_created_at,
+        UserModel.users_email,
+    ).outerjoin(UserModel, UserModel.users_id == SuggestionModel.users_id)
+    if args["status"]:
+        query = query.filter(SuggestionModel.suggestion_status == args["status"])
+    if args["type"]:
+        query = query.filter(SuggestionModel.suggestion_type == args["type"])
+    if args["dep"]:
+        query = query.filter(SuggestionModel.suggestion_dep == args["dep"])
+    if args["date_from"]:
+        query = query.filter(SuggestionModel.suggestion_created_at >= args["date_from"])
+    if args["date_to"]:
+        query = query.filter(SuggestionModel.suggestion_created_at < args["date_to"])
+    if args["cursor"]:
+        query = query.filter(keyset_filter(SuggestionModel.suggestion_created_at, SuggestionModel.suggestion_id, args["cursor"]))
+
+    return query.order_by(
+        SuggestionModel.suggestion_created_at.desc(),
+        SuggestionModel.suggestion_id.desc()
+    ).limit(args["limit"] + 1)
+
+
 @app.route('/api/admin/get_all_suggestions', methods=['GET'])
 def get_all_suggestions():
-    suggestions = SuggestionModel.query.all()
-    results = []
+    try:
+        args = list_page_args(SuggestionStatus)
+    except ValueError as e:
+        return jsonify({'status': 'fail', 'message': str(e)}), 400
 
-    for s in suggestions:
-        student_email = 'Unknown'
+    etag = list_etag(GLOBAL_SCOPE, SUGGESTIONS_LIST)
+    cached = not_modified(etag)
+    if cached:
+        return cached
 
-       
-        if s.suggestion_dep.name == "private":  
-            student = UserModel.query.filter_by(users_id=s.users_id).first()
-            if student:
-                student_email = student.users_email
+    rows = admin_suggestions_query(args).all()
+    suggestions, cursor = next_cursor(rows, args["limit"], lambda s: s.suggestion_created_at, lambda s: s.suggestion_id)
 
-        results.append({
+    results = [
+        {
             'suggestion_id': s.suggestion_id,
             'reference_code': s.reference_code,
             'suggestion_title': s.suggestion_title,
@@ -640,11 +703,13 @@ def get_all_suggestions():
             'suggestion_dep': str(s.suggestion_dep.name),
             'suggestion_type': str(s.suggestion_type.name),
             'suggestion_status': str(s.suggestion_status.value),
-            'suggestion_date': s.suggestion_created_at.strftime("%Y-%m-%d"),
-            'student_email': student_email
-        })
+            'suggestion_date': s.suggestion_created_at.strftime("%Y-%m-%d") if s.suggestion_created_at else None,
+            'student_email': (s.users_email or 'Unknown') if s.suggestion_dep.name == "private" else 'Unknown'
+        }
+        for s in suggestions
+    ]
 
-    return jsonify(results), 200
+    return with_etag(jsonify({'suggestions': results, 'next_cursor': cursor}), etag)
 
 @app.route('/api/admin/get_suggestion', methods=['GET'])
 def get_suggestion_by_id():
@@ -654,15 +719,17 @@ def get_suggestion_by_id():
 
     try:
         uuid_obj = uuid.UUID(suggestion_id)
-        suggestion = SuggestionModel.query.filter_by(suggestion_id=uuid_obj).first()
     except ValueError:
         return jsonify({'status': 'fail', 'message': 'Invalid UUID format'}), 400
 
-    if not suggestion:
-        return jsonify({'status': 'fail', 'message': 'suggestion not found'}), 404
+    row = db.session.query(SuggestionModel, UserModel.users_email) \
+        .outerjoin(UserModel, UserModel.users_id == SuggestionModel.users_id) \
+        .filter(SuggestionModel.suggestion_id == uuid_obj).first()
 
-    student = UserModel.query.filter_by(users_id=suggestion.users_id).first()
+    if not row:
+        return jsonify({'status': 'fail', 'message': 'suggestion not found'}), 404
 
+    suggestion, student_email = row
 
     return jsonify({
         'suggestion_id': str(suggestion.suggestion_id),
@@ -672,7 +739,7 @@ def get_suggestion_by_id():
         'suggestion_type': str(suggestion.suggestion_type.name),
         'suggestion_dep': str(suggestion.suggestion_dep),
         'suggestion_date': suggestion.suggestion_created_at,
-        'student_email': student.users_email if student and suggestion.suggestion_dep.name == "private" else "Unknown",
+        'student_email': student_email if student_email and suggestion.suggestion_dep.name == "private" else "Unknown",
         'suggestion_status': str(suggestion.suggestion_status.value),
         'suggestion_file_name': suggestion.suggestion_file_name,
         'suggestion_file_url': suggestion.suggestion_file_url
@@ -752,9 +819,10 @@ def respond_to_complaint():
             complaint_id=complaint.complaint_id
         )
         db.session.add(notification)
-
-       
         student = UserModel.query.get(student_id)
+        db.session.commit()
+
+        # After the commit, so no row locks are held across the SMTP round-trip
         if student:
             subject = "Your Complaint Has Been Responded To"
             body = (
@@ -765,8 +833,6 @@ def respond_to_complaint():
             )
             send_notification_email(student.users_email, subject, body)
 
-        db.session.commit()
-
         return jsonify({'status': 'success'})
     else:
         return jsonify({'status': 'fail', 'reason': 'Invalid complaint or already responded'})
@@ -775,9 +841,7 @@ def respond_to_complaint():
 @app.route('/api/get_admin_id', methods=['GET'])
 def get_admin_id():
     admin_email = request.args.get("admin_email")
-    admin = UserModel.query.filter(
-    func.lower(UserModel.users_email) == func.lower(admin_email)
-    ).first()
+    admin = caller_identity(admin_email)
 
     if admin:
         return jsonify({
@@ -787,54 +851,43 @@ def get_admin_id():
     else:
         return jsonify({'status': 'fail', 'reason': 'Admin not found'})
 
+def notification_sync_response(user_id, since, etag):
+    """?since=<cursor> (empty for a first sync): changed notifications, unread count and the next cursor."""
+    try:
+        cursor = decode_sync_cursor(since) if since else None
+    except ValueError as e:
+        return jsonify({"status": "fail", "message": str(e)}), 400
+
+    notifications, cursor, has_more = notification_changes(user_id, cursor)
+    _, _, unread_count = read_user_counters(user_id)
+    return with_etag(jsonify({
+        "notifications": [n.to_dict() for n in notifications],
+        "unread_count": unread_count,
+        "cursor": cursor,
+        "has_more": has_more,
+    }), etag)
+
+
 @app.route('/api/admin/notifications', methods=['GET'])
 def get_admin_notifications():
     email = request.args.get("admin_email")
-    admin = UserModel.query.filter(    (func.lower(UserModel.users_email) == 
-    func.lower(email)) & (UserModel.users_role == 'admin')).first()
+    admin = caller_identity(email, role='admin')
     if not admin:
         return jsonify([])
 
-   
-    complaints = ComplaintModel.query.filter(ComplaintModel.complaint_created_at >= admin.users_created_at).all()
-    suggestions = SuggestionModel.query.filter(SuggestionModel.suggestion_created_at >= admin.users_created_at).all()
-
-  
-    for comp in complaints:
-        exists = NotificationModel.query.filter_by(
-            user_id=admin.users_id,
-            complaint_id=comp.complaint_id
-        ).first()
-        if not exists:
-            db.session.add(NotificationModel(
-                user_id=admin.users_id,
-                complaint_id=comp.complaint_id,
-                notifications_message="New complaint has been received.",  
-                notification_created_at=comp.complaint_created_at
-            ))
-
-  
-    for sugg in suggestions:
-        exists = NotificationModel.query.filter_by(
-            user_id=admin.users_id,
-            suggestion_id=sugg.suggestion_id
-        ).first()
-        if not exists:
-            db.session.add(NotificationModel(
-                user_id=admin.users_id,
-                suggestion_id=sugg.suggestion_id,
-                notifications_message=f"New suggestion has been recieved. ",
-                notification_created_at=sugg.suggestion_created_at
-            ))
+    etag = list_etag(admin.users_id, NOTIFICATIONS_LIST)
+    cached = not_modified(etag)
+    if cached:
+        return cached
 
-    db.session.commit()
-    # ------------------------------------------
+    if "since" in request.args:
+        return notification_sync_response(admin.users_id, request.args.get("since"), etag)
 
     notifications = NotificationModel.query.filter_by(user_id=admin.users_id).order_by(
         NotificationModel.notification_created_at.desc()
     ).all()
 
-    return jsonify([
+    return with_etag(jsonify([
         {
             "id": str(n.notification_id),
             "message": n.notifications_message,
@@ -844,7 +897,7 @@ def get_admin_notifications():
             "suggestion_id": str(n.suggestion_id) if n.suggestion_id else None
         }
         for n in notifications
-    ])
+    ]), etag)
 
 @app.route('/api/admin/mark_notification_read', methods=['POST'])
 def mark_notification_read():
@@ -862,14 +915,21 @@ def mark_notification_read():
 @app.route('/api/student/notifications', methods=['GET'])
 def get_student_notifications():
     email = request.args.get("student_email")
-    student = UserModel.query.filter((func.lower(UserModel.users_email) == 
-    func.lower(email)) & (UserModel.users_role == 'student')).first()
+    student = caller_identity(email, role='student')
     if not student:
         return jsonify([])
 
+    etag = list_etag(student.users_id, NOTIFICATIONS_LIST)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    if "since" in request.args:
+        return notification_sync_response(student.users_id, request.args.get("since"), etag)
+
     notifications = NotificationModel.query.filter_by(user_id=student.users_id).order_by(NotificationModel.notification_created_at.desc()).all()
 
-    return jsonify([
+    return with_etag(jsonify([
         {
             "id": str(n.notification_id),
             "message": n.notifications_message,
@@ -879,7 +939,7 @@ def get_student_notifications():
             "suggestion_id": str(n.suggestion_id) if n.suggestion_id else None
         }
         for n in notifications
-    ])
+    ]), etag)
 
 @app.route('/api/student/mark_notification_read', methods=['POST'])
 def mark_student_notification_read():
@@ -894,47 +954,135 @@ def mark_student_notification_read():
     db.session.commit()
     return jsonify({"status": "success"})
 
+def bulk_mark_read(role, email_field):
+    """Body: {"notification_ids": [...]} or {"up_to": <sync cursor>}; only the caller's notifications change."""
+    data = request.get_json() or {}
+    user = caller_identity(data.get(email_field), role=role)
+    if not user:
+        return jsonify({"status": "fail", "message": "User not found"}), 404
+
+    ids = data.get("notification_ids")
+    up_to = data.get("up_to")
+    if (ids is None) == (up_to is None):
+        return jsonify({"status": "fail", "message": "Send either notification_ids or up_to"}), 400
+
+    try:
+        if ids is not None:
+            if not isinstance(ids, list) or len(ids) > NOTIFICATIONS_MARK_READ_MAX_IDS:
+                return jsonify({"status": "fail",
+                                "message": f"notification_ids must be a list of at most {NOTIFICATIONS_MARK_READ_MAX_IDS} ids"}), 400
+            ids = [uuid.UUID(str(i)) for i in ids]
+            changed = mark_notifications_read(user.users_id, notification_ids=ids) if ids else 0
+        else:
+            changed = mark_notifications_read(user.users_id, cursor=decode_sync_cursor(up_to))
+    except ValueError:
+        return jsonify({"status": "fail", "message": "Invalid notification id or cursor"}), 400
+
+    db.session.commit()
+    _, _, unread_count = read_user_counters(user.users_id)
+    return jsonify({"status": "success", "updated": changed, "unread_count": unread_count})
+
+@app.route('/api/student/mark_notifications_read', methods=['POST'])
+def mark_student_notifications_read():
+    return bulk_mark_read('student', 'student_email')
+
+@app.route('/api/admin/mark_notifications_read', methods=['POST'])
+def mark_admin_notifications_read():
+    return bulk_mark_read('admin', 'admin_email')
+
+@app.route('/api/notifications/stream', methods=['GET'])
+def notifications_stream():
+    # EventSource cannot send headers, so the token may also come as ?token=
+    token = request.args.get("token")
+    if token:
+        user = verify_token(token)
+    else:
+        email = request.args.get("email") or request.args.get("student_email") or request.args.get("admin_email")
+        user = caller_identity(email)
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+
+    dsn = db.engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    try:
+        subscription = notification_stream.subscribe(dsn, user.users_id)
+    except notification_stream.TooManyClients:
+        return jsonify({"error": "Too many open notification streams, please poll instead"}), 503
+    # Nothing below needs the database; give the connection back to the pool
+    db.session.close()
+
+    def generate():
+        try:
+            yield "retry: 3000\n\n"
+            yield sse_event({"user_id": str(user.users_id)}, "ready")
+            ends_at = time.monotonic() + notification_stream.NOTIFICATIONS_STREAM_MAX_SECONDS
+            while time.monotonic() < ends_at:
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    yield sse_event({"op": "resync"}, "resync")
+                try:
+                    event = subscription.get(timeout=notification_stream.NOTIFICATIONS_STREAM_KEEPALIVE)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if event.get("op") == "resync":
+                    yield sse_event(event, "resync")
+                else:
+                    yield sse_event(event, "notification")
+        finally:
+            notification_stream.unsubscribe(subscription)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.route('/api/admin/notification_stream_stats', methods=['GET'])
+@token_required(role='admin')
+def get_notification_stream_stats():
+    return jsonify(notification_stream.stream_stats())
+
 @app.route('/static/uploads/complaints/<filename>')
 def uploaded_complaint_file(filename):
-    return send_from_directory(app.config['COMPLAINT_UPLOAD_FOLDER'], filename)
+    return serve_upload(app.config['COMPLAINT_UPLOAD_FOLDER'], 'complaints', filename)
 
 @app.route('/static/uploads/suggestions/<filename>')
 def uploaded_suggestion_file(filename):
-    return send_from_directory(app.config['SUGGESTION_UPLOAD_FOLDER'], filename)
+    return serve_upload(app.config['SUGGESTION_UPLOAD_FOLDER'], 'suggestions', filename)
 
 
 
-@app.route("/api/chat/ask", methods=["POST"])
-def ask():
-    data = request.get_json()
-    question = data.get("question")
-    session_id = data.get("session_id")
-    user_email = data.get("user_email")
-
-    if not question or not user_email:
-        return jsonify({"error": "Missing question or user_email"}), 400
-
-    user = db.session.query(UserModel).filter(func.lower(UserModel.users_email) == func.lower(user_email)).first()
-    
+def resolve_chat_session(user_email, session_id):
+    user = caller_identity(user_email)
     if not user:
-        return jsonify({"error": "User not found"}), 404
-
-    user_id = user.users_id
+        return None, (jsonify({"error": "User not found"}), 404)
 
     # If session_id not provided, get the latest session
     if not session_id:
         latest_session = (
             db.session.query(ChatSessionModel)
-            .filter_by(user_id=user_id)
-            .order_by(ChatSessionModel.created_at.desc())
+            .filter_by(users_id=user.users_id)
+            .order_by(ChatSessionModel.session_created_at.desc())
             .first()
         )
-        if latest_session:
-            session_id = latest_session.session_id
-        else:
-            return jsonify({"error": "No active chat session found"}), 404
+        if not latest_session:
+            return None, (jsonify({"error": "No active chat session found"}), 404)
+        session_id = latest_session.sessions_id
+
+    return session_id, None
+
+
+def load_chat_history(session_id, limit=50):
+    messages = (
+        ChatMessageModel.query.filter_by(session_id=session_id)
+        .order_by(ChatMessageModel.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+    return [(m.sender.value, m.message) for m in reversed(messages)]
+
 
-    answer = ask_rule_question(question)
+def save_chat_turn(session_id, question, answer):
     question_msg = ChatMessageModel(
         session_id=session_id,
         sender='user',
@@ -951,7 +1099,8 @@ def ask():
 
     # Get the chat session by ID
     session = db.session.query(ChatSessionModel).filter_by(sessions_id=session_id).first()
-
+    if not session:
+        return
 
     real_messages_count = (
     db.session.query(ChatMessageModel)
@@ -962,11 +1111,217 @@ def ask():
     .count()
     )
 
-    if session and real_messages_count == 3:
+    if real_messages_count == 3:
         session.session_title = question[:30] + "..." if len(question) > 30 else question
     db.session.commit()
 
-    return jsonify({"answer": answer})
+
+@app.route("/api/chat/ask", methods=["POST"])
+def ask():
+    data = request.get_json()
+    question = data.get("question")
+    session_id = data.get("session_id")
+    user_email = data.get("user_email")
+
+    if not question or not (user_email or bearer_token()):
+        return jsonify({"error": "Missing question or user_email"}), 400
+
+    session_id, error = resolve_chat_session(user_email, session_id)
+    if error:
+        return error
+
+    # With "async": true the turn runs in the background and the client polls /api/chat/turn/<id>
+    if data.get("async"):
+        try:
+            turn = submit_turn(app, session_id, question, run_chat_turn(session_id))
+        except QueueFull:
+            return jsonify({"error": "The assistant is busy, please try again shortly"}), 503
+        return jsonify({"turn_id": str(turn.turn_id), "status": turn.status.value}), 202
+
+    history = load_chat_history(session_id)
+    result = cached_answer_rule_question(question, history=history)
+    answer = result["answer"]
+    save_chat_turn(session_id, question, answer)
+
+    return jsonify({
+        "answer": answer,
+        "articles": result["articles"],
+        "cached": result["cached"],
+        "prompt_tokens": result.get("prompt_tokens", 0),
+    })
+
+
+def run_chat_turn(session_id):
+    def run(question, timeout):
+        history = load_chat_history(session_id)
+        result = cached_answer_rule_question(question, timeout=timeout, history=history)
+        save_chat_turn(session_id, question, result["answer"])
+        return result
+    return run
+
+
+@app.route("/api/chat/turn/<turn_id>", methods=["GET"])
+def get_chat_turn(turn_id):
+    try:
+        turn_uuid = uuid.UUID(turn_id)
+    except ValueError:
+        return jsonify({"error": "Invalid turn id"}), 400
+
+    wait = min(request.args.get("wait", 0, type=float), 25)
+    turn = wait_for_turn(turn_uuid, wait=wait)
+    if not turn:
+        return jsonify({"error": "Turn not found"}), 404
+
+    return jsonify(turn.to_dict())
+
+
+@app.route("/api/chat/turn_metrics", methods=["GET"])
+@token_required(role='admin')
+def chat_turn_metrics():
+    return jsonify(turn_metrics())
+
+
+def sse_event(data, event=None):
+    payload = f"event: {event}\n" if event else ""
+    return payload + f"data: {json.dumps(data)}\n\n"
+
+
+@app.route("/api/chat/ask_stream", methods=["POST"])
+def ask_stream():
+    data = request.get_json()
+    question = data.get("question")
+    session_id = data.get("session_id")
+    user_email = data.get("user_email")
+
+    if not question or not (user_email or bearer_token()):
+        return jsonify({"error": "Missing question or user_email"}), 400
+
+    session_id, error = resolve_chat_session(user_email, session_id)
+    if error:
+        return error
+
+    history = load_chat_history(session_id)
+
+    def generate():
+        articles, stats, cached, parts = stream_cached_answer_rule_question(question, history=history)
+
+        yield sse_event({
+            "articles": articles,
+            "cached": cached,
+            "prompt_tokens": stats["prompt_tokens"],
+        }, "meta")
+        answer_parts = []
+        try:
+            for part in parts:
+                answer_parts.append(part)
+                yield sse_event({"text": part})
+        except Exception as e:
+            print(f"ERROR in ask_stream: {str(e)}")
+            yield sse_event({"error": "The assistant could not finish the answer"}, "error")
+            return
+
+        answer = "".join(answer_parts).strip()
+        save_chat_turn(session_id, question, answer)
+        yield sse_event({"answer": answer, "articles": articles}, "done")
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+CHAT_BATCH_MAX_QUESTIONS = int(os.getenv("CHAT_BATCH_MAX_QUESTIONS", 100))
+
+
+def answer_batch_question(question, timeout):
+    # ask_batch has already missed the cache for this question; go straight to the model
+    started = time.perf_counter()
+    result = answer_rule_question(question, timeout=timeout)
+    store_answer(question, result)
+    return dict(result, cached=False, elapsed_ms=round((time.perf_counter() - started) * 1000, 1))
+
+
+@app.route("/api/chat/ask_batch", methods=["POST"])
+def ask_batch():
+    data = request.get_json() or {}
+    questions = data.get("questions")
+
+    if not isinstance(questions, list) or not questions:
+        return jsonify({"error": "questions must be a non-empty list"}), 400
+    if len(questions) > CHAT_BATCH_MAX_QUESTIONS:
+        return jsonify({"error": f"At most {CHAT_BATCH_MAX_QUESTIONS} questions per batch"}), 400
+
+    started = time.perf_counter()
+
+    # Dedupe on the same normalized form the answer cache uses
+    unique = {}
+    for q in questions:
+        if isinstance(q, str) and q.strip():
+            unique.setdefault(normalize_question(q), q.strip())
+
+    answers = {}
+    pending = []
+    for key, question in unique.items():
+        lookup_started = time.perf_counter()
+        hit = fast_answer(question)
+        if hit is None:
+            hit = get_cached_answer(question)
+            if hit is not None:
+                hit = dict(hit, cached=True)
+        if hit is None:
+            pending.append(key)
+            continue
+        answers[key] = dict(hit, cached=hit.get("cached", False),
+                            elapsed_ms=round((time.perf_counter() - lookup_started) * 1000, 1))
+
+    # Runs on the chat executor, so batches and chat turns share CHAT_MAX_INFLIGHT
+    try:
+        futures = run_batch(app, [unique[k] for k in pending], answer_batch_question)
+    except QueueFull:
+        return jsonify({"error": "The assistant is busy, please try again shortly"}), 503
+    for key, future in zip(pending, futures):
+        try:
+            answers[key] = future.result()
+        except DeadlineExceeded:
+            answers[key] = {"error": "Timed out waiting for the assistant"}
+        except QueueFull:
+            answers[key] = {"error": "The assistant is busy, please try again shortly"}
+        except Exception as e:
+            print(f"ERROR in ask_batch for {unique[key]!r}: {str(e)}")
+            answers[key] = {"error": "The assistant could not answer this question"}
+
+    results = []
+    for q in questions:
+        if not isinstance(q, str) or not q.strip():
+            results.append({"question": q, "error": "Empty question"})
+            continue
+        result = answers[normalize_question(q)]
+        results.append({
+            "question": q,
+            "answer": result.get("answer"),
+            "articles": result.get("articles", []),
+            "cached": result.get("cached", False),
+            "elapsed_ms": result.get("elapsed_ms"),
+            "error": result.get("error"),
+        })
+
+    return jsonify({
+        "results": results,
+        "unique_questions": len(unique),
+        "llm_calls": len(pending),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    })
+
+
+@app.route("/api/admin/identity_cache_stats", methods=["GET"])
+@token_required(role='admin')
+def get_identity_cache_stats():
+    return jsonify(identity_cache_stats())
+
+@app.route("/api/chat/cache_stats", methods=["GET"])
+@token_required(role='admin')
+def chat_cache_stats():
+    return jsonify(cache_stats())
 
 @app.route("/api/chat/welcome", methods=["GET"])
 def get_welcome_message():
@@ -987,7 +1342,7 @@ def start_session():
     email = data.get("email")
     first_message = data.get("message", "")
 
-    user = UserModel.query.filter(func.lower(UserModel.users_email) == func.lower(email)).first()
+    user = caller_identity(email)
     if not user:
         return jsonify({"error": "User not found"}), 404
 
@@ -1095,13 +1450,18 @@ def close_session():
 @app.route("/api/chat/sessions", methods=["GET"])
 def get_chat_sessions():
     email = request.args.get("email")
-    if not email:
+    if not email and not bearer_token():
         return jsonify({"error": "Missing email"}), 400
 
-    user = db.session.query(UserModel).filter(func.lower(UserModel.users_email) == func.lower(email)).first()
+    user = caller_identity(email)
     if not user:
         return jsonify({"error": "User not found"}), 404
 
+    etag = list_etag(user.users_id, CHAT_SESSIONS_LIST)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
     sessions = (
         db.session.query(ChatSessionModel)
         .filter_by(users_id=user.users_id)
@@ -1109,7 +1469,7 @@ def get_chat_sessions():
         .all()
     )
 
-    return jsonify([
+    return with_etag(jsonify([
         {
             "session_id": str(s.sessions_id),
             "title": s.session_title,
@@ -1117,7 +1477,7 @@ def get_chat_sessions():
             "status": s.session_status.value  
         }
         for s in sessions
-    ])
+    ]), etag)
 
 @app.route("/api/chat/rename_session", methods=["PUT"])
 def rename_session():
@@ -1161,5 +1521,26 @@ def delete_session():
     return jsonify({"message": "Session deleted successfully"})
 
 
+@app.cli.command("backfill-admin-notifications")
+def backfill_admin_notifications_command():
+    complaints, suggestions = backfill_admin_notifications()
+    print(f"Added {complaints} complaint and {suggestions} suggestion notifications for admins.")
+
+
+@app.cli.command("reconcile-stats")
+def reconcile_stats_command():
+    for name, (old, new) in reconcile_counters().items():
+        print(f"{name}: {old} -> {new}")
+    print(f"user_counters: {reconcile_user_counters()} rows corrected")
+
+
+@app.cli.command("maintain-notifications")
+def maintain_notifications_command():
+    result = maintain_notifications()
+    print(f"Created partitions: {', '.join(result['created']) or 'none'}")
+    print(f"Dropped partitions: {', '.join(result['dropped']) or 'none'}")
+    print(f"Deleted {result['deleted']} read notifications older than {result['cutoff']}.")
+
+
 if __name__ == '__main__':
     app.run(debug=False)
\ No newline at end of file
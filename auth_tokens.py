@@ -0,0 +1,87 @@
+import os
+import secrets
+import uuid
+from functools import wraps
+from flask import request, jsonify, g
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+from identity_cache import Identity, lookup_user
+from models import UserRole
+
+# Signed, expiring bearer tokens issued by /api/login. A token carries the user's
+# id, email, name and role, so verifying it needs no database access.
+
+AUTH_TOKEN_MAX_AGE = int(os.getenv("AUTH_TOKEN_MAX_AGE", 12 * 3600))
+# The frontend sends the login token (frontend/app/apiFetch.ts) and still sends
+# the email parameters; requests without a token, e.g. from a session that logged
+# in before tokens were stored, fall back to the email lookup. Once those have
+# expired, set AUTH_REQUIRE_TOKEN=true to turn the fallback off.
+AUTH_REQUIRE_TOKEN = os.getenv("AUTH_REQUIRE_TOKEN", "false").lower() == "true"
+
+# Every worker must share the key, or a token issued by one is rejected by the
+# others. Only a debug/dev run (FLASK_DEBUG=1) may fall back to a random key.
+SECRET_KEY = os.getenv("SECRET_KEY")
+if not SECRET_KEY:
+    if os.getenv("FLASK_DEBUG", "").lower() not in ("1", "true"):
+        raise RuntimeError("SECRET_KEY must be set; auth tokens are signed with it and shared across workers.")
+    SECRET_KEY = secrets.token_hex(32)
+    print("WARNING: SECRET_KEY is not set; using a random key for this debug process only.")
+
+_serializer = URLSafeTimedSerializer(SECRET_KEY, salt="auth-token")
+
+
+def issue_token(user):
+    return _serializer.dumps({
+        "uid": str(user.users_id),
+        "email": user.users_email,
+        "name": user.users_name,
+        "role": user.users_role.name,
+    })
+
+
+def verify_token(token):
+    """Return the Identity in a valid token, or None if it is missing, forged or expired."""
+    try:
+        data = _serializer.loads(token, max_age=AUTH_TOKEN_MAX_AGE)
+        return Identity(uuid.UUID(data["uid"]), data["email"], data["name"], UserRole[data["role"]], None)
+    except (BadSignature, SignatureExpired, KeyError, ValueError, TypeError):
+        return None
+
+
+def bearer_token():
+    header = request.headers.get("Authorization", "")
+    if header.lower().startswith("bearer "):
+        return header[7:].strip()
+    return None
+
+
+def caller_identity(email=None, role=None):
+    """Identity of the caller: from the bearer token when present, else from the email parameter."""
+    token = bearer_token()
+    if token:
+        identity = verify_token(token)
+        if identity is None:
+            return None
+    elif AUTH_REQUIRE_TOKEN:
+        return None
+    else:
+        return lookup_user(email, role=role)
+
+    if role is not None and identity.users_role.name != role:
+        return None
+    return identity
+
+
+def token_required(role=None):
+    """Reject requests without a valid token (and role); the identity is stored in g.identity."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            identity = verify_token(bearer_token() or "")
+            if identity is None:
+                return jsonify({"message": "Missing or invalid token"}), 401
+            if role is not None and identity.users_role.name != role:
+                return jsonify({"message": "Forbidden"}), 403
+            g.identity = identity
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,97 @@
+import argparse
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+# Load test for the chat endpoints. Run the API with CHAT_LLM_BACKEND=fake (or
+# replay) to measure throughput, cache hit rate and worker saturation offline:
+#   CHAT_LLM_BACKEND=fake CHAT_FAKE_LATENCY_MS=1500 gunicorn api:app --bind 0.0.0.0:5000
+#   python bench_chat.py --url http://localhost:5000 --email student@compit.aun.edu.eg --token <admin token>
+# The cache and turn stats endpoints need an admin token (from /api/login);
+# without --token they are skipped.
+
+DEFAULT_QUESTIONS = [
+    "my GPA is 3.77, what's the letter for that?",
+    "How many credit hours do I need to graduate?",
+    "What happens if I miss more than 25% of the lectures?",
+    "Can I withdraw from a course after the deadline?",
+    "How is the cumulative GPA calculated?",
+    "When do I choose my major specialization?",
+    "What are the conditions for honors?",
+    "How many courses can I repeat to improve my GPA?",
+]
+
+
+def ask(url, email, session_id, question, use_async, wait):
+    started = time.perf_counter()
+    body = {"question": question, "user_email": email, "session_id": session_id}
+    if use_async:
+        body["async"] = True
+    response = requests.post(f"{url}/api/chat/ask", json=body, timeout=120)
+    if use_async and response.status_code == 202:
+        turn_id = response.json()["turn_id"]
+        while True:
+            turn = requests.get(f"{url}/api/chat/turn/{turn_id}", params={"wait": wait}, timeout=wait + 30).json()
+            if turn.get("status") not in ("queued", "running"):
+                ok = turn.get("status") == "done"
+                break
+    else:
+        ok = response.status_code == 200
+    return time.perf_counter() - started, ok
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chat endpoint load test")
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--session-id")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--questions", help="file with one question per line")
+    parser.add_argument("--async", dest="use_async", action="store_true")
+    parser.add_argument("--wait", type=float, default=20)
+    parser.add_argument("--token", help="admin bearer token for the stats endpoints")
+    args = parser.parse_args()
+
+    questions = DEFAULT_QUESTIONS
+    if args.questions:
+        with open(args.questions, encoding="utf-8") as f:
+            questions = [line.strip() for line in f if line.strip()]
+
+    session_id = args.session_id
+    if not session_id:
+        session_id = requests.post(f"{args.url}/api/chat/start_session", json={"email": args.email}).json()["session_id"]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [
+            pool.submit(ask, args.url, args.email, session_id, random.choice(questions), args.use_async, args.wait)
+            for _ in range(args.requests)
+        ]
+        results = [f.result() for f in futures]
+    elapsed = time.perf_counter() - started
+
+    latencies = [r[0] for r in results]
+    failures = sum(1 for r in results if not r[1])
+    print(f"requests:    {len(results)} ({failures} failed) at concurrency {args.concurrency}")
+    print(f"throughput:  {len(results) / elapsed:.2f} req/s")
+    print(f"latency:     mean {statistics.mean(latencies):.3f}s  p50 {percentile(latencies, 50):.3f}s  "
+          f"p95 {percentile(latencies, 95):.3f}s  p99 {percentile(latencies, 99):.3f}s")
+    if not args.token:
+        print("stats:       skipped (pass --token with an admin token)")
+        return
+    headers = {"Authorization": f"Bearer {args.token}"}
+    for label, path in (("cache:      ", "/api/chat/cache_stats"), ("turns:      ", "/api/chat/turn_metrics")):
+        response = requests.get(f"{args.url}{path}", headers=headers)
+        print(label, response.json() if response.ok else f"HTTP {response.status_code}: {response.text[:200]}")
+
+
+if __name__ == "__main__":
+    main()
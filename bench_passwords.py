@@ -0,0 +1,53 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Login throughput (password checks per second) for each hash setting, inline on
+# request threads versus offloaded to a process pool as passwords.py does:
+#   python bench_passwords.py --checks 200 --workers 1 2 4
+
+DEFAULT_METHODS = [
+    "scrypt:32768:8:1",
+    "scrypt:16384:8:1",
+    "pbkdf2:sha256:600000",
+    "pbkdf2:sha256:260000",
+]
+
+
+def run(executor, password_hash, checks):
+    started = time.perf_counter()
+    results = list(executor.map(check_password_hash, [password_hash] * checks, ["password123"] * checks))
+    elapsed = time.perf_counter() - started
+    assert all(results)
+    return checks / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Password hashing throughput")
+    parser.add_argument("--methods", nargs="+", default=DEFAULT_METHODS)
+    parser.add_argument("--checks", type=int, default=100)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, os.cpu_count() or 4])
+    parser.add_argument("--threads", type=int, default=8, help="request threads for the inline case")
+    args = parser.parse_args()
+
+    print(f"{'method':<24} {'hash ms':>8} {'inline/s':>9} " + " ".join(f"{'pool' + str(w) + '/s':>9}" for w in args.workers))
+    for method in args.methods:
+        started = time.perf_counter()
+        password_hash = generate_password_hash("password123", method)
+        hash_ms = (time.perf_counter() - started) * 1000
+
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            inline = run(pool, password_hash, args.checks)
+        pooled = []
+        for workers in args.workers:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pool.submit(int).result()  # start the workers before timing
+                pooled.append(run(pool, password_hash, args.checks))
+
+        print(f"{method:<24} {hash_ms:>8.1f} {inline:>9.1f} " + " ".join(f"{p:>9.1f}" for p in pooled))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait as wait_futures
+from datetime import datetime, timedelta, timezone
+from models import db, ChatTurnModel, ChatTurnStatus
+
+# Runs chat turns on a bounded background executor so gunicorn workers return
+# immediately. Turn state lives in the chat_turns table, so any worker can
+# answer a poll for a turn started by another one.
+
+CHAT_WORKERS = int(os.getenv("CHAT_WORKERS", 8))
+CHAT_MAX_INFLIGHT = int(os.getenv("CHAT_MAX_INFLIGHT", 4))
+CHAT_MAX_QUEUE = int(os.getenv("CHAT_MAX_QUEUE", 64))
+CHAT_TURN_DEADLINE = float(os.getenv("CHAT_TURN_DEADLINE", 30))
+# A turn still queued/running this long after it was created lost its worker
+# (restart, crash, gunicorn timeout); polls mark it timed out
+CHAT_TURN_STALE_SECONDS = float(os.getenv("CHAT_TURN_STALE_SECONDS", CHAT_TURN_DEADLINE + 30))
+
+_executor = ThreadPoolExecutor(max_workers=CHAT_WORKERS, thread_name_prefix="chat-turn")
+_inflight = threading.BoundedSemaphore(CHAT_MAX_INFLIGHT)
+_lock = threading.Lock()
+_metrics = {
+    "queued": 0, "running": 0, "submitted": 0, "completed": 0,
+    "failed": 0, "timed_out": 0, "rejected": 0,
+}
+
+
+class QueueFull(Exception):
+    pass
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+def _bump(name, delta=1):
+    with _lock:
+        _metrics[name] += delta
+
+
+def _finish(turn_id, status, answer=None, articles=None, error=None):
+    turn = db.session.get(ChatTurnModel, turn_id)
+    if not turn:
+        return
+    turn.status = status
+    turn.answer = answer
+    turn.articles = articles
+    turn.error = error
+    turn.finished_at = datetime.now(timezone.utc)
+    db.session.commit()
+
+
+def _reserve(count, count_rejection=True):
+    with _lock:
+        if _metrics["queued"] + count > CHAT_MAX_QUEUE:
+            if count_rejection:
+                _metrics["rejected"] += 1
+            raise QueueFull()
+        _metrics["queued"] += count
+        _metrics["submitted"] += count
+
+
+def _run_limited(run, question, deadline, on_start=None):
+    """Call run(question, timeout) in one of the CHAT_MAX_INFLIGHT slots.
+
+    Raises DeadlineExceeded if no slot frees up before the deadline.
+    """
+    # Still "queued" (counted by _reserve) until a slot is actually held
+    remaining = deadline - time.monotonic()
+    acquired = remaining > 0 and _inflight.acquire(timeout=remaining)
+    _bump("queued", -1)
+    if not acquired:
+        raise DeadlineExceeded()
+
+    _bump("running")
+    try:
+        if on_start:
+            on_start()
+        # The remaining budget is passed on as the LLM request timeout
+        return run(question, max(deadline - time.monotonic(), 1))
+    finally:
+        _bump("running", -1)
+        _inflight.release()
+
+
+def _run_turn(app, turn_id, question, run, deadline):
+    def mark_running():
+        ChatTurnModel.query.filter_by(turn_id=turn_id).update({ChatTurnModel.status: ChatTurnStatus.running})
+        db.session.commit()
+
+    with app.app_context():
+        try:
+            try:
+                result = _run_limited(run, question, deadline, on_start=mark_running)
+            except DeadlineExceeded:
+                _bump("timed_out")
+                _finish(turn_id, ChatTurnStatus.timeout, error="Timed out waiting for the assistant")
+                return
+
+            _finish(turn_id, ChatTurnStatus.done, result["answer"], result.get("articles", []))
+            _bump("completed")
+        except Exception as e:
+            db.session.rollback()
+            print(f"ERROR in chat turn {turn_id}: {str(e)}")
+            if time.monotonic() >= deadline:
+                _bump("timed_out")
+                _finish(turn_id, ChatTurnStatus.timeout, error="The assistant took too long to answer")
+            else:
+                _bump("failed")
+                _finish(turn_id, ChatTurnStatus.failed, error="The assistant could not answer this question")
+        finally:
+            db.session.remove()
+
+
+def submit_turn(app, session_id, question, run, deadline=None):
+    """Queue run(question, timeout) for a chat turn and return the new ChatTurnModel.
+
+    Raises QueueFull when CHAT_MAX_QUEUE turns are already waiting.
+    """
+    _reserve(1)
+
+    try:
+        turn = ChatTurnModel(session_id=session_id, question=question, status=ChatTurnStatus.queued)
+        db.session.add(turn)
+        db.session.commit()
+    except Exception:
+        _bump("queued", -1)
+        raise
+
+    expires = time.monotonic() + (deadline or CHAT_TURN_DEADLINE)
+    _executor.submit(_run_turn, app, turn.turn_id, question, run, expires)
+    return turn
+
+
+def _run_batch_question(app, question, run, deadline):
+    with app.app_context():
+        try:
+            result = _run_limited(run, question, deadline)
+            _bump("completed")
+            return result
+        except DeadlineExceeded:
+            _bump("timed_out")
+            raise
+        except Exception:
+            _bump("failed")
+            raise
+        finally:
+            db.session.remove()
+
+
+def run_batch(app, questions, run, deadline=None):
+    """Run run(question, timeout) for each question on the shared chat executor.
+
+    Blocks until the batch is done and returns one finished future per question.
+    Only CHAT_MAX_INFLIGHT of a batch are queued at a time, each with its own
+    deadline from when it is queued, so a batch of any size fits in the queue
+    and its last questions get the same budget as its first. Raises QueueFull if
+    not even the first question fits; a later question that finds the queue
+    full with nothing of the batch left to wait on fails with QueueFull.
+    """
+    futures = []
+    outstanding = set()
+    for question in questions:
+        future = None
+        while future is None:
+            if len(outstanding) < CHAT_MAX_INFLIGHT:
+                try:
+                    # A batch waiting on its own questions is not a rejection
+                    _reserve(1, count_rejection=not outstanding)
+                except QueueFull:
+                    if not futures:
+                        raise
+                    if not outstanding:
+                        future = Future()
+                        future.set_exception(QueueFull())
+                        break
+                else:
+                    expires = time.monotonic() + (deadline or CHAT_TURN_DEADLINE)
+                    future = _executor.submit(_run_batch_question, app, question, run, expires)
+                    outstanding.add(future)
+                    break
+            _, outstanding = wait_futures(outstanding, return_when=FIRST_COMPLETED)
+        futures.append(future)
+    wait_futures(outstanding)
+    return futures
+
+
+def _expire_stale_turn(turn_id):
+    """Mark the turn timed out if it has been pending longer than any worker would run it."""
+    expired = ChatTurnModel.query.filter(
+        ChatTurnModel.turn_id == turn_id,
+        ChatTurnModel.status.in_((ChatTurnStatus.queued, ChatTurnStatus.running)),
+        ChatTurnModel.created_at < db.func.now() - timedelta(seconds=CHAT_TURN_STALE_SECONDS),
+    ).update({
+        ChatTurnModel.status: ChatTurnStatus.timeout,
+        ChatTurnModel.error: "The assistant stopped working on this question",
+        ChatTurnModel.finished_at: db.func.now(),
+    }, synchronize_session=False)
+    db.session.commit()
+    return expired > 0
+
+
+def wait_for_turn(turn_id, wait=0, interval=0.25):
+    """Long-poll a turn until it leaves queued/running or `wait` seconds pass."""
+    stop = time.monotonic() + wait
+    while True:
+        turn = db.session.get(ChatTurnModel, turn_id)
+        if not turn or turn.status not in (ChatTurnStatus.queued, ChatTurnStatus.running):
+            return turn
+        age = datetime.now(timezone.utc) - turn.created_at if turn.created_at else timedelta(0)
+        if age.total_seconds() > CHAT_TURN_STALE_SECONDS and _expire_stale_turn(turn_id):
+            db.session.expire(turn)
+            return db.session.get(ChatTurnModel, turn_id)
+        if time.monotonic() >= stop:
+            return turn
+        db.session.expire(turn)
+        db.session.commit()
+        time.sleep(interval)
+
+
+def turn_metrics():
+    with _lock:
+        metrics = dict(_metrics)
+    metrics.update({
+        "workers": CHAT_WORKERS,
+        "max_inflight": CHAT_MAX_INFLIGHT,
+        "max_queue": CHAT_MAX_QUEUE,
+        "deadline_seconds": CHAT_TURN_DEADLINE,
+    })
+    return metrics
@@ -1,9 +1,27 @@
-import google.generativeai as genai
 import os
+import threading
+from llm_backends import get_backend
+from prompt_budget import build_budgeted_prompt
+from regulation_index import RegulationIndex
+from regulation_tables import RegulationTables, match_structured_question
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+# The LLM backend is created on first use; CHAT_LLM_BACKEND selects gemini, fake, record or replay
+_backend = None
+_backend_lock = threading.Lock()
 
-model = genai.GenerativeModel("gemini-1.5-flash")
+
+def llm_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = get_backend()
+    return _backend
+
+
+def set_llm_backend(backend):
+    global _backend
+    _backend = backend
 
 # Load the full rules text
 
@@ -11,18 +29,60 @@ base_dir = os.path.dirname(os.path.abspath(__file__))
 rules_file = os.path.join(base_dir, "Internal_Regulation_EN.txt")
 rules_text = open(rules_file, encoding="utf-8").read()
 
+# Only the top-k matching articles are sent to the model, not the whole file
+CHAT_TOP_K = int(os.getenv("CHAT_TOP_K", 4))
+CHAT_CONTEXT_MAX_CHARS = int(os.getenv("CHAT_CONTEXT_MAX_CHARS", 12000))
+CHAT_CHUNK_CHARS = int(os.getenv("CHAT_CHUNK_CHARS", 1500))
+
+rules_index = RegulationIndex(rules_text, chunk_chars=CHAT_CHUNK_CHARS)
+rules_tables = RegulationTables(rules_text)
+
+
+def fast_answer(question):
+    # Table lookups (GPA -> letter, credit-hour levels, limits) are answered without the LLM
+    result = match_structured_question(rules_tables, question)
+    if result is not None:
+        result["fast_path"] = True
+        result["prompt_tokens"] = 0
+    return result
 
-def ask_rule_question(question):
-    prompt = f"""
-You are a university assistant. :
 
-{rules_text}
+def build_prompt(question, top_k=None, max_chars=None, history=None):
+    """Return (prompt, articles, stats) packed into CHAT_PROMPT_TOKEN_BUDGET."""
+    top_k = top_k or CHAT_TOP_K
+    chunks = rules_index.search(
+        question,
+        top_k=top_k,
+        max_chars=max_chars or CHAT_CONTEXT_MAX_CHARS,
+        in_order=False,
+    )
+    if not chunks:
+        chunks = rules_index.chunks[:top_k]
+    return build_budgeted_prompt(question, chunks, history)
 
-Question: {question}
 
-"""
-    response = model.generate_content(prompt)
-    return response.text.strip()
+def answer_rule_question(question, top_k=None, max_chars=None, timeout=None, history=None):
+    fast = fast_answer(question)
+    if fast is not None:
+        return fast
+
+    prompt, articles, stats = build_prompt(question, top_k, max_chars, history)
+    answer = llm_backend().generate(prompt, timeout=timeout)
+    return {"answer": answer, "articles": articles, "prompt_tokens": stats["prompt_tokens"]}
+
+
+def stream_rule_question(question, top_k=None, max_chars=None, history=None):
+    """Return the articles used, prompt stats and a generator of answer chunks."""
+    fast = fast_answer(question)
+    if fast is not None:
+        return fast["articles"], {"prompt_tokens": 0}, iter([fast["answer"]])
+
+    prompt, articles, stats = build_prompt(question, top_k, max_chars, history)
+    return articles, stats, llm_backend().stream(prompt)
+
+
+def ask_rule_question(question):
+    return answer_rule_question(question)["answer"]
 
 # Example usage:
-#print(ask_rule_question("my GPA is 3.77, what's the letter for that?"))
\ No newline at end of file
+#print(ask_rule_question("my GPA is 3.77, what's the letter for that?"))
@@ -0,0 +1,49 @@
+import hashlib
+import uuid
+from flask import request, make_response
+from sqlalchemy import text
+from models import db
+
+# Conditional GETs for the list endpoints. Database triggers bump a version in
+# collection_versions on every insert/update/delete of a user's complaints,
+# suggestions, notifications or chat sessions (see migration 1c4e8a7d2f90), so
+# a list's ETag is one primary-key read and an unchanged list answers 304
+# without loading any rows.
+
+COMPLAINTS = "complaints"
+SUGGESTIONS = "suggestions"
+NOTIFICATIONS = "notifications"
+CHAT_SESSIONS = "chat_sessions"
+
+# Scope of the admin-wide complaint and suggestion lists
+GLOBAL_SCOPE = uuid.UUID(int=0)
+
+VERSION_SQL = text("""
+    SELECT version FROM collection_versions WHERE scope_id = :scope_id AND collection = :collection
+""")
+
+
+def collection_version(scope_id, collection):
+    return db.session.execute(VERSION_SQL, {"scope_id": scope_id, "collection": collection}).scalar() or 0
+
+
+def list_etag(scope_id, collection):
+    """Weak ETag for this request's view of a collection (query string included, so pages/filters differ)."""
+    version = collection_version(scope_id, collection)
+    digest = hashlib.sha1(f"{scope_id}:{collection}:{version}:{request.full_path}".encode()).hexdigest()[:20]
+    return f"{collection}-{version}-{digest}"
+
+
+def not_modified(etag):
+    """A 304 response if the client already has this ETag, else None."""
+    if request.if_none_match.contains_weak(etag):
+        return with_etag(make_response("", 304), etag)
+    return None
+
+
+def with_etag(response, etag):
+    response = make_response(response)
+    response.set_etag(etag, weak=True)
+    # Always revalidate; the browser keeps the body and we answer 304 while it is current
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
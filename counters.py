@@ -0,0 +1,78 @@
+from sqlalchemy import text
+from models import db
+
+# Dashboard counts kept in the stat_counters table by database triggers on
+# complaints, suggestions, users and notifications (migration 6d2a8f4c9e05), so
+# the admin dashboard reads all of them in one statement. reconcile_counters()
+# rebuilds them from scratch if they ever drift.
+
+COMPLAINTS = "complaints"
+SUGGESTIONS = "suggestions"
+STUDENTS = "students"
+UNREAD_NOTIFICATIONS = "unread_notifications"
+
+RECOUNT_SQL = {
+    COMPLAINTS: "SELECT COUNT(*) FROM complaints",
+    SUGGESTIONS: "SELECT COUNT(*) FROM suggestions",
+    STUDENTS: "SELECT COUNT(*) FROM users WHERE users_role = 'student'",
+    UNREAD_NOTIFICATIONS: "SELECT COUNT(*) FROM notifications WHERE NOT COALESCE(notification_is_read, false)",
+}
+
+def read_counters():
+    rows = db.session.execute(text("SELECT counter_name, counter_value FROM stat_counters")).all()
+    values = {name: 0 for name in RECOUNT_SQL}
+    values.update({name: value for name, value in rows})
+    return values
+
+
+def reconcile_counters():
+    """Recompute every counter from the base tables; returns {name: (old, new)}."""
+    old = read_counters()
+    changes = {}
+    for name, sql in RECOUNT_SQL.items():
+        value = db.session.execute(text(sql)).scalar()
+        db.session.execute(text("""
+            INSERT INTO stat_counters (counter_name, counter_value) VALUES (:name, :value)
+            ON CONFLICT (counter_name) DO UPDATE SET counter_value = EXCLUDED.counter_value
+        """), {"name": name, "value": value})
+        changes[name] = (old.get(name, 0), value)
+    db.session.commit()
+    return changes
+
+
+# Per-user badge counts live in user_counters and are kept current by database
+# triggers on complaints, suggestions and notifications (see migration
+# 0b6d3e5f8a21), so fan-out inserts and cascading deletes are covered too.
+
+USER_COUNTERS_SQL = text("""
+    SELECT complaints_count, suggestions_count, unread_notifications_count
+    FROM user_counters WHERE user_id = :user_id
+""")
+
+RECONCILE_USER_COUNTERS_SQL = text("""
+    INSERT INTO user_counters (user_id, complaints_count, suggestions_count, unread_notifications_count)
+    SELECT u.users_id,
+           (SELECT COUNT(*) FROM complaints c WHERE c.sender_id = u.users_id),
+           (SELECT COUNT(*) FROM suggestions s WHERE s.users_id = u.users_id),
+           (SELECT COUNT(*) FROM notifications n WHERE n.user_id = u.users_id AND NOT COALESCE(n.notification_is_read, false))
+    FROM users u
+    ON CONFLICT (user_id) DO UPDATE SET
+        complaints_count = EXCLUDED.complaints_count,
+        suggestions_count = EXCLUDED.suggestions_count,
+        unread_notifications_count = EXCLUDED.unread_notifications_count
+    WHERE (user_counters.complaints_count, user_counters.suggestions_count, user_counters.unread_notifications_count)
+          IS DISTINCT FROM (EXCLUDED.complaints_count, EXCLUDED.suggestions_count, EXCLUDED.unread_notifications_count)
+""")
+
+
+def read_user_counters(user_id):
+    """The user's (complaints, suggestions, unread_notifications) in one primary-key read."""
+    row = db.session.execute(USER_COUNTERS_SQL, {"user_id": user_id}).first()
+    return tuple(row) if row else (0, 0, 0)
+
+
+def reconcile_user_counters():
+    """Recompute every user's counters; returns how many rows were out of date."""
+    changed = db.session.execute(RECONCILE_USER_COUNTERS_SQL).rowcount
+    db.session.commit()
+    return changed
@@ -1,7 +1,7 @@
 from api import app, db
 from models import UserModel, UserRole
 import uuid
-from werkzeug.security import generate_password_hash
+from passwords import hash_password
 
 def create_admins():
     with app.app_context(): 
@@ -9,7 +9,7 @@ def create_admins():
             users_id=uuid.uuid4(),
             users_name="Admin 1",
             users_email="admin1@example.com",
-            users_password=generate_password_hash("password123"),
+            users_password=hash_password("password123"),
             users_role=UserRole.admin
         )
 
@@ -17,7 +17,7 @@ def create_admins():
             users_id=uuid.uuid4(),
             users_name="Admin 2",
             users_email="admin2@example.com",
-            users_password=generate_password_hash("password456"),
+            users_password=hash_password("password456"),
             users_role=UserRole.admin
         )
 
@@ -1,9 +1,10 @@
 import os
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
-import os
 
 load_dotenv()  # ← أهم حاجة في أول الملف
 
@@ -11,20 +12,195 @@ EMAIL_USER = os.getenv("EMAIL_USER")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
 EMAIL_SERVER = os.getenv("EMAIL_SERVER", "smtp.gmail.com")
 EMAIL_PORT = int(os.getenv("EMAIL_PORT", 587))
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "true").lower() != "false"
+EMAIL_POOL_SIZE = int(os.getenv("EMAIL_POOL_SIZE", 2))
+EMAIL_IDLE_CHECK_SECONDS = int(os.getenv("EMAIL_IDLE_CHECK_SECONDS", 30))
+EMAIL_MAX_IDLE_SECONDS = int(os.getenv("EMAIL_MAX_IDLE_SECONDS", 240))
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", 20))
 
-def send_notification_email(to_email, subject, body):
+
+class SMTPBatchError(Exception):
+    """A batch stopped part-way; `sent` messages were delivered before `__cause__` hit."""
+
+    def __init__(self, sent, cause):
+        super().__init__(f"{sent} sent before failure: {cause}")
+        self.sent = sent
+
+
+class SMTPPool:
+    """Keeps authenticated SMTP sessions alive so messages skip connect/STARTTLS/login."""
+
+    def __init__(self, host, port, user=None, password=None, use_tls=True, size=2,
+                 idle_check=30, max_idle=240, timeout=20):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_tls = use_tls
+        self.size = size
+        self.idle_check = idle_check
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.idle = []
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(size)
+        self.stats = {"connects": 0, "reuses": 0, "reconnects": 0, "sent": 0, "refused": 0}
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.user and self.password:
+                server.login(self.user, self.password)
+        except Exception:
+            self._close(server)
+            raise
+        with self.lock:
+            self.stats["connects"] += 1
+        return server
+
+    @staticmethod
+    def _close(server):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _checkout(self):
+        self.slots.acquire()
+        try:
+            while True:
+                with self.lock:
+                    entry = self.idle.pop() if self.idle else None
+                if entry is None:
+                    return self._connect()
+                server, last_used = entry
+                idle_for = time.monotonic() - last_used
+                if idle_for > self.max_idle:
+                    self._close(server)
+                    continue
+                if idle_for > self.idle_check:
+                    try:
+                        if server.noop()[0] != 250:
+                            raise smtplib.SMTPServerDisconnected("NOOP failed")
+                    except Exception:
+                        self._close(server)
+                        continue
+                with self.lock:
+                    self.stats["reuses"] += 1
+                return server
+        except Exception:
+            self.slots.release()
+            raise
+
+    def _checkin(self, server, healthy=True):
+        try:
+            if healthy:
+                with self.lock:
+                    self.idle.append((server, time.monotonic()))
+            else:
+                self._close(server)
+        finally:
+            self.slots.release()
+
+    def _send(self, server, msg):
+        server.sendmail(msg["From"], [msg["To"]], msg.as_string())
+
+    def send_many(self, messages):
+        """Send MIME messages over one pooled connection; returns how many were sent.
+
+        A dropped connection is re-opened once and the message retried. Refused
+        recipients are skipped (not counted as sent). Any other failure raises
+        SMTPBatchError carrying how many messages had already gone out, so a
+        caller can retry just the rest.
+        """
+        sent = 0
+        server = self._checkout()
+        healthy = True
+        try:
+            for msg in messages:
+                try:
+                    try:
+                        self._send(server, msg)
+                    except OSError as e:
+                        # SMTPException subclasses OSError; only a dropped session is worth a new one
+                        if isinstance(e, smtplib.SMTPException) and not isinstance(e, smtplib.SMTPServerDisconnected):
+                            raise
+                        self._close(server)
+                        server = None
+                        with self.lock:
+                            self.stats["reconnects"] += 1
+                        server = self._connect()
+                        self._send(server, msg)
+                except smtplib.SMTPRecipientsRefused as e:
+                    print("Recipient refused:", str(e))
+                    with self.lock:
+                        self.stats["refused"] += 1
+                    continue
+                sent += 1
+        except Exception as e:
+            healthy = False
+            raise SMTPBatchError(sent, e) from e
+        finally:
+            with self.lock:
+                self.stats["sent"] += sent
+            if server is None:
+                self.slots.release()
+            else:
+                self._checkin(server, healthy)
+        return sent
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for server, _ in idle:
+            self._close(server)
+
+
+smtp_pool = SMTPPool(
+    EMAIL_SERVER, EMAIL_PORT, EMAIL_USER, EMAIL_PASSWORD,
+    use_tls=EMAIL_USE_TLS, size=EMAIL_POOL_SIZE,
+    idle_check=EMAIL_IDLE_CHECK_SECONDS, max_idle=EMAIL_MAX_IDLE_SECONDS, timeout=EMAIL_TIMEOUT,
+)
+
+
+def build_message(to_email, subject, body):
     msg = MIMEMultipart()
     msg["From"] = EMAIL_USER
     msg["To"] = to_email
     msg["Subject"] = subject
     msg.attach(MIMEText(body, "plain"))
+    return msg
+
+
+def send_many(emails):
+    """Send (to_email, subject, body) tuples over a single pooled SMTP connection.
 
+    Returns how many were actually delivered; on a failure part-way the ones
+    after it were not sent (the first `sent` were, so do not resend those).
+    """
+    messages = [build_message(to, subject, body) for to, subject, body in emails]
+    if not messages:
+        return 0
     try:
-        server = smtplib.SMTP(EMAIL_SERVER, EMAIL_PORT)
-        server.starttls()
-        server.login(EMAIL_USER, EMAIL_PASSWORD)
-        server.sendmail(EMAIL_USER, to_email, msg.as_string())
-        server.quit()
-        print("Email sent successfully.")
+        sent = smtp_pool.send_many(messages)
+    except SMTPBatchError as e:
+        print(f"Failed to send emails after {e.sent} of {len(messages)}:", str(e.__cause__))
+        return e.sent
     except Exception as e:
-        print("Failed to send email:", str(e))
+        print("Failed to send emails:", str(e))
+        return 0
+    if sent == len(messages):
+        print(f"{sent} emails sent successfully.")
+    else:
+        print(f"{sent} of {len(messages)} emails sent; the other recipients were refused.")
+    return sent
+
+
+def send_notification_email(to_email, subject, body):
+    """Returns True if the message was accepted by the server."""
+    return send_many([(to_email, subject, body)]) == 1
@@ -0,0 +1,115 @@
+import argparse
+import json
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import text
+from api import app, db, admin_complaints_query, admin_suggestions_query
+from pagination import ADMIN_PAGE_SIZE
+
+# Runs EXPLAIN on the hot queries and checks that each one uses its index.
+#   python explain_hot_queries.py            # planner's real choice
+#   python explain_hot_queries.py --force    # enable_seqscan=off, for small dev databases
+# Entries are raw SQL or a function returning the SQLAlchemy query an endpoint
+# actually runs, so ORDER BY / keyset changes there are checked here too.
+
+HOT_QUERIES = [
+    ("login / user by email", "ix_users_lower_email",
+     "SELECT * FROM users WHERE lower(users_email) = lower(:email)"),
+    ("student complaints", "ix_complaints_sender_id",
+     "SELECT * FROM complaints WHERE sender_id = :user_id"),
+    ("admin complaint list, first page", "ix_complaints_created_at_id",
+     lambda p: admin_complaints_query(list_args())),
+    ("admin complaint list, next page", "ix_complaints_created_at_id",
+     lambda p: admin_complaints_query(list_args(p["cursor"]))),
+    ("student suggestions", "ix_suggestions_users_id",
+     "SELECT * FROM suggestions WHERE users_id = :user_id"),
+    ("admin suggestion list, first page", "ix_suggestions_created_at_id",
+     lambda p: admin_suggestions_query(list_args())),
+    ("admin suggestion list, next page", "ix_suggestions_created_at_id",
+     lambda p: admin_suggestions_query(list_args(p["cursor"]))),
+    ("user notifications", "ix_notifications_user_read_created",
+     "SELECT * FROM notifications WHERE user_id = :user_id ORDER BY notification_created_at DESC"),
+    ("notification sync since cursor", "ix_notifications_user_xid_id",
+     "SELECT * FROM notifications WHERE user_id = :user_id AND notification_xid >= pg_snapshot_xmin(pg_current_snapshot()) "
+     "ORDER BY notification_xid, notification_id LIMIT 201"),
+    ("unread count per user", "ix_notifications_user_unread",
+     "SELECT COUNT(*) FROM notifications WHERE user_id = :user_id AND notification_is_read = false"),
+    ("unread count (admin dashboard)", "ix_notifications_unread",
+     "SELECT COUNT(*) FROM notifications WHERE notification_is_read = false"),
+    ("student dashboard badges", "user_counters_pkey",
+     "SELECT * FROM user_counters WHERE user_id = :user_id"),
+    ("chat messages of a session", "ix_chat_messages_session_created",
+     "SELECT * FROM chat_messages WHERE session_id = :session_id ORDER BY created_at"),
+    ("chat sessions of a user", "ix_chat_sessions_users_created",
+     "SELECT * FROM chat_sessions WHERE users_id = :user_id ORDER BY session_created_at DESC"),
+]
+
+
+def list_args(cursor=None):
+    """The args list_page_args() produces for an unfiltered admin list request."""
+    return {"limit": ADMIN_PAGE_SIZE, "cursor": cursor, "status": None, "type": None,
+            "dep": None, "date_from": None, "date_to": None}
+
+
+def explain(sql, params):
+    if callable(sql):
+        compiled = sql(params).statement.compile(dialect=db.engine.dialect)
+        bound = {k: str(v) if isinstance(v, uuid.UUID) else v for k, v in compiled.params.items()}
+        return db.session.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", bound).scalar()
+    return db.session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params).scalar()
+
+
+def plan_indexes(node, found=None):
+    found = set() if found is None else found
+    if "Index Name" in node:
+        found.add(node["Index Name"])
+    for child in node.get("Plans", []):
+        plan_indexes(child, found)
+    return found
+
+
+def plan_sorts(node):
+    """True if the plan sorts rows itself, i.e. the index does not deliver the ORDER BY."""
+    return node.get("Node Type") in ("Sort", "Incremental Sort") or any(plan_sorts(c) for c in node.get("Plans", []))
+
+
+def sample_params():
+    user = db.session.execute(text("SELECT users_id, users_email FROM users LIMIT 1")).first()
+    session = db.session.execute(text("SELECT sessions_id FROM chat_sessions LIMIT 1")).first()
+    return {
+        # A mid-table keyset position, as a "load more" request would send
+        "cursor": (datetime.now(timezone.utc), uuid.UUID(int=0)),
+        "email": user.users_email if user else "nobody@example.com",
+        "user_id": user.users_id if user else "00000000-0000-0000-0000-000000000000",
+        "session_id": session.sessions_id if session else "00000000-0000-0000-0000-000000000000",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that hot queries use their indexes")
+    parser.add_argument("--force", action="store_true", help="disable sequential scans while explaining")
+    args = parser.parse_args()
+
+    failures = 0
+    with app.app_context():
+        params = sample_params()
+        if args.force:
+            db.session.execute(text("SET LOCAL enable_seqscan = off"))
+        for label, index, sql in HOT_QUERIES:
+            raw = explain(sql, params)
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            used = plan_indexes(plan)
+            # Keyset pages must come off the index already ordered
+            sorted_in_plan = callable(sql) and plan_sorts(plan)
+            ok = index in used and not sorted_in_plan
+            failures += 0 if ok else 1
+            note = " (with a Sort node)" if sorted_in_plan else ""
+            print(f"[{'OK' if ok else 'MISS'}] {label}: expected {index}, plan uses {sorted(used) or 'no index'}{note}")
+        db.session.rollback()
+
+    print(f"\n{len(HOT_QUERIES) - failures}/{len(HOT_QUERIES)} hot queries use their index")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ import { useState } from 'react';
 import { useRouter } from 'next/navigation';
 import { FaGraduationCap } from "react-icons/fa";
 import { FaEye, FaEyeSlash } from "react-icons/fa"; 
+import { apiFetch } from '../apiFetch';
 
 const api = process.env.NEXT_PUBLIC_API_URL;
 
@@ -28,7 +29,7 @@ export default function AdminAddStudentPage() {
     }
 
     try {
-      const res = await fetch(`${api}/api/admin/add_student`, {
+      const res = await apiFetch(`${api}/api/admin/add_student`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
@@ -3,6 +3,7 @@
 import { useEffect, useState } from 'react';
 import { useParams, useRouter } from 'next/navigation';
 import { FaArrowLeft, FaPaperclip, FaClock, FaUser, FaUserShield, FaEnvelope, FaExclamationCircle, FaCheckCircle, FaEdit, FaSync } from "react-icons/fa";
+import { apiFetch } from '../../apiFetch';
 
 export default function ComplaintDetailsPage() {
   const router = useRouter();
@@ -27,7 +28,7 @@ export default function ComplaintDetailsPage() {
 
     const fetchComplaint = async () => {
       try {
-        const res = await fetch(`${api}/api/admin/get_complaint?id=${id}`);
+        const res = await apiFetch(`${api}/api/admin/get_complaint?id=${id}`);
         if (!res.ok) throw new Error('Fetch failed');
         const data = await res.json();
         setComplaint(data);
@@ -56,7 +57,7 @@ export default function ComplaintDetailsPage() {
     setUpdating(true);
     setStatusMessage('');
     try {
-      const res = await fetch(`${api}/api/admin/update_status`, {
+      const res = await apiFetch(`${api}/api/admin/update_status`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ complaint_id: id, new_status: status })
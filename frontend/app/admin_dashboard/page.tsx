@@ -2,6 +2,8 @@
 import { useEffect, useState, useRef } from 'react';
 import { useRouter } from 'next/navigation';
 import { FaSignOutAlt, FaBell, FaExclamationCircle, FaLightbulb, FaUsers, FaChartBar, FaCog, FaHome } from 'react-icons/fa';
+import { useNotificationStream, mergeNotification } from '../useNotificationStream';
+import { apiFetch, clearToken } from '../apiFetch';
 
 export default function AdminDashboard() {
   const [adminName, setAdminName] = useState('Admin');
@@ -34,7 +36,7 @@ export default function AdminDashboard() {
         router.replace('/login');
       }
     } else {
-      fetch(`${api}/api/get_admin_name/${encodeURIComponent(email)}`)
+      apiFetch(`${api}/api/get_admin_name/${encodeURIComponent(email)}`)
         .then(res => res.json())
         .then(data => {
           if (data.name) {
@@ -54,7 +56,7 @@ export default function AdminDashboard() {
   // دالة منفصلة لجلب الإحصائيات
   const fetchDashboardStats = async () => {
     try {
-      const response = await fetch(`${api}/api/admin/dashboard_stats`);
+      const response = await apiFetch(`${api}/api/admin/dashboard_stats`);
       const data = await response.json();
       
       if (response.ok) {
@@ -80,11 +82,11 @@ export default function AdminDashboard() {
   };
 
   // Fetch notifications
-  useEffect(() => {
+  const fetchNotifications = () => {
     const email = localStorage.getItem('admin_email');
     if (!email) return;
 
-    fetch(`${api}/api/admin/notifications?admin_email=${encodeURIComponent(email)}`)
+    apiFetch(`${api}/api/admin/notifications?admin_email=${encodeURIComponent(email)}`)
       .then(res => res.json())
       .then(data => {
         if (Array.isArray(data)) {
@@ -99,12 +101,24 @@ export default function AdminDashboard() {
       .catch(err => {
         console.error("Failed to fetch notifications:", err);
       });
+  };
+
+  useEffect(() => {
+    fetchNotifications();
   }, []);
 
+  useNotificationStream('admin_email', event => {
+    setNotifications(prev => mergeNotification(prev, event));
+    // Read-state changes come from this tab's own clicks, which update the count themselves
+    if (event.op === 'insert' && !event.is_read) {
+      setStats(prev => ({ ...prev, unreadNotifications: prev.unreadNotifications + 1 }));
+    }
+  }, fetchNotifications);
+
   const handleNotificationClick = async (notification: Notification) => {
     if (!notification.is_read) {
       try {
-        await fetch(`${api}/api/admin/mark_notification_read`, {
+        await apiFetch(`${api}/api/admin/mark_notification_read`, {
           method: 'POST',
           headers: { 'Content-Type': 'application/json' },
           body: JSON.stringify({ notification_id: notification.id })
@@ -136,6 +150,7 @@ export default function AdminDashboard() {
 
   const handleLogout = () => {
     localStorage.removeItem('admin_email');
+    clearToken();
     router.push('/login');
   };
 
@@ -3,6 +3,7 @@
 import { useState } from 'react';
 import { FaArrowLeft, FaArrowRight} from "react-icons/fa";
 import {  useRouter } from 'next/navigation';
+import { apiFetch } from '../apiFetch';
 
 const api = process.env.NEXT_PUBLIC_API_URL;
 
@@ -25,7 +26,7 @@ export default function DeleteStudentPage() {
   }
 
     try {
-      const res = await fetch(`${api}/api/admin_delete_student`, {
+      const res = await apiFetch(`${api}/api/admin_delete_student`, {
         method: 'DELETE',
         headers: {
           'Content-Type': 'application/json',
@@ -3,9 +3,12 @@
 import { useEffect, useState } from 'react';
 import { FaArrowLeft, FaArrowRight, FaFilter } from "react-icons/fa";
 import { useParams, useRouter } from 'next/navigation';
+import { apiFetch } from '../apiFetch';
 
 const api = process.env.NEXT_PUBLIC_API_URL;
 
+const PAGE_SIZE = 50;
+
 type Complaint = {
   complaint_id: number;
   reference_code: number;
@@ -27,48 +30,53 @@ export default function ManageComplaintsPage() {
 
   const router = useRouter();
 
-  useEffect(() => {
-    const fetchComplaints = async () => {
-      try {
-        const res = await fetch(`${api}/api/admin/get_all_complaints`);
-        const data = await res.json();
-
-        if (Array.isArray(data)) {
-          setComplaints(data);
-        } else if (Array.isArray(data.complaints)) {
-          setComplaints(data.complaints);
-        } else {
-          setComplaints([]);
-        }
-      } catch (error) {
-        console.error('Failed to fetch complaints:', error);
-      } finally {
-        setLoading(false);
-      }
-    };
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
-    fetchComplaints();
-  }, []);
-
-  const filteredComplaints = complaints.filter((complaint) => {
-    const typeMatch =
-      selectedType === "All" || complaint.complaint_type === selectedType;
-
-    const normalizedStatus =
-      selectedStatus === "responded"
-        ? "done"
-        : selectedStatus === "received"
-        ? "under_checking"
-        : selectedStatus === "under review"
-        ? "under_review"
-        : selectedStatus;
+  // One page per request (newest first); the filters are applied by the server
+  const fetchPage = async (cursor: string | null) => {
+    const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+    if (selectedType !== "All") params.set('type', selectedType);
+    if (selectedStatus !== "All") params.set('status', selectedStatus);
+    if (cursor) params.set('cursor', cursor);
+    const res = await apiFetch(`${api}/api/admin/get_all_complaints?${params}`);
+    const data = await res.json();
+    if (Array.isArray(data)) return { rows: data as Complaint[], next: null };
+    if (Array.isArray(data.complaints)) return { rows: data.complaints as Complaint[], next: (data.next_cursor ?? null) as string | null };
+    return { rows: [] as Complaint[], next: null };
+  };
 
-    const statusMatch =
-      selectedStatus === "All" ||
-      complaint.complaint_status === normalizedStatus;
+  useEffect(() => {
+    let cancelled = false;
+    setLoading(true);
+    fetchPage(null)
+      .then(({ rows, next }) => {
+        if (cancelled) return;
+        setComplaints(rows);
+        setNextCursor(next);
+      })
+      .catch(error => console.error('Failed to fetch complaints:', error))
+      .finally(() => {
+        if (!cancelled) setLoading(false);
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, [selectedType, selectedStatus]);
 
-    return typeMatch && statusMatch;
-  });
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const { rows, next } = await fetchPage(nextCursor);
+      setComplaints(prev => [...prev, ...rows]);
+      setNextCursor(next);
+    } catch (error) {
+      console.error('Failed to fetch complaints:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   const departmentLabels: { [key: string]: string } = {
     IT: 'IT',
@@ -161,7 +169,7 @@ export default function ManageComplaintsPage() {
       {/* Complaints Table */}
       {loading ? (
         <p className="text-white mt-20 animate-bounce-fade">Loading complaints...</p>
-      ) : filteredComplaints.length === 0 ? (
+      ) : complaints.length === 0 ? (
         <p className="text-white mt-20">No complaints found.</p>
       ) : (
         <div className="relative w-full max-w-6xl overflow-x-auto rounded-3xl shadow-2xl border border-blue-200 bg-white z-10">
@@ -177,14 +185,14 @@ export default function ManageComplaintsPage() {
               </tr>
             </thead>
             <tbody>
-              {filteredComplaints.map((complaint, idx) => (
+              {complaints.map((complaint, idx) => (
                 <tr
                   key={complaint.complaint_id}
                   onClick={() => router.push(`/admin_complaint/${complaint.complaint_id}`)}
                   className={`border-t border-blue-200 transition cursor-pointer ${
                     idx % 2 === 0 ? "bg-blue-50" : "bg-blue-100/50"
                   } hover:bg-blue-200/60`}
-                  style={{ animation: `fadeUp 0.5s ease forwards ${idx * 0.08}s` }}
+                  style={{ animation: `fadeUp 0.5s ease forwards ${(idx % PAGE_SIZE) * 0.08}s` }}
                 >
                   <td className="px-6 py-3">{complaint.reference_code}</td>
                   <td className="px-6 py-3">{complaint.complaint_title}</td>
@@ -205,6 +213,16 @@ export default function ManageComplaintsPage() {
         </div>
       )}
 
+      {!loading && nextCursor && (
+        <button
+          onClick={loadMore}
+          disabled={loadingMore}
+          className="mt-6 mb-24 px-6 py-2 rounded-2xl bg-white/20 backdrop-blur-sm text-white font-medium shadow-lg hover:bg-white/30 transition disabled:opacity-60 z-10"
+        >
+          {loadingMore ? 'Loading...' : 'Load more'}
+        </button>
+      )}
+
       {/* Back Floating Button */}
       <button
         onClick={() => router.push('/admin_dashboard')}
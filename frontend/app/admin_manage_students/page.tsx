@@ -3,6 +3,7 @@
 import { useEffect, useState } from 'react';
 import { useRouter } from 'next/navigation';
 import { FaArrowLeft, FaPlus, FaEdit, FaTrash } from 'react-icons/fa';
+import { apiFetch } from '../apiFetch';
 
 const api = process.env.NEXT_PUBLIC_API_URL;
 
@@ -26,7 +27,7 @@ export default function ManageStudentsPage() {
 
     const fetchStudents = async () => {
       try {
-        const res = await fetch(`${api}/api/admin/get_all_students`);
+        const res = await apiFetch(`${api}/api/admin/get_all_students`);
         const data = await res.json();
 
         if (Array.isArray(data)) {
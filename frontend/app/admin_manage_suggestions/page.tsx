@@ -3,6 +3,9 @@
 import { useEffect, useState } from 'react';
 import { useRouter } from 'next/navigation';
 import { FaArrowLeft, FaFilter } from "react-icons/fa";
+import { apiFetch } from '../apiFetch';
+
+const PAGE_SIZE = 50;
 
 type Suggestion = {
   suggestion_id: number;
@@ -25,45 +28,59 @@ export default function ManageSuggestionsPage() {
 
   const router = useRouter();
 
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  // One page per request (newest first); the filters are applied by the server
+  const fetchPage = async (cursor: string | null) => {
+    const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+    if (selectedType !== "All") params.set('type', selectedType);
+    if (selectedStatus !== "All") params.set('status', selectedStatus);
+    if (cursor) params.set('cursor', cursor);
+    const res = await apiFetch(`${api}/api/admin/get_all_suggestions?${params}`);
+    const data = await res.json();
+    if (Array.isArray(data)) return { rows: data as Suggestion[], next: null };
+    if (Array.isArray(data.suggestions)) return { rows: data.suggestions as Suggestion[], next: (data.next_cursor ?? null) as string | null };
+    return { rows: [] as Suggestion[], next: null };
+  };
+
   useEffect(() => {
     const role = localStorage.getItem("role");
     if (role !== "admin") {
       router.push("/no-access");
       return;
     }
-    
-    const fetchSuggestions = async () => {
-      try {
-        const res = await fetch(`${api}/api/admin/get_all_suggestions`);
-        const data = await res.json();
-
-        if (Array.isArray(data)) {
-          setSuggestions(data);
-        } else if (Array.isArray(data.suggestions)) {
-          setSuggestions(data.suggestions);
-        } else {
-          setSuggestions([]);
-        }
-      } catch (error) {
-        console.error('Failed to fetch suggestions:', error);
-      } finally {
-        setLoading(false);
-      }
-    };
-
-    fetchSuggestions();
-  }, []);
 
-  const filteredSuggestions = suggestions.filter((suggestion) => {
-    const typeMatch =
-      selectedType === "All" || suggestion.suggestion_type === selectedType;
-
-    const statusMatch =
-      selectedStatus === "All" ||
-      suggestion.suggestion_status === selectedStatus;
+    let cancelled = false;
+    setLoading(true);
+    fetchPage(null)
+      .then(({ rows, next }) => {
+        if (cancelled) return;
+        setSuggestions(rows);
+        setNextCursor(next);
+      })
+      .catch(error => console.error('Failed to fetch suggestions:', error))
+      .finally(() => {
+        if (!cancelled) setLoading(false);
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, [selectedType, selectedStatus]);
 
-    return typeMatch && statusMatch;
-  });
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const { rows, next } = await fetchPage(nextCursor);
+      setSuggestions(prev => [...prev, ...rows]);
+      setNextCursor(next);
+    } catch (error) {
+      console.error('Failed to fetch suggestions:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   const typeLabels: { [key: string]: string } = {
     IT: 'IT',
@@ -148,7 +165,7 @@ export default function ManageSuggestionsPage() {
       {/* Suggestions Table */}
       {loading ? (
         <p className="text-white mt-20 animate-bounce-fade">Loading suggestions...</p>
-      ) : filteredSuggestions.length === 0 ? (
+      ) : suggestions.length === 0 ? (
         <p className="text-white mt-20">No suggestions found.</p>
       ) : (
         <div className="relative w-full max-w-6xl overflow-x-auto rounded-3xl shadow-2xl border border-blue-200 bg-white z-10">
@@ -164,14 +181,14 @@ export default function ManageSuggestionsPage() {
               </tr>
             </thead>
             <tbody>
-              {filteredSuggestions.map((suggestion, idx) => (
+              {suggestions.map((suggestion, idx) => (
                 <tr
                   key={suggestion.suggestion_id}
                   onClick={() => router.push(`/admin_suggestion/${suggestion.suggestion_id}`)}
                   className={`border-t border-blue-200 transition cursor-pointer ${
                     idx % 2 === 0 ? "bg-blue-50" : "bg-blue-100/50"
                   } hover:bg-blue-200/60`}
-                  style={{ animation: `fadeUp 0.5s ease forwards ${idx * 0.08}s` }}
+                  style={{ animation: `fadeUp 0.5s ease forwards ${(idx % PAGE_SIZE) * 0.08}s` }}
                 >
                   <td className="px-6 py-3">{suggestion.reference_code}</td>
                   <td className="px-6 py-3">{suggestion.suggestion_title}</td>
@@ -190,6 +207,16 @@ export default function ManageSuggestionsPage() {
         </div>
       )}
 
+      {!loading && nextCursor && (
+        <button
+          onClick={loadMore}
+          disabled={loadingMore}
+          className="mt-6 mb-24 px-6 py-2 rounded-2xl bg-white/20 backdrop-blur-sm text-white font-medium shadow-lg hover:bg-white/30 transition disabled:opacity-60 z-10"
+        >
+          {loadingMore ? 'Loading...' : 'Load more'}
+        </button>
+      )}
+
       {/* Back Floating Button */}
       <button
         onClick={() => router.push('/admin_dashboard')}
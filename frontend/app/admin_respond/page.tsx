@@ -4,6 +4,7 @@ import { useSearchParams, useRouter } from 'next/navigation';
 import Link from "next/link";
 import { FaArrowLeft, FaPaperPlane, FaExclamationTriangle } from "react-icons/fa";
 import { useState, useEffect } from 'react';
+import { apiFetch } from '../apiFetch';
 
 export default function RespondPage() {
   const [id, setId] = useState<string | null>(null);
@@ -56,7 +57,7 @@ export default function RespondPage() {
     setSubmitting(true);
 
     try {
-      const idRes = await fetch(`${api}/api/get_admin_id?admin_email=${adminEmail}`);
+      const idRes = await apiFetch(`${api}/api/get_admin_id?admin_email=${adminEmail}`);
       const idData = await idRes.json();
       const adminId = idData.status === 'success' ? idData.admin_id : null;
 
@@ -66,7 +67,7 @@ export default function RespondPage() {
         return;
       }
 
-      const res = await fetch(`${api}/api/admin/respond`, {
+      const res = await apiFetch(`${api}/api/admin/respond`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
@@ -78,7 +79,7 @@ export default function RespondPage() {
 
       const result = await res.json();
       if (result.status === 'success') {
-        await fetch(`${api}/api/admin/update_status`, {
+        await apiFetch(`${api}/api/admin/update_status`, {
           method: 'POST',
           headers: { 'Content-Type': 'application/json' },
           body: JSON.stringify({ complaint_id: id, new_status: 'done' })
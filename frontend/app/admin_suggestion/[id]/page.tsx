@@ -3,6 +3,7 @@
 import { useEffect, useState } from 'react';
 import { useParams, useRouter } from 'next/navigation';
 import { FaArrowLeft, FaPaperclip, FaClock, FaUser, FaUserShield, FaLightbulb, FaCheckCircle, FaEdit, FaSync, FaExclamationCircle } from "react-icons/fa";
+import { apiFetch } from '../../apiFetch';
 
 export default function SuggestionDetailsPage() {
   const router = useRouter();
@@ -27,7 +28,7 @@ export default function SuggestionDetailsPage() {
 
     const fetchSuggestion = async () => {
       try {
-        const res = await fetch(`${api}/api/admin/get_suggestion?id=${id}`);
+        const res = await apiFetch(`${api}/api/admin/get_suggestion?id=${id}`);
         if (!res.ok) throw new Error('Fetch failed');
         const data = await res.json();
         setSuggestion(data);
@@ -56,7 +57,7 @@ export default function SuggestionDetailsPage() {
     setUpdating(true);
     setStatusMessage('');
     try {
-      const res = await fetch(`${api}/api/admin/update_suggestion_status`, {
+      const res = await apiFetch(`${api}/api/admin/update_suggestion_status`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ suggestion_id: id, new_status: status })
@@ -4,6 +4,7 @@ import { useState } from 'react';
 import { useRouter } from 'next/navigation';
 import { FaArrowLeft, FaSearch, FaEye, FaEyeSlash } from "react-icons/fa";
 import { motion, AnimatePresence } from "framer-motion";
+import { apiFetch } from '../apiFetch';
 
 const api = process.env.NEXT_PUBLIC_API_URL;
 
@@ -26,7 +27,7 @@ export default function UpdateStudentPage() {
     }
 
     try {
-      const response = await fetch(`${api}/api/admin/get_student`, {
+      const response = await apiFetch(`${api}/api/admin/get_student`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ email: oldEmail }),
@@ -58,7 +59,7 @@ export default function UpdateStudentPage() {
     if (role !== "admin") return;
 
     try {
-      const response = await fetch(`${api}/api/admin/update_student`, {
+      const response = await apiFetch(`${api}/api/admin/update_student`, {
         method: 'PUT',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
@@ -0,0 +1,33 @@
+// Calls the API with the login token (Authorization: Bearer) while one is stored
+// and unexpired, so the server identifies the caller from the signed token
+// instead of looking the email up on every request. Without a token the request
+// goes out as before and the server falls back to the email parameters.
+
+const TOKEN_KEY = 'token';
+const TOKEN_EXPIRES_KEY = 'token_expires_at';
+
+export function storeToken(token: string, expiresInSeconds: number) {
+  localStorage.setItem(TOKEN_KEY, token);
+  localStorage.setItem(TOKEN_EXPIRES_KEY, String(Date.now() + expiresInSeconds * 1000));
+}
+
+export function clearToken() {
+  localStorage.removeItem(TOKEN_KEY);
+  localStorage.removeItem(TOKEN_EXPIRES_KEY);
+}
+
+export function authToken(): string | null {
+  if (typeof window === 'undefined') return null;
+  const token = localStorage.getItem(TOKEN_KEY);
+  const expiresAt = Number(localStorage.getItem(TOKEN_EXPIRES_KEY) || 0);
+  if (!token || Date.now() >= expiresAt) return null;
+  return token;
+}
+
+export function apiFetch(input: string, init: RequestInit = {}) {
+  const token = authToken();
+  if (!token) return fetch(input, init);
+  const headers = new Headers(init.headers);
+  headers.set('Authorization', `Bearer ${token}`);
+  return fetch(input, { ...init, headers });
+}
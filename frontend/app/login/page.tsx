@@ -3,6 +3,7 @@
 import { useState } from 'react';
 import { useRouter } from 'next/navigation';
 import { FaEye, FaEyeSlash } from "react-icons/fa"; 
+import { storeToken } from '../apiFetch';
 
 
 const api = process.env.NEXT_PUBLIC_API_URL;
@@ -30,6 +31,7 @@ export default function LoginPage() {
       if (res.ok) {
         localStorage.setItem('student_email', data.email);
         localStorage.setItem('role', data.role);
+        storeToken(data.token, data.expires_in);
 
         if (data.role === 'admin') {
           localStorage.setItem('admin_email', data.email);
@@ -33,6 +33,7 @@ import {
   Trash2,
   ChevronLeft
 } from 'lucide-react';
+import { apiFetch } from '../apiFetch';
 
 const api = process.env.NEXT_PUBLIC_API_URL;
 
@@ -81,7 +82,7 @@ export default function StudentChatPage() {
   }, [messages]);
 
   useEffect(() => {
-    fetch(`${api}/api/chat/welcome`)
+    apiFetch(`${api}/api/chat/welcome`)
       .then(res => res.json())
       .then(data => {
         setWelcomeMessage(data.message);
@@ -97,7 +98,7 @@ export default function StudentChatPage() {
   useEffect(() => {
     if (!userEmail) return;
 
-    fetch(`${api}/api/chat/sessions?email=${encodeURIComponent(userEmail)}`)
+    apiFetch(`${api}/api/chat/sessions?email=${encodeURIComponent(userEmail)}`)
       .then(res => res.json())
       .then(data => {
         setSessions(data);
@@ -108,7 +109,7 @@ export default function StudentChatPage() {
   useEffect(() => {
     if (!selectedSession || isStartingNewChat) return;
 
-    fetch(`${api}/api/chat/messages?session_id=${selectedSession}`)
+    apiFetch(`${api}/api/chat/messages?session_id=${selectedSession}`)
       .then(res => res.json())
       .then(data => setMessages(data))
       .catch(err => console.error("Failed to load messages", err));
@@ -118,7 +119,7 @@ export default function StudentChatPage() {
     setIsStartingNewChat(true);
     
     try {
-      const res = await fetch(`${api}/api/chat/start_session`, {
+      const res = await apiFetch(`${api}/api/chat/start_session`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ email: userEmail }),
@@ -133,7 +134,7 @@ export default function StudentChatPage() {
       setMessages([{ sender: 'bot', text: newSession.welcome_message || welcomeMessage }]);
       setSelectedSession(newSession.session_id);
       
-      const updatedSessions = await fetch(`${api}/api/chat/sessions?email=${userEmail}`).then(res => res.json());
+      const updatedSessions = await apiFetch(`${api}/api/chat/sessions?email=${userEmail}`).then(res => res.json());
       setSessions(updatedSessions);
     } catch (error) {
       console.error("Error starting new chat:", error);
@@ -145,12 +146,12 @@ export default function StudentChatPage() {
   const handleRename = async (sessionId: string, newTitle: string) => {
     if (!newTitle.trim()) return;
     
-    await fetch(`${api}/api/chat/rename_session`, {
+    await apiFetch(`${api}/api/chat/rename_session`, {
       method: "PUT",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({ session_id: sessionId, title: newTitle }),
     });
-    const updated = await fetch(`${api}/api/chat/sessions?email=${userEmail}`).then(res => res.json());
+    const updated = await apiFetch(`${api}/api/chat/sessions?email=${userEmail}`).then(res => res.json());
     setSessions(updated);
   };
 
@@ -177,12 +178,12 @@ export default function StudentChatPage() {
   };
 
   const handleDelete = async (sessionId: string) => {
-    await fetch(`${api}/api/chat/delete_session`, {
+    await apiFetch(`${api}/api/chat/delete_session`, {
       method: "DELETE",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({ session_id: sessionId }),
     });
-    const updated = await fetch(`${api}/api/chat/sessions?email=${userEmail}`).then(res => res.json());
+    const updated = await apiFetch(`${api}/api/chat/sessions?email=${userEmail}`).then(res => res.json());
     setSessions(updated);
     if (selectedSession === sessionId) {
       setSelectedSession(null);
@@ -202,7 +203,7 @@ export default function StudentChatPage() {
     setNewMessage('');
 
     try {
-      const res = await fetch(`${api}/api/chat/ask`, {
+      const res = await apiFetch(`${api}/api/chat/ask`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
@@ -221,7 +222,7 @@ export default function StudentChatPage() {
         };
         setMessages(prev => [...prev, botMsg]);
 
-        const updated = await fetch(`${api}/api/chat/sessions?email=${userEmail}`).then(res => res.json());
+        const updated = await apiFetch(`${api}/api/chat/sessions?email=${userEmail}`).then(res => res.json());
         setSessions(updated);
       } else {
         console.error('Bot error:', data.error);
@@ -3,6 +3,7 @@
 import { useEffect, useState } from 'react';
 import { useParams, useRouter } from 'next/navigation';
 import { FaArrowLeft, FaPaperclip, FaClock, FaUser, FaUserShield, FaEnvelope, FaExclamationCircle, FaCheckCircle } from "react-icons/fa";
+import { apiFetch } from '../../apiFetch';
 
 export default function StudentComplaintDetails() {
   const params = useParams();
@@ -30,7 +31,7 @@ export default function StudentComplaintDetails() {
     const fetchComplaint = async () => {
       try {
         const email = localStorage.getItem('student_email');
-        const res = await fetch(`${api}/api/student/get_complaint?id=${id}&student_email=${email}`);
+        const res = await apiFetch(`${api}/api/student/get_complaint?id=${id}&student_email=${email}`);
 
         if (!res.ok) throw new Error('Failed to fetch complaint');
         const data = await res.json();
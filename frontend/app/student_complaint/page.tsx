@@ -3,6 +3,7 @@
 import { useEffect, useState } from 'react';
 import { useRouter } from 'next/navigation';
 import { FaArrowLeft, FaPlus } from "react-icons/fa";
+import { apiFetch } from '../apiFetch';
 
 type Complaint = {
   complaint_id: number;
@@ -54,7 +55,7 @@ export default function ComplaintsPage() {
           return;
         }
 
-        const res = await fetch(`${api}/api/student/showcomplaints?student_email=${email}`);
+        const res = await apiFetch(`${api}/api/student/showcomplaints?student_email=${email}`);
         const data = await res.json();
         console.log("Fetched complaints:", data);
 
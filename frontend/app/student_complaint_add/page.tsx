@@ -2,6 +2,7 @@
 import { useEffect, useState } from 'react';
 import { useRouter } from 'next/navigation';
 import { FaArrowLeft, FaPaperclip, FaUser, FaUserSecret, FaExclamationCircle, FaHeadset, FaShieldAlt, FaLightbulb, FaExclamationTriangle } from "react-icons/fa";
+import { apiFetch } from '../apiFetch';
 
 export default function NewComplaintPage() {
   const api = process.env.NEXT_PUBLIC_API_URL;
@@ -125,7 +126,7 @@ export default function NewComplaintPage() {
         data.append('file', file);
       }
 
-      const res = await fetch(`${api}/api/student/addcomplaint`, {
+      const res = await apiFetch(`${api}/api/student/addcomplaint`, {
         method: 'POST',
         body: data,
       });
@@ -2,6 +2,8 @@
 import { useEffect, useState, useRef } from 'react';
 import { useRouter } from 'next/navigation';
 import { FaSignOutAlt, FaBell, FaExclamationCircle, FaLightbulb, FaComments, FaUserCircle, FaRocket, FaBullhorn } from 'react-icons/fa';
+import { useNotificationStream, mergeNotification } from '../useNotificationStream';
+import { apiFetch, clearToken } from '../apiFetch';
 
 // تعريف نوع الإشعار
 type Notification = {
@@ -55,7 +57,7 @@ export default function Dashboard() {
     const fetchStudentData = async () => {
       try {
         debugLog('Fetching student data from:', `${api}/api/student/${encodeURIComponent(email)}`);
-        const response = await fetch(`${api}/api/student/${encodeURIComponent(email)}`);
+        const response = await apiFetch(`${api}/api/student/${encodeURIComponent(email)}`);
         
         debugLog('Student API response status:', response.status);
         
@@ -83,7 +85,7 @@ export default function Dashboard() {
     const fetchDashboardStats = async () => {
       try {
         debugLog('Fetching dashboard stats from:', `${api}/api/student/dashboard_stats?student_email=${encodeURIComponent(email)}`);
-        const response = await fetch(`${api}/api/student/dashboard_stats?student_email=${encodeURIComponent(email)}`);
+        const response = await apiFetch(`${api}/api/student/dashboard_stats?student_email=${encodeURIComponent(email)}`);
         
         debugLog('Dashboard stats API response status:', response.status);
         
@@ -111,7 +113,7 @@ export default function Dashboard() {
       setIsLoadingNotifications(true);
       try {
         debugLog('Fetching notifications from:', `${api}/api/student/notifications?student_email=${encodeURIComponent(email)}`);
-        const response = await fetch(`${api}/api/student/notifications?student_email=${encodeURIComponent(email)}`);
+        const response = await apiFetch(`${api}/api/student/notifications?student_email=${encodeURIComponent(email)}`);
         
         debugLog('Notifications API response status:', response.status);
         
@@ -153,7 +155,7 @@ export default function Dashboard() {
   const tryAlternativeEndpoint = async (email: string) => {
     try {
       debugLog('Trying alternative endpoint:', `${api}/api/student/stats?student_email=${encodeURIComponent(email)}`);
-      const response = await fetch(`${api}/api/student/stats?student_email=${encodeURIComponent(email)}`);
+      const response = await apiFetch(`${api}/api/student/stats?student_email=${encodeURIComponent(email)}`);
       
       if (response.ok) {
         const data = await response.json();
@@ -170,10 +172,41 @@ export default function Dashboard() {
     }
   };
 
+  const refreshNotifications = async () => {
+    const email = localStorage.getItem('student_email');
+    if (!email) return;
+    try {
+      const [listResponse, statsResponse] = await Promise.all([
+        apiFetch(`${api}/api/student/notifications?student_email=${encodeURIComponent(email)}`),
+        apiFetch(`${api}/api/student/dashboard_stats?student_email=${encodeURIComponent(email)}`)
+      ]);
+      if (listResponse.ok) {
+        setNotifications(await listResponse.json());
+      }
+      if (statsResponse.ok) {
+        const data = await statsResponse.json();
+        setStats(prev => ({
+          ...prev,
+          unread_notifications: data.unread_notifications || data.unreadNotifications || 0
+        }));
+      }
+    } catch (error) {
+      debugLog('Error refreshing notifications:', error);
+    }
+  };
+
+  useNotificationStream('student_email', event => {
+    setNotifications(prev => mergeNotification(prev, event));
+    // Read-state changes come from this tab's own clicks, which update the count themselves
+    if (event.op === 'insert' && !event.is_read) {
+      setStats(prev => ({ ...prev, unread_notifications: prev.unread_notifications + 1 }));
+    }
+  }, refreshNotifications);
+
   const handleNotificationClick = async (notification: Notification) => {
     if (!notification.is_read) {
       try {
-        await fetch(`${api}/api/student/mark_notification_read`, {
+        await apiFetch(`${api}/api/student/mark_notification_read`, {
           method: 'POST',
           headers: { 'Content-Type': 'application/json' },
           body: JSON.stringify({ notification_id: notification.id })
@@ -206,6 +239,7 @@ export default function Dashboard() {
   const handleLogout = () => {
     localStorage.removeItem('student_email');
     localStorage.removeItem('role');
+    clearToken();
     router.push('/login');
   };
 
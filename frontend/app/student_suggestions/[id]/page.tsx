@@ -3,6 +3,7 @@
 import { useEffect, useState } from 'react';
 import { useParams, useRouter } from 'next/navigation';
 import { FaArrowLeft, FaPaperclip, FaLightbulb, FaUser, FaUserShield, FaCalendar, FaEnvelope } from "react-icons/fa";
+import { apiFetch } from '../../apiFetch';
 
 export default function SuggestionDetailsPage() {
   const params = useParams();
@@ -30,7 +31,7 @@ export default function SuggestionDetailsPage() {
     const fetchSuggestion = async () => {
       try {
         const email = localStorage.getItem("student_email");
-        const res = await fetch(`${api}/api/student/getsuggestion?id=${id}&student_email=${email}`);
+        const res = await apiFetch(`${api}/api/student/getsuggestion?id=${id}&student_email=${email}`);
 
         if (!res.ok) throw new Error('Fetch failed');
         const data = await res.json();
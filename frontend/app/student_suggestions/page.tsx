@@ -3,6 +3,7 @@
 import { useEffect, useState } from 'react';
 import { useRouter } from 'next/navigation';
 import { FaArrowLeft, FaPlus } from "react-icons/fa";
+import { apiFetch } from '../apiFetch';
 
 type Suggestion = {
     suggestion_id: string;
@@ -42,7 +43,7 @@ export default function SuggestionsPage() {
                     return;
                 }
 
-                const res = await fetch(`${api}/api/student/showsuggestions?student_email=${email}`);
+                const res = await apiFetch(`${api}/api/student/showsuggestions?student_email=${email}`);
                 const data = await res.json();
 
                 if (Array.isArray(data)) {
@@ -3,6 +3,7 @@
 import { useState, useRef, useEffect } from 'react';
 import { useRouter } from 'next/navigation';
 import { FaArrowLeft, FaPaperclip, FaUser, FaUserSecret, FaLightbulb, FaHeadset, FaShieldAlt, FaExclamationTriangle } from "react-icons/fa";
+import { apiFetch } from '../apiFetch';
 
 export default function NewSuggestionPage() {
     const router = useRouter();
@@ -141,7 +142,7 @@ export default function NewSuggestionPage() {
                 data.append('file', file);
             }
 
-            const res = await fetch(`${api}/api/student/addsuggestion`, {
+            const res = await apiFetch(`${api}/api/student/addsuggestion`, {
                 method: 'POST',
                 body: data,
             });
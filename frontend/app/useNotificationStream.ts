@@ -0,0 +1,92 @@
+'use client';
+import { useEffect, useRef } from 'react';
+import { authToken } from './apiFetch';
+
+// Live notifications from /api/notifications/stream (server-sent events).
+// The server caps open streams per worker; when it refuses one, or the browser
+// has no EventSource, this falls back to calling onResync every POLL_INTERVAL_MS.
+
+export type NotificationEvent = {
+  op: 'insert' | 'update';
+  id: string;
+  message: string;
+  is_read: boolean;
+  created_at: string;
+  complaint_id?: string | null;
+  suggestion_id?: string | null;
+};
+
+type ListedNotification = {
+  id: string;
+  message: string;
+  is_read: boolean;
+  created_at: string;
+  complaint_id?: string;
+  suggestion_id?: string;
+};
+
+const POLL_INTERVAL_MS = 60000;
+
+export function mergeNotification<T extends ListedNotification>(list: T[], event: NotificationEvent): T[] {
+  if (list.some(n => n.id === event.id)) {
+    return list.map(n => (n.id === event.id ? { ...n, is_read: event.is_read } : n));
+  }
+  if (event.op !== 'insert') return list;
+  const added = {
+    id: event.id,
+    message: event.message,
+    is_read: event.is_read,
+    created_at: event.created_at,
+    complaint_id: event.complaint_id || undefined,
+    suggestion_id: event.suggestion_id || undefined,
+  } as T;
+  return [added, ...list];
+}
+
+export function useNotificationStream(
+  emailKey: 'student_email' | 'admin_email',
+  onEvent: (event: NotificationEvent) => void,
+  onResync: () => void,
+) {
+  const handlers = useRef({ onEvent, onResync });
+  handlers.current = { onEvent, onResync };
+
+  useEffect(() => {
+    const api = process.env.NEXT_PUBLIC_API_URL;
+    const email = localStorage.getItem(emailKey);
+    if (!email) return;
+
+    let poll: ReturnType<typeof setInterval> | undefined;
+    const startPolling = () => {
+      if (!poll) poll = setInterval(() => handlers.current.onResync(), POLL_INTERVAL_MS);
+    };
+    if (typeof EventSource === 'undefined') {
+      startPolling();
+      return () => clearInterval(poll);
+    }
+
+    // EventSource cannot send headers, so the token goes in the query string
+    const token = authToken();
+    const query = token ? `token=${encodeURIComponent(token)}` : `${emailKey}=${encodeURIComponent(email)}`;
+    const source = new EventSource(`${api}/api/notifications/stream?${query}`);
+    let connected = false;
+    source.addEventListener('ready', () => {
+      // Streams end every few minutes and reconnect; catch up on anything in between
+      if (connected) handlers.current.onResync();
+      connected = true;
+    });
+    source.addEventListener('notification', e => {
+      handlers.current.onEvent(JSON.parse((e as MessageEvent).data));
+    });
+    source.addEventListener('resync', () => handlers.current.onResync());
+    source.onerror = () => {
+      // A refused stream (503) is closed for good; dropped ones reconnect on their own
+      if (source.readyState === EventSource.CLOSED) startPolling();
+    };
+
+    return () => {
+      source.close();
+      if (poll) clearInterval(poll);
+    };
+  }, [emailKey]);
+}
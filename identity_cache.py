@@ -0,0 +1,70 @@
+import os
+import threading
+from collections import namedtuple
+from cachetools import TTLCache
+from sqlalchemy import func
+from models import UserModel
+
+# Process-level cache of email -> identity, so routes that only need the caller's
+# id/role/name skip the users lookup. Entries expire after IDENTITY_CACHE_TTL
+# seconds and are invalidated explicitly when a student is added/updated/deleted
+# (other gunicorn workers see the change once their entry expires).
+
+IDENTITY_CACHE_SIZE = int(os.getenv("IDENTITY_CACHE_SIZE", 4096))
+IDENTITY_CACHE_TTL = int(os.getenv("IDENTITY_CACHE_TTL", 300))
+
+# Same attribute names as UserModel so call sites can use either
+Identity = namedtuple("Identity", ["users_id", "users_email", "users_name", "users_role", "users_created_at"])
+
+_cache = TTLCache(maxsize=IDENTITY_CACHE_SIZE, ttl=IDENTITY_CACHE_TTL)
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def _key(email):
+    return email.strip().lower()
+
+
+def lookup_user(email, role=None):
+    """Return the cached Identity for an email (case-insensitive), or None if no such user."""
+    if not email:
+        return None
+    key = _key(email)
+    with _lock:
+        identity = _cache.get(key)
+        _stats["hits" if identity is not None else "misses"] += 1
+
+    if identity is None:
+        user = UserModel.query.with_entities(
+            UserModel.users_id, UserModel.users_email, UserModel.users_name,
+            UserModel.users_role, UserModel.users_created_at,
+        ).filter(func.lower(UserModel.users_email) == key).first()
+        if not user:
+            return None
+        identity = Identity(*user)
+        with _lock:
+            _cache[key] = identity
+
+    if role is not None and identity.users_role.name != role:
+        return None
+    return identity
+
+
+def invalidate(*emails):
+    with _lock:
+        for email in emails:
+            if email and _cache.pop(_key(email), None) is not None:
+                _stats["invalidations"] += 1
+
+
+def clear():
+    with _lock:
+        _cache.clear()
+
+
+def identity_cache_stats():
+    with _lock:
+        stats = dict(_stats, size=len(_cache), ttl=IDENTITY_CACHE_TTL)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    return stats
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+
+# LLM backends for the regulation chatbot. CHAT_LLM_BACKEND picks one:
+#   gemini  - Google Gemini (default)
+#   fake    - offline answers with configurable latency and size
+#   record  - calls Gemini and appends prompt -> answer pairs to CHAT_RECORD_FILE
+#   replay  - serves answers from CHAT_RECORD_FILE without the network
+# Every backend has generate(prompt, timeout=None) -> str and
+# stream(prompt, timeout=None) -> iterator of text chunks.
+
+
+class GeminiBackend:
+    def __init__(self, model_name=None, api_key=None):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key or os.getenv("GEMINI_API_KEY"))
+        self.model_name = model_name or os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+        self.model = genai.GenerativeModel(self.model_name)
+
+    def _options(self, timeout):
+        return {"request_options": {"timeout": timeout}} if timeout else {}
+
+    def generate(self, prompt, timeout=None):
+        response = self.model.generate_content(prompt, **self._options(timeout))
+        return response.text.strip()
+
+    def stream(self, prompt, timeout=None):
+        for chunk in self.model.generate_content(prompt, stream=True, **self._options(timeout)):
+            text = getattr(chunk, "text", "")
+            if text:
+                yield text
+
+
+class FakeBackend:
+    """Offline backend; latency is drawn from a lognormal around latency_ms."""
+
+    def __init__(self, latency_ms=800, jitter=0.3, answer_words=120, chunks=8, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.answer_words = answer_words
+        self.chunks = chunks
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def _latency(self):
+        if self.latency_ms <= 0:
+            return 0.0
+        with self.lock:
+            factor = self.random.lognormvariate(0, self.jitter) if self.jitter else 1.0
+        return self.latency_ms * factor / 1000.0
+
+    def _answer(self, prompt):
+        question = prompt.rsplit("Question:", 1)[-1].strip()
+        filler = ("This is an offline answer generated for load testing. " * (self.answer_words // 9 + 1)).split()
+        return " ".join([f"(offline answer) You asked: {question}"] + filler[:self.answer_words])
+
+    def generate(self, prompt, timeout=None):
+        delay = self._latency()
+        if timeout and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError("Fake LLM call exceeded its timeout")
+        time.sleep(delay)
+        return self._answer(prompt)
+
+    def stream(self, prompt, timeout=None):
+        words = self._answer(prompt).split()
+        step = max(1, len(words) // self.chunks)
+        parts = [" ".join(words[i:i + step]) + " " for i in range(0, len(words), step)]
+        delay = self._latency() / len(parts)
+        for part in parts:
+            time.sleep(delay)
+            yield part
+
+
+class RecordReplayBackend:
+    """Records prompt -> answer pairs from an inner backend to a JSONL file, or replays them."""
+
+    def __init__(self, path, inner=None, replay=False, fallback=None):
+        self.path = path
+        self.inner = inner
+        self.replay = replay
+        self.fallback = fallback
+        self.lock = threading.Lock()
+        self.answers = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.answers[entry["key"]] = entry["answer"]
+
+    @staticmethod
+    def key(prompt):
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+    def _record(self, prompt, answer):
+        entry = {"key": self.key(prompt), "prompt": prompt, "answer": answer}
+        with self.lock:
+            self.answers[entry["key"]] = answer
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def generate(self, prompt, timeout=None):
+        if self.replay:
+            answer = self.answers.get(self.key(prompt))
+            if answer is not None:
+                return answer
+            if self.fallback is None:
+                raise KeyError("No recorded answer for this prompt")
+            return self.fallback.generate(prompt, timeout)
+        answer = self.inner.generate(prompt, timeout)
+        self._record(prompt, answer)
+        return answer
+
+    def stream(self, prompt, timeout=None):
+        if self.replay:
+            yield self.generate(prompt, timeout)
+            return
+        parts = []
+        for part in self.inner.stream(prompt, timeout):
+            parts.append(part)
+            yield part
+        self._record(prompt, "".join(parts).strip())
+
+
+def fake_backend_from_env():
+    seed = os.getenv("CHAT_FAKE_SEED")
+    return FakeBackend(
+        latency_ms=float(os.getenv("CHAT_FAKE_LATENCY_MS", 800)),
+        jitter=float(os.getenv("CHAT_FAKE_JITTER", 0.3)),
+        answer_words=int(os.getenv("CHAT_FAKE_ANSWER_WORDS", 120)),
+        seed=int(seed) if seed else None,
+    )
+
+
+def get_backend(name=None):
+    name = (name or os.getenv("CHAT_LLM_BACKEND", "gemini")).lower()
+    record_file = os.getenv("CHAT_RECORD_FILE", "chat_recordings.jsonl")
+    if name == "gemini":
+        return GeminiBackend()
+    if name == "fake":
+        return fake_backend_from_env()
+    if name == "record":
+        return RecordReplayBackend(record_file, inner=GeminiBackend())
+    if name == "replay":
+        fallback = fake_backend_from_env() if os.getenv("CHAT_REPLAY_FALLBACK") == "fake" else None
+        return RecordReplayBackend(record_file, replay=True, fallback=fallback)
+    raise ValueError(f"Unknown CHAT_LLM_BACKEND: {name}")
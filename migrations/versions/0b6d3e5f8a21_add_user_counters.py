@@ -0,0 +1,125 @@
+"""add per-user counters maintained by triggers
+
+Revision ID: 0b6d3e5f8a21
+Revises: f2a7b8c40d19
+Create Date: 2026-10-18 17:03:50.127934
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b6d3e5f8a21'
+down_revision = 'f2a7b8c40d19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_counters',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('complaints_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('suggestions_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('unread_notifications_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.users_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Inserts upsert the owner's row; deletes only UPDATE, since the user row may
+    # itself be going away in the same cascade.
+    op.execute("""
+        CREATE FUNCTION user_counters_bump(uid uuid, d_complaints int, d_suggestions int, d_unread int)
+        RETURNS void AS $$
+        BEGIN
+            IF uid IS NULL OR (d_complaints = 0 AND d_suggestions = 0 AND d_unread = 0) THEN
+                RETURN;
+            END IF;
+            IF d_complaints >= 0 AND d_suggestions >= 0 AND d_unread >= 0 THEN
+                INSERT INTO user_counters (user_id, complaints_count, suggestions_count, unread_notifications_count)
+                VALUES (uid, d_complaints, d_suggestions, d_unread)
+                ON CONFLICT (user_id) DO UPDATE SET
+                    complaints_count = user_counters.complaints_count + EXCLUDED.complaints_count,
+                    suggestions_count = user_counters.suggestions_count + EXCLUDED.suggestions_count,
+                    unread_notifications_count = user_counters.unread_notifications_count + EXCLUDED.unread_notifications_count;
+            ELSE
+                UPDATE user_counters SET
+                    complaints_count = complaints_count + d_complaints,
+                    suggestions_count = suggestions_count + d_suggestions,
+                    unread_notifications_count = unread_notifications_count + d_unread
+                WHERE user_id = uid;
+            END IF;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE FUNCTION user_counters_complaints() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM user_counters_bump(OLD.sender_id, -1, 0, 0);
+            END IF;
+            IF TG_OP IN ('UPDATE', 'INSERT') THEN
+                PERFORM user_counters_bump(NEW.sender_id, 1, 0, 0);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER trg_user_counters_complaints
+        AFTER INSERT OR DELETE OR UPDATE OF sender_id ON complaints
+        FOR EACH ROW EXECUTE FUNCTION user_counters_complaints();
+    """)
+    op.execute("""
+        CREATE FUNCTION user_counters_suggestions() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM user_counters_bump(OLD.users_id, 0, -1, 0);
+            END IF;
+            IF TG_OP IN ('UPDATE', 'INSERT') THEN
+                PERFORM user_counters_bump(NEW.users_id, 0, 1, 0);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER trg_user_counters_suggestions
+        AFTER INSERT OR DELETE OR UPDATE OF users_id ON suggestions
+        FOR EACH ROW EXECUTE FUNCTION user_counters_suggestions();
+    """)
+    op.execute("""
+        CREATE FUNCTION user_counters_notifications() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND NOT COALESCE(OLD.notification_is_read, false) THEN
+                PERFORM user_counters_bump(OLD.user_id, 0, 0, -1);
+            END IF;
+            IF TG_OP IN ('UPDATE', 'INSERT') AND NOT COALESCE(NEW.notification_is_read, false) THEN
+                PERFORM user_counters_bump(NEW.user_id, 0, 0, 1);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER trg_user_counters_notifications
+        AFTER INSERT OR DELETE OR UPDATE OF notification_is_read, user_id ON notifications
+        FOR EACH ROW EXECUTE FUNCTION user_counters_notifications();
+    """)
+
+    op.execute("""
+        INSERT INTO user_counters (user_id, complaints_count, suggestions_count, unread_notifications_count)
+        SELECT u.users_id,
+               (SELECT COUNT(*) FROM complaints c WHERE c.sender_id = u.users_id),
+               (SELECT COUNT(*) FROM suggestions s WHERE s.users_id = u.users_id),
+               (SELECT COUNT(*) FROM notifications n WHERE n.user_id = u.users_id AND NOT COALESCE(n.notification_is_read, false))
+        FROM users u
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS trg_user_counters_notifications ON notifications")
+    op.execute("DROP TRIGGER IF EXISTS trg_user_counters_suggestions ON suggestions")
+    op.execute("DROP TRIGGER IF EXISTS trg_user_counters_complaints ON complaints")
+    op.execute("DROP FUNCTION IF EXISTS user_counters_notifications()")
+    op.execute("DROP FUNCTION IF EXISTS user_counters_suggestions()")
+    op.execute("DROP FUNCTION IF EXISTS user_counters_complaints()")
+    op.execute("DROP FUNCTION IF EXISTS user_counters_bump(uuid, int, int, int)")
+    op.drop_table('user_counters')
@@ -0,0 +1,97 @@
+"""add per-user collection version stamps for list ETags
+
+Revision ID: 1c4e8a7d2f90
+Revises: 0b6d3e5f8a21
+Create Date: 2026-10-18 17:41:12.508316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1c4e8a7d2f90'
+down_revision = '0b6d3e5f8a21'
+branch_labels = None
+depends_on = None
+
+# Admin-wide lists are stamped under the all-zero scope id
+GLOBAL_SCOPE = '00000000-0000-0000-0000-000000000000'
+
+# table -> (trigger function, owner column, collection name, also bump the admin-wide list)
+VERSIONED_TABLES = {
+    'complaints': ('collection_versions_complaints', 'sender_id', 'complaints', True),
+    'suggestions': ('collection_versions_suggestions', 'users_id', 'suggestions', True),
+    'notifications': ('collection_versions_notifications', 'user_id', 'notifications', False),
+    'chat_sessions': ('collection_versions_chat_sessions', 'users_id', 'chat_sessions', False),
+}
+
+
+def upgrade():
+    op.create_table('collection_versions',
+    sa.Column('scope_id', sa.UUID(), nullable=False),
+    sa.Column('collection', sa.String(length=32), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+    sa.PrimaryKeyConstraint('scope_id', 'collection')
+    )
+
+    op.execute("""
+        CREATE FUNCTION collection_versions_bump(scope uuid, coll text)
+        RETURNS void AS $$
+        BEGIN
+            IF scope IS NULL THEN
+                RETURN;
+            END IF;
+            INSERT INTO collection_versions (scope_id, collection, version) VALUES (scope, coll, 1)
+            ON CONFLICT (scope_id, collection) DO UPDATE SET version = collection_versions.version + 1;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    for table, (function, owner, collection, admin_wide) in VERSIONED_TABLES.items():
+        global_bump = f"PERFORM collection_versions_bump('{GLOBAL_SCOPE}', '{collection}');" if admin_wide else ""
+        op.execute(f"""
+            CREATE FUNCTION {function}() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    PERFORM collection_versions_bump(OLD.{owner}, '{collection}');
+                END IF;
+                IF TG_OP IN ('UPDATE', 'INSERT')
+                   AND (TG_OP = 'INSERT' OR NEW.{owner} IS DISTINCT FROM OLD.{owner}) THEN
+                    PERFORM collection_versions_bump(NEW.{owner}, '{collection}');
+                END IF;
+                {global_bump}
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER trg_{function}
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {function}();
+        """)
+
+    # The admin lists show the student's email next to private items
+    op.execute(f"""
+        CREATE FUNCTION collection_versions_users() RETURNS trigger AS $$
+        BEGIN
+            PERFORM collection_versions_bump('{GLOBAL_SCOPE}', 'complaints');
+            PERFORM collection_versions_bump('{GLOBAL_SCOPE}', 'suggestions');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER trg_collection_versions_users
+        AFTER UPDATE OF users_email ON users
+        FOR EACH ROW WHEN (OLD.users_email IS DISTINCT FROM NEW.users_email)
+        EXECUTE FUNCTION collection_versions_users();
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS trg_collection_versions_users ON users")
+    op.execute("DROP FUNCTION IF EXISTS collection_versions_users()")
+    for table, (function, _, _, _) in VERSIONED_TABLES.items():
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{function} ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {function}()")
+    op.execute("DROP FUNCTION IF EXISTS collection_versions_bump(uuid, text)")
+    op.drop_table('collection_versions')
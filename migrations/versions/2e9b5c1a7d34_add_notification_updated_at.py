@@ -0,0 +1,57 @@
+"""add notification_updated_at for incremental notification sync
+
+Revision ID: 2e9b5c1a7d34
+Revises: 1c4e8a7d2f90
+Create Date: 2026-10-18 18:12:40.913582
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '2e9b5c1a7d34'
+down_revision = '1c4e8a7d2f90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('notifications', sa.Column('notification_updated_at', postgresql.TIMESTAMP(timezone=True), nullable=True))
+    # Backfilling a column nobody reads yet must not bump every list version
+    op.execute("ALTER TABLE notifications DISABLE TRIGGER trg_collection_versions_notifications")
+    op.execute("UPDATE notifications SET notification_updated_at = COALESCE(notification_created_at, now())")
+    op.execute("ALTER TABLE notifications ENABLE TRIGGER trg_collection_versions_notifications")
+    op.alter_column('notifications', 'notification_updated_at', nullable=False, server_default=sa.text('now()'))
+
+    op.execute("""
+        CREATE FUNCTION notifications_touch_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.notification_updated_at = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER trg_notifications_touch_updated_at
+        BEFORE UPDATE ON notifications
+        FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+        EXECUTE FUNCTION notifications_touch_updated_at();
+    """)
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_notifications_user_updated_id', 'notifications',
+            ['user_id', 'notification_updated_at', 'notification_id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_notifications_user_updated_id', table_name='notifications',
+                      postgresql_concurrently=True, if_exists=True)
+    op.execute("DROP TRIGGER IF EXISTS trg_notifications_touch_updated_at ON notifications")
+    op.execute("DROP FUNCTION IF EXISTS notifications_touch_updated_at()")
+    op.drop_column('notifications', 'notification_updated_at')
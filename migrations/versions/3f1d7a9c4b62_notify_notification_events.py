@@ -0,0 +1,48 @@
+"""send notification inserts and read-state changes to pg_notify
+
+Revision ID: 3f1d7a9c4b62
+Revises: 2e9b5c1a7d34
+Create Date: 2026-10-18 18:49:05.274119
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1d7a9c4b62'
+down_revision = '2e9b5c1a7d34'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # NOTIFY payloads are capped at 8000 bytes, so long messages are cut short;
+    # the full row is always available from ?since= sync.
+    op.execute("""
+        CREATE FUNCTION notifications_pg_notify() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('notification_events', json_build_object(
+                'op', lower(TG_OP),
+                'user_id', NEW.user_id,
+                'id', NEW.notification_id,
+                'message', left(NEW.notifications_message, 1000),
+                'is_read', COALESCE(NEW.notification_is_read, false),
+                'created_at', NEW.notification_created_at,
+                'updated_at', NEW.notification_updated_at,
+                'complaint_id', NEW.complaint_id,
+                'suggestion_id', NEW.suggestion_id
+            )::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER trg_notifications_pg_notify
+        AFTER INSERT OR UPDATE OF notification_is_read ON notifications
+        FOR EACH ROW EXECUTE FUNCTION notifications_pg_notify();
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS trg_notifications_pg_notify ON notifications")
+    op.execute("DROP FUNCTION IF EXISTS notifications_pg_notify()")
@@ -0,0 +1,140 @@
+"""range-partition notifications by month
+
+Revision ID: 4a8c2e6f1b97
+Revises: 3f1d7a9c4b62
+Create Date: 2026-10-18 19:27:51.640283
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4a8c2e6f1b97'
+down_revision = '3f1d7a9c4b62'
+branch_labels = None
+depends_on = None
+
+# Rewrites the table: run it in a quiet window. Months before the oldest row are
+# not created; the default partition catches anything outside the monthly ones.
+
+COLUMNS = """
+    notification_id uuid NOT NULL,
+    user_id uuid REFERENCES users (users_id) ON DELETE CASCADE,
+    notifications_message text NOT NULL,
+    notification_created_at timestamptz NOT NULL DEFAULT now(),
+    notification_updated_at timestamptz NOT NULL DEFAULT now(),
+    notification_is_read boolean DEFAULT false,
+    complaint_id uuid REFERENCES complaints (complaint_id),
+    suggestion_id uuid REFERENCES suggestions (suggestion_id)
+"""
+
+COLUMN_NAMES = ("notification_id, user_id, notifications_message, notification_created_at, "
+                "notification_updated_at, notification_is_read, complaint_id, suggestion_id")
+
+# (name, columns, partial WHERE clause)
+INDEXES = [
+    ('ix_notifications_user_read_created', 'user_id, notification_is_read, notification_created_at', None),
+    ('ix_notifications_user_unread', 'user_id, notification_created_at', 'notification_is_read = false'),
+    ('ix_notifications_unread', 'notification_created_at', 'notification_is_read = false'),
+    ('ix_notifications_user_complaint', 'user_id, complaint_id', 'complaint_id IS NOT NULL'),
+    ('ix_notifications_user_suggestion', 'user_id, suggestion_id', 'suggestion_id IS NOT NULL'),
+    ('ix_notifications_user_updated_id', 'user_id, notification_updated_at, notification_id', None),
+]
+
+# The trigger functions already exist; they are attached again to the new table
+TRIGGERS = """
+    CREATE TRIGGER trg_notifications_touch_updated_at
+    BEFORE UPDATE ON notifications
+    FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+    EXECUTE FUNCTION notifications_touch_updated_at();
+
+    CREATE TRIGGER trg_user_counters_notifications
+    AFTER INSERT OR DELETE OR UPDATE OF notification_is_read, user_id ON notifications
+    FOR EACH ROW EXECUTE FUNCTION user_counters_notifications();
+
+    CREATE TRIGGER trg_collection_versions_notifications
+    AFTER INSERT OR UPDATE OR DELETE ON notifications
+    FOR EACH ROW EXECUTE FUNCTION collection_versions_notifications();
+
+    CREATE TRIGGER trg_notifications_pg_notify
+    AFTER INSERT OR UPDATE OF notification_is_read ON notifications
+    FOR EACH ROW EXECUTE FUNCTION notifications_pg_notify();
+"""
+
+
+def create_indexes_and_triggers():
+    for name, columns, where in INDEXES:
+        op.execute(f"CREATE INDEX {name} ON notifications ({columns})" + (f" WHERE {where}" if where else ""))
+    op.execute(TRIGGERS)
+
+
+def upgrade():
+    op.execute("ALTER TABLE notifications RENAME TO notifications_unpartitioned")
+    op.execute("ALTER TABLE notifications_unpartitioned RENAME CONSTRAINT notifications_pkey TO notifications_unpartitioned_pkey")
+
+    op.execute(f"""
+        CREATE TABLE notifications (
+            {COLUMNS},
+            PRIMARY KEY (notification_id, notification_created_at)
+        ) PARTITION BY RANGE (notification_created_at)
+    """)
+    op.execute("CREATE TABLE notifications_default PARTITION OF notifications DEFAULT")
+
+    # Creates the partition for the month containing month_start; returns false if
+    # it already exists or rows for that month are sitting in the default partition.
+    op.execute("""
+        CREATE FUNCTION notifications_ensure_partition(month_start date) RETURNS boolean AS $$
+        DECLARE
+            lower_bound date := date_trunc('month', month_start)::date;
+            upper_bound date := (date_trunc('month', month_start) + interval '1 month')::date;
+            part_name text := 'notifications_p' || to_char(lower_bound, 'YYYY_MM');
+        BEGIN
+            IF to_regclass(part_name) IS NOT NULL THEN
+                RETURN false;
+            END IF;
+            IF EXISTS (SELECT 1 FROM notifications_default
+                       WHERE notification_created_at >= lower_bound AND notification_created_at < upper_bound) THEN
+                RAISE NOTICE 'rows for % are in notifications_default; not creating %', lower_bound, part_name;
+                RETURN false;
+            END IF;
+            EXECUTE format('CREATE TABLE %I PARTITION OF notifications FOR VALUES FROM (%L) TO (%L)',
+                           part_name, lower_bound, upper_bound);
+            RETURN true;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        SELECT notifications_ensure_partition(month::date)
+        FROM generate_series(
+            date_trunc('month', LEAST(COALESCE((SELECT min(notification_created_at) FROM notifications_unpartitioned), now()), now())),
+            date_trunc('month', now()) + interval '3 months',
+            interval '1 month'
+        ) AS month
+    """)
+
+    # Triggers are attached after the copy so counters and versions are not bumped twice
+    op.execute(f"""
+        INSERT INTO notifications ({COLUMN_NAMES})
+        SELECT notification_id, user_id, notifications_message,
+               COALESCE(notification_created_at, notification_updated_at), notification_updated_at,
+               notification_is_read, complaint_id, suggestion_id
+        FROM notifications_unpartitioned
+    """)
+    op.execute("DROP TABLE notifications_unpartitioned")
+    create_indexes_and_triggers()
+
+
+def downgrade():
+    op.execute("ALTER TABLE notifications RENAME TO notifications_partitioned")
+    op.execute("ALTER TABLE notifications_partitioned RENAME CONSTRAINT notifications_pkey TO notifications_partitioned_pkey")
+    op.execute(f"""
+        CREATE TABLE notifications (
+            {COLUMNS},
+            PRIMARY KEY (notification_id)
+        )
+    """)
+    op.execute(f"INSERT INTO notifications ({COLUMN_NAMES}) SELECT {COLUMN_NAMES} FROM notifications_partitioned")
+    op.execute("DROP TABLE notifications_partitioned")
+    op.execute("DROP FUNCTION IF EXISTS notifications_ensure_partition(date)")
+    create_indexes_and_triggers()
@@ -0,0 +1,33 @@
+"""backfill and require complaint/suggestion created_at
+
+Revision ID: 5c3f9b2d7e18
+Revises: 4a8c2e6f1b97
+Create Date: 2026-10-19 10:14:27.381904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c3f9b2d7e18'
+down_revision = '4a8c2e6f1b97'
+branch_labels = None
+depends_on = None
+
+
+# The admin lists page with a keyset on (created_at DESC, id DESC); without NULLs
+# that ORDER BY and row comparison are served straight from the existing indexes.
+def upgrade():
+    op.execute("""
+        UPDATE complaints SET complaint_created_at = COALESCE(response_created_at, now())
+        WHERE complaint_created_at IS NULL
+    """)
+    op.execute("UPDATE suggestions SET suggestion_created_at = now() WHERE suggestion_created_at IS NULL")
+    op.alter_column('complaints', 'complaint_created_at', nullable=False, server_default=sa.text('now()'))
+    op.alter_column('suggestions', 'suggestion_created_at', nullable=False, server_default=sa.text('now()'))
+
+
+def downgrade():
+    op.alter_column('suggestions', 'suggestion_created_at', nullable=True)
+    op.alter_column('complaints', 'complaint_created_at', nullable=True)
@@ -0,0 +1,83 @@
+"""maintain stat_counters with triggers
+
+Revision ID: 6d2a8f4c9e05
+Revises: 5c3f9b2d7e18
+Create Date: 2026-10-19 11:02:48.557120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6d2a8f4c9e05'
+down_revision = '5c3f9b2d7e18'
+branch_labels = None
+depends_on = None
+
+# Same mechanism as user_counters (0b6d3e5f8a21): the database keeps the admin
+# dashboard counters in step with every insert, delete and cascade, so no write
+# path has to remember to bump them.
+
+TRIGGERS = {
+    'complaints': ('stat_counters_complaints', 'AFTER INSERT OR DELETE', """
+        PERFORM stat_counters_bump('complaints', CASE TG_OP WHEN 'INSERT' THEN 1 ELSE -1 END);
+    """),
+    'suggestions': ('stat_counters_suggestions', 'AFTER INSERT OR DELETE', """
+        PERFORM stat_counters_bump('suggestions', CASE TG_OP WHEN 'INSERT' THEN 1 ELSE -1 END);
+    """),
+    'users': ('stat_counters_users', 'AFTER INSERT OR DELETE OR UPDATE OF users_role', """
+        PERFORM stat_counters_bump('students',
+            (CASE WHEN TG_OP <> 'DELETE' AND NEW.users_role = 'student' THEN 1 ELSE 0 END)
+          - (CASE WHEN TG_OP <> 'INSERT' AND OLD.users_role = 'student' THEN 1 ELSE 0 END));
+    """),
+    'notifications': ('stat_counters_notifications', 'AFTER INSERT OR DELETE OR UPDATE OF notification_is_read', """
+        PERFORM stat_counters_bump('unread_notifications',
+            (CASE WHEN TG_OP <> 'DELETE' AND NOT COALESCE(NEW.notification_is_read, false) THEN 1 ELSE 0 END)
+          - (CASE WHEN TG_OP <> 'INSERT' AND NOT COALESCE(OLD.notification_is_read, false) THEN 1 ELSE 0 END));
+    """),
+}
+
+
+def upgrade():
+    op.execute("""
+        CREATE FUNCTION stat_counters_bump(name text, delta bigint) RETURNS void AS $$
+        BEGIN
+            IF delta = 0 THEN
+                RETURN;
+            END IF;
+            INSERT INTO stat_counters (counter_name, counter_value) VALUES (name, delta)
+            ON CONFLICT (counter_name) DO UPDATE SET counter_value = stat_counters.counter_value + EXCLUDED.counter_value;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    for table, (function, events, body) in TRIGGERS.items():
+        op.execute(f"""
+            CREATE FUNCTION {function}() RETURNS trigger AS $$
+            BEGIN
+                {body}
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER trg_{function}
+            {events} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {function}();
+        """)
+
+    # Recount once so the triggers start from exact values
+    op.execute("""
+        INSERT INTO stat_counters (counter_name, counter_value)
+        SELECT 'complaints', COUNT(*) FROM complaints
+        UNION ALL SELECT 'suggestions', COUNT(*) FROM suggestions
+        UNION ALL SELECT 'students', COUNT(*) FROM users WHERE users_role = 'student'
+        UNION ALL SELECT 'unread_notifications', COUNT(*) FROM notifications WHERE NOT COALESCE(notification_is_read, false)
+        ON CONFLICT (counter_name) DO UPDATE SET counter_value = EXCLUDED.counter_value
+    """)
+
+
+def downgrade():
+    for table, (function, _, _) in TRIGGERS.items():
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{function} ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {function}()")
+    op.execute("DROP FUNCTION IF EXISTS stat_counters_bump(text, bigint)")
@@ -0,0 +1,52 @@
+"""sync notifications by writing transaction id
+
+Revision ID: 7e4b1d6a3c28
+Revises: 6d2a8f4c9e05
+Create Date: 2026-10-19 11:48:03.219674
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e4b1d6a3c28'
+down_revision = '6d2a8f4c9e05'
+branch_labels = None
+depends_on = None
+
+
+# notification_updated_at is stamped when a row is written, not when it commits,
+# so a slow transaction could land behind a client's time-based cursor. Each row
+# now records the xid8 of the transaction that last wrote it; the sync cursor is
+# a snapshot xmin, below which every transaction is known to be finished.
+def upgrade():
+    # Constant default first so existing rows are not rewritten; they all predate any cursor
+    op.execute("ALTER TABLE notifications ADD COLUMN notification_xid xid8 NOT NULL DEFAULT '1'::xid8")
+    op.execute("ALTER TABLE notifications ALTER COLUMN notification_xid SET DEFAULT pg_current_xact_id()")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notifications_touch_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.notification_updated_at = now();
+            NEW.notification_xid = pg_current_xact_id();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    # Partitioned tables cannot build indexes CONCURRENTLY
+    op.execute("CREATE INDEX ix_notifications_user_xid_id ON notifications (user_id, notification_xid, notification_id)")
+    op.execute("DROP INDEX IF EXISTS ix_notifications_user_updated_id")
+
+
+def downgrade():
+    op.execute("CREATE INDEX ix_notifications_user_updated_id ON notifications (user_id, notification_updated_at, notification_id)")
+    op.execute("DROP INDEX IF EXISTS ix_notifications_user_xid_id")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notifications_touch_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.notification_updated_at = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("ALTER TABLE notifications DROP COLUMN notification_xid")
@@ -0,0 +1,35 @@
+"""add chat answer cache
+
+Revision ID: b41f6c2d9a07
+Revises: 0ea061f7b614
+Create Date: 2026-10-18 10:02:11.418220
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'b41f6c2d9a07'
+down_revision = '0ea061f7b614'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('chat_answer_cache',
+    sa.Column('cache_key', sa.String(length=64), nullable=False),
+    sa.Column('rules_hash', sa.String(length=64), nullable=False),
+    sa.Column('question', sa.Text(), nullable=False),
+    sa.Column('answer', sa.Text(), nullable=False),
+    sa.Column('articles', sa.JSON(), nullable=True),
+    sa.Column('hits', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('cache_key')
+    )
+    op.create_index('ix_chat_answer_cache_rules_hash', 'chat_answer_cache', ['rules_hash'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_chat_answer_cache_rules_hash', table_name='chat_answer_cache')
+    op.drop_table('chat_answer_cache')
@@ -0,0 +1,37 @@
+"""add chat turns
+
+Revision ID: c7a2e91f4b36
+Revises: b41f6c2d9a07
+Create Date: 2026-10-18 11:20:45.902113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'c7a2e91f4b36'
+down_revision = 'b41f6c2d9a07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('chat_turns',
+    sa.Column('turn_id', sa.UUID(), nullable=False),
+    sa.Column('session_id', sa.UUID(), nullable=True),
+    sa.Column('question', sa.Text(), nullable=False),
+    sa.Column('status', postgresql.ENUM('queued', 'running', 'done', 'failed', 'timeout', name='chatturnstatus'), nullable=False),
+    sa.Column('answer', sa.Text(), nullable=True),
+    sa.Column('articles', sa.JSON(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('finished_at', postgresql.TIMESTAMP(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['chat_sessions.sessions_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('turn_id')
+    )
+
+
+def downgrade():
+    op.drop_table('chat_turns')
+    postgresql.ENUM(name='chatturnstatus').drop(op.get_bind(), checkfirst=True)
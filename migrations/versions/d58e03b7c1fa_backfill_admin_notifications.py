@@ -0,0 +1,47 @@
+"""backfill admin notifications
+
+Revision ID: d58e03b7c1fa
+Revises: c7a2e91f4b36
+Create Date: 2026-10-18 13:41:09.275530
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd58e03b7c1fa'
+down_revision = 'c7a2e91f4b36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Admin notifications are now written for every admin when a complaint or
+    # suggestion is created; fill in the ones the old GET-time backfill would add.
+    op.execute("""
+        INSERT INTO notifications
+            (notification_id, user_id, complaint_id, notifications_message, notification_created_at, notification_is_read)
+        SELECT gen_random_uuid(), u.users_id, c.complaint_id, 'New complaint has been received.', c.complaint_created_at, false
+        FROM complaints c
+        JOIN users u ON u.users_role = 'admin' AND c.complaint_created_at >= u.users_created_at
+        WHERE NOT EXISTS (
+            SELECT 1 FROM notifications n
+            WHERE n.user_id = u.users_id AND n.complaint_id = c.complaint_id
+        )
+    """)
+    op.execute("""
+        INSERT INTO notifications
+            (notification_id, user_id, suggestion_id, notifications_message, notification_created_at, notification_is_read)
+        SELECT gen_random_uuid(), u.users_id, s.suggestion_id, 'New suggestion has been received', s.suggestion_created_at, false
+        FROM suggestions s
+        JOIN users u ON u.users_role = 'admin' AND s.suggestion_created_at >= u.users_created_at
+        WHERE NOT EXISTS (
+            SELECT 1 FROM notifications n
+            WHERE n.user_id = u.users_id AND n.suggestion_id = s.suggestion_id
+        )
+    """)
+
+
+def downgrade():
+    pass
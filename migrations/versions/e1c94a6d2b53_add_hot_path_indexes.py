@@ -0,0 +1,52 @@
+"""add hot path indexes
+
+Revision ID: e1c94a6d2b53
+Revises: d58e03b7c1fa
+Create Date: 2026-10-18 14:55:32.610447
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1c94a6d2b53'
+down_revision = 'd58e03b7c1fa'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, partial WHERE clause)
+INDEXES = [
+    ('ix_users_lower_email', 'users', [sa.text('lower(users_email)')], None),
+    ('ix_complaints_sender_id', 'complaints', ['sender_id'], None),
+    ('ix_complaints_created_at_id', 'complaints', [sa.text('complaint_created_at DESC'), sa.text('complaint_id DESC')], None),
+    ('ix_suggestions_users_id', 'suggestions', ['users_id'], None),
+    ('ix_suggestions_created_at_id', 'suggestions', [sa.text('suggestion_created_at DESC'), sa.text('suggestion_id DESC')], None),
+    ('ix_notifications_user_read_created', 'notifications', ['user_id', 'notification_is_read', 'notification_created_at'], None),
+    ('ix_notifications_user_unread', 'notifications', ['user_id', 'notification_created_at'], 'notification_is_read = false'),
+    ('ix_notifications_unread', 'notifications', ['notification_created_at'], 'notification_is_read = false'),
+    ('ix_notifications_user_complaint', 'notifications', ['user_id', 'complaint_id'], 'complaint_id IS NOT NULL'),
+    ('ix_notifications_user_suggestion', 'notifications', ['user_id', 'suggestion_id'], 'suggestion_id IS NOT NULL'),
+    ('ix_chat_messages_session_created', 'chat_messages', ['session_id', 'created_at'], None),
+    ('ix_chat_sessions_users_created', 'chat_sessions', ['users_id', 'session_created_at'], None),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns,
+                unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
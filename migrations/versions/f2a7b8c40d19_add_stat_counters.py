@@ -0,0 +1,35 @@
+"""add stat counters
+
+Revision ID: f2a7b8c40d19
+Revises: e1c94a6d2b53
+Create Date: 2026-10-18 16:12:27.384106
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a7b8c40d19'
+down_revision = 'e1c94a6d2b53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stat_counters',
+    sa.Column('counter_name', sa.String(length=64), nullable=False),
+    sa.Column('counter_value', sa.BigInteger(), nullable=False, server_default='0'),
+    sa.PrimaryKeyConstraint('counter_name')
+    )
+    op.execute("""
+        INSERT INTO stat_counters (counter_name, counter_value)
+        SELECT 'complaints', COUNT(*) FROM complaints
+        UNION ALL SELECT 'suggestions', COUNT(*) FROM suggestions
+        UNION ALL SELECT 'students', COUNT(*) FROM users WHERE users_role = 'student'
+        UNION ALL SELECT 'unread_notifications', COUNT(*) FROM notifications WHERE notification_is_read = false
+    """)
+
+
+def downgrade():
+    op.drop_table('stat_counters')
@@ -3,10 +3,29 @@ from datetime import datetime, timezone
 import enum
 import uuid
 from sqlalchemy.dialects.postgresql import UUID, ENUM, TIMESTAMP
+from sqlalchemy import cast
+from sqlalchemy.types import UserDefinedType
 
 db = SQLAlchemy()
 
 
+class XID8(UserDefinedType):
+    """Postgres 64-bit transaction id; bound as text and cast, read back as int."""
+    cache_ok = True
+
+    def get_col_spec(self, **kw):
+        return "xid8"
+
+    def bind_processor(self, dialect):
+        return lambda value: None if value is None else str(value)
+
+    def bind_expression(self, bindvalue):
+        return cast(bindvalue, self)
+
+    def result_processor(self, dialect, coltype):
+        return lambda value: None if value is None else int(value)
+
+
 
 #app models
 class UserRole(enum.Enum):
@@ -48,11 +67,43 @@ class NotificationModel(db.Model):
     notification_id       = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id               = db.Column(UUID(as_uuid=True), db.ForeignKey("users.users_id", ondelete="CASCADE"))
     notifications_message = db.Column(db.Text, nullable=False)
-    notification_created_at = db.Column(TIMESTAMP(timezone=True), server_default=db.func.now())
+    # Partition key: the table is range-partitioned by month, so it has to be
+    # part of the primary key (notification_id, notification_created_at)
+    notification_created_at = db.Column(TIMESTAMP(timezone=True), primary_key=True, nullable=False,
+                                        server_default=db.func.now())
+    # Set to now() on every update by a trigger
+    notification_updated_at = db.Column(TIMESTAMP(timezone=True), nullable=False, server_default=db.func.now())
+    # Transaction that last wrote the row (set by default/trigger); drives the ?since= sync cursor
+    notification_xid = db.Column(XID8(), nullable=False, server_default=db.text("pg_current_xact_id()"))
     notification_is_read  = db.Column(db.Boolean, default=False)
     complaint_id = db.Column(UUID(as_uuid=True), db.ForeignKey('complaints.complaint_id'), nullable=True)
     suggestion_id = db.Column(UUID(as_uuid=True), db.ForeignKey('suggestions.suggestion_id'), nullable=True)
 
+    __table_args__ = (
+        db.Index("ix_notifications_user_read_created", "user_id", "notification_is_read", "notification_created_at"),
+        db.Index("ix_notifications_user_unread", "user_id", "notification_created_at",
+                 postgresql_where=db.text("notification_is_read = false")),
+        db.Index("ix_notifications_unread", "notification_created_at",
+                 postgresql_where=db.text("notification_is_read = false")),
+        db.Index("ix_notifications_user_complaint", "user_id", "complaint_id",
+                 postgresql_where=db.text("complaint_id IS NOT NULL")),
+        db.Index("ix_notifications_user_suggestion", "user_id", "suggestion_id",
+                 postgresql_where=db.text("suggestion_id IS NOT NULL")),
+        db.Index("ix_notifications_user_xid_id", "user_id", "notification_xid", "notification_id"),
+        {"postgresql_partition_by": "RANGE (notification_created_at)"},
+    )
+
+    def to_dict(self):
+        return {
+            "id": str(self.notification_id),
+            "message": self.notifications_message,
+            "is_read": self.notification_is_read,
+            "created_at": self.notification_created_at.isoformat() if self.notification_created_at else None,
+            "updated_at": self.notification_updated_at.isoformat() if self.notification_updated_at else None,
+            "complaint_id": str(self.complaint_id) if self.complaint_id else None,
+            "suggestion_id": str(self.suggestion_id) if self.suggestion_id else None
+        }
+
 class ComplaintModel(db.Model):
     __tablename__ = "complaints"
 
@@ -65,12 +116,16 @@ class ComplaintModel(db.Model):
     complaint_message  = db.Column(db.Text, nullable=False)
     complaint_file_url = db.Column(db.String(255)) 
     complaint_file_name = db.Column(db.String(255)) 
-    complaint_created_at= db.Column(TIMESTAMP(timezone=True), server_default=db.func.now())
+    complaint_created_at= db.Column(TIMESTAMP(timezone=True), nullable=False, server_default=db.func.now())
     responder_id       = db.Column(UUID(as_uuid=True), db.ForeignKey("users.users_id", ondelete="SET NULL"))
     response_message   = db.Column(db.Text)
     response_created_at= db.Column(TIMESTAMP(timezone=True))
     reference_code = db.Column(db.BigInteger, server_default=db.text("nextval('complaint_code_seq')"))
 
+    __table_args__ = (
+        db.Index("ix_complaints_sender_id", "sender_id"),
+        db.Index("ix_complaints_created_at_id", db.text("complaint_created_at DESC"), db.text("complaint_id DESC")),
+    )
 
     def to_dict(self):
         return {
@@ -102,8 +157,13 @@ class SuggestionModel(db.Model):
     suggestion_message   = db.Column(db.Text, nullable=False)
     suggestion_file_url = db.Column(db.String(255)) 
     suggestion_file_name = db.Column(db.String(255))  
-    suggestion_created_at= db.Column(TIMESTAMP(timezone=True), server_default=db.func.now())
+    suggestion_created_at= db.Column(TIMESTAMP(timezone=True), nullable=False, server_default=db.func.now())
     suggestion_status = db.Column(db.Enum(SuggestionStatus), nullable=False, default=SuggestionStatus.unreviewed)
+
+    __table_args__ = (
+        db.Index("ix_suggestions_users_id", "users_id"),
+        db.Index("ix_suggestions_created_at_id", db.text("suggestion_created_at DESC"), db.text("suggestion_id DESC")),
+    )
     
  
     def to_dict(self):
@@ -130,6 +190,10 @@ class ChatMessageModel(db.Model):
     message     = db.Column(db.Text, nullable=False)
     created_at  = db.Column(TIMESTAMP(timezone=True), server_default=db.func.now())
 
+    __table_args__ = (
+        db.Index("ix_chat_messages_session_created", "session_id", "created_at"),
+    )
+
 class ChatSessionModel(db.Model):
     __tablename__ = "chat_sessions"
 
@@ -142,6 +206,10 @@ class ChatSessionModel(db.Model):
 
     messages            = db.relationship("ChatMessageModel", backref="session", cascade="all,delete-orphan")
 
+    __table_args__ = (
+        db.Index("ix_chat_sessions_users_created", "users_id", "session_created_at"),
+    )
+
 class UserModel(db.Model):
     __tablename__ = "users"
 
@@ -157,3 +225,73 @@ class UserModel(db.Model):
     notifications   = db.relationship("NotificationModel", backref="user", cascade="all,delete-orphan")
     suggestions     = db.relationship("SuggestionModel", backref="user", cascade="all,delete-orphan")
     sessions        = db.relationship("ChatSessionModel", backref="user", cascade="all,delete-orphan")
+
+    __table_args__ = (
+        db.Index("ix_users_lower_email", db.func.lower(users_email)),
+    )
+
+class ChatAnswerCacheModel(db.Model):
+    __tablename__ = "chat_answer_cache"
+
+    cache_key        = db.Column(db.String(64), primary_key=True)
+    rules_hash       = db.Column(db.String(64), nullable=False, index=True)
+    question         = db.Column(db.Text, nullable=False)
+    answer           = db.Column(db.Text, nullable=False)
+    articles         = db.Column(db.JSON)
+    hits             = db.Column(db.Integer, nullable=False, default=0)
+    created_at       = db.Column(TIMESTAMP(timezone=True), server_default=db.func.now())
+
+class ChatTurnStatus(enum.Enum):
+    queued  = "queued"
+    running = "running"
+    done    = "done"
+    failed  = "failed"
+    timeout = "timeout"
+
+class ChatTurnModel(db.Model):
+    __tablename__ = "chat_turns"
+
+    turn_id      = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    session_id   = db.Column(UUID(as_uuid=True), db.ForeignKey("chat_sessions.sessions_id", ondelete="CASCADE"))
+    question     = db.Column(db.Text, nullable=False)
+    status       = db.Column(ENUM(ChatTurnStatus), nullable=False, default=ChatTurnStatus.queued)
+    answer       = db.Column(db.Text)
+    articles     = db.Column(db.JSON)
+    error        = db.Column(db.Text)
+    created_at   = db.Column(TIMESTAMP(timezone=True), server_default=db.func.now())
+    finished_at  = db.Column(TIMESTAMP(timezone=True))
+
+    def to_dict(self):
+        return {
+            "turn_id": str(self.turn_id),
+            "session_id": str(self.session_id) if self.session_id else None,
+            "status": self.status.value if self.status else None,
+            "answer": self.answer,
+            "articles": self.articles or [],
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+class StatCounterModel(db.Model):
+    __tablename__ = "stat_counters"
+
+    counter_name  = db.Column(db.String(64), primary_key=True)
+    counter_value = db.Column(db.BigInteger, nullable=False, default=0)
+
+class UserCounterModel(db.Model):
+    # Maintained by triggers on complaints, suggestions and notifications
+    __tablename__ = "user_counters"
+
+    user_id                    = db.Column(UUID(as_uuid=True), db.ForeignKey("users.users_id", ondelete="CASCADE"), primary_key=True)
+    complaints_count           = db.Column(db.Integer, nullable=False, default=0)
+    suggestions_count          = db.Column(db.Integer, nullable=False, default=0)
+    unread_notifications_count = db.Column(db.Integer, nullable=False, default=0)
+
+class CollectionVersionModel(db.Model):
+    # Bumped by triggers whenever a row of the collection changes; used for list ETags
+    __tablename__ = "collection_versions"
+
+    scope_id   = db.Column(UUID(as_uuid=True), primary_key=True)
+    collection = db.Column(db.String(32), primary_key=True)
+    version    = db.Column(db.BigInteger, nullable=False, default=0)
@@ -0,0 +1,105 @@
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import text
+from models import db
+
+# Maintenance for the month-partitioned notifications table (migration
+# 4a8c2e6f1b97): creates upcoming partitions and removes read notifications
+# older than NOTIFICATIONS_RETENTION_DAYS. Whole months with nothing unread left
+# are detached and dropped; otherwise read rows are deleted in bounded batches,
+# one transaction each, so no run holds long locks. Unread notifications are
+# never removed. Run `flask maintain-notifications` daily (e.g. from cron).
+
+NOTIFICATIONS_RETENTION_DAYS = int(os.getenv("NOTIFICATIONS_RETENTION_DAYS", 180))
+NOTIFICATIONS_PARTITIONS_AHEAD = int(os.getenv("NOTIFICATIONS_PARTITIONS_AHEAD", 3))
+NOTIFICATIONS_PRUNE_BATCH = int(os.getenv("NOTIFICATIONS_PRUNE_BATCH", 5000))
+NOTIFICATIONS_PRUNE_MAX_BATCHES = int(os.getenv("NOTIFICATIONS_PRUNE_MAX_BATCHES", 100))
+
+PARTITION_NAME_RE = re.compile(r"^notifications_p(\d{4})_(\d{2})$")
+
+PARTITIONS_SQL = text("""
+    SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'notifications'::regclass
+""")
+
+# Deleted rows drop out of the users' lists, so their ETags must change too
+BUMP_PARTITION_VERSIONS_SQL = """
+    SELECT collection_versions_bump(user_id, 'notifications')
+    FROM (SELECT DISTINCT user_id FROM {partition}) AS owners
+"""
+
+PRUNE_BATCH_SQL = text("""
+    DELETE FROM notifications
+    WHERE (notification_id, notification_created_at) IN (
+        SELECT notification_id, notification_created_at FROM notifications
+        WHERE notification_is_read = true AND notification_created_at < :cutoff
+        LIMIT :batch
+    )
+""")
+
+
+def month_start(value, months=0):
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1, day=1,
+                         hour=0, minute=0, second=0, microsecond=0)
+
+
+def monthly_partitions():
+    """{partition name: (lower bound, upper bound)} for the monthly partitions."""
+    partitions = {}
+    for (name,) in db.session.execute(PARTITIONS_SQL):
+        match = PARTITION_NAME_RE.match(name)
+        if match:
+            lower = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+            partitions[name] = (lower, month_start(lower, 1))
+    return partitions
+
+
+def ensure_future_partitions(months_ahead=NOTIFICATIONS_PARTITIONS_AHEAD):
+    now = datetime.now(timezone.utc)
+    created = []
+    for offset in range(months_ahead + 1):
+        month = month_start(now, offset).date()
+        if db.session.execute(text("SELECT notifications_ensure_partition(:month)"), {"month": month}).scalar():
+            created.append(month.strftime("%Y-%m"))
+    db.session.commit()
+    return created
+
+
+def drop_expired_partitions(cutoff):
+    """Detach and drop months that end before the cutoff and have no unread rows."""
+    dropped = []
+    for name, (_, upper) in sorted(monthly_partitions().items()):
+        if upper > cutoff:
+            continue
+        unread = db.session.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {name} WHERE notification_is_read IS NOT TRUE)")
+        ).scalar()
+        if unread:
+            continue
+        db.session.execute(text(BUMP_PARTITION_VERSIONS_SQL.format(partition=name)))
+        db.session.execute(text(f"ALTER TABLE notifications DETACH PARTITION {name}"))
+        db.session.execute(text(f"DROP TABLE {name}"))
+        db.session.commit()
+        dropped.append(name)
+    return dropped
+
+
+def prune_read_notifications(cutoff, batch=NOTIFICATIONS_PRUNE_BATCH, max_batches=NOTIFICATIONS_PRUNE_MAX_BATCHES):
+    deleted = 0
+    for _ in range(max_batches):
+        count = db.session.execute(PRUNE_BATCH_SQL, {"cutoff": cutoff, "batch": batch}).rowcount
+        db.session.commit()
+        deleted += count
+        if count < batch:
+            break
+    return deleted
+
+
+def run_maintenance(retention_days=NOTIFICATIONS_RETENTION_DAYS):
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    created = ensure_future_partitions()
+    dropped = drop_expired_partitions(cutoff)
+    deleted = prune_read_notifications(cutoff)
+    return {"created": created, "dropped": dropped, "deleted": deleted, "cutoff": cutoff.isoformat()}
@@ -0,0 +1,145 @@
+import json
+import os
+import queue
+import select
+import threading
+import time
+import psycopg2
+
+# Push delivery for notifications. A trigger on notifications sends each insert
+# (and read-state change) to the NOTIFY channel below; one listener thread per
+# worker process holds a dedicated LISTEN connection and hands events to the
+# queues of that user's connected /api/notifications/stream clients.
+
+CHANNEL = "notification_events"
+
+# Each open stream holds a gthread thread, which mostly sleeps in queue.get. One
+# dashboard tab is one stream, so size GUNICORN_THREADS (per worker) as the
+# number of dashboards expected to be open at once divided by the number of
+# workers, plus NOTIFICATIONS_STREAM_RESERVED_THREADS kept for ordinary
+# requests. Streams past the cap get a 503 and the dashboards fall back to
+# polling (frontend/app/useNotificationStream.ts).
+GUNICORN_THREADS = int(os.getenv("GUNICORN_THREADS", 32))
+NOTIFICATIONS_STREAM_RESERVED_THREADS = int(os.getenv("NOTIFICATIONS_STREAM_RESERVED_THREADS", 8))
+NOTIFICATIONS_STREAM_MAX_CLIENTS = int(os.getenv("NOTIFICATIONS_STREAM_MAX_CLIENTS",
+                                                 max(1, GUNICORN_THREADS - NOTIFICATIONS_STREAM_RESERVED_THREADS)))
+NOTIFICATIONS_STREAM_QUEUE_SIZE = int(os.getenv("NOTIFICATIONS_STREAM_QUEUE_SIZE", 100))
+NOTIFICATIONS_STREAM_KEEPALIVE = float(os.getenv("NOTIFICATIONS_STREAM_KEEPALIVE", 15))
+# Streams end after this long and EventSource reconnects (to whichever worker has room)
+NOTIFICATIONS_STREAM_MAX_SECONDS = float(os.getenv("NOTIFICATIONS_STREAM_MAX_SECONDS", 300))
+
+_subscribers = {}
+_lock = threading.Lock()
+_listener = None
+_stats = {"events": 0, "delivered": 0, "dropped": 0, "reconnects": 0, "rejected": 0}
+
+
+class TooManyClients(Exception):
+    pass
+
+
+class _Subscription:
+    def __init__(self, user_id):
+        self.user_id = str(user_id)
+        self.events = queue.Queue(maxsize=NOTIFICATIONS_STREAM_QUEUE_SIZE)
+        # Set when events were lost; the client should resync with ?since=
+        self.overflowed = False
+
+    def put(self, event):
+        try:
+            self.events.put_nowait(event)
+            return True
+        except queue.Full:
+            self.overflowed = True
+            return False
+
+    def get(self, timeout):
+        return self.events.get(timeout=timeout)
+
+
+def _dispatch(user_id, event):
+    with _lock:
+        targets = list(_subscribers.get(user_id, ()))
+    for sub in targets:
+        delivered = sub.put(event)
+        with _lock:
+            _stats["delivered" if delivered else "dropped"] += 1
+
+
+def _broadcast(event):
+    with _lock:
+        targets = [sub for subs in _subscribers.values() for sub in subs]
+    for sub in targets:
+        sub.put(event)
+
+
+def _listen_forever(dsn):
+    backoff = 1
+    while True:
+        conn = None
+        try:
+            conn = psycopg2.connect(dsn)
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            conn.cursor().execute(f"LISTEN {CHANNEL}")
+            backoff = 1
+            while True:
+                if select.select([conn], [], [], 30) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    try:
+                        event = json.loads(notify.payload)
+                    except ValueError:
+                        continue
+                    with _lock:
+                        _stats["events"] += 1
+                    _dispatch(event.get("user_id"), event)
+        except Exception as e:
+            print(f"ERROR in notification listener: {str(e)}")
+            with _lock:
+                _stats["reconnects"] += 1
+            # Anything sent while we were disconnected is lost; clients resync
+            _broadcast({"op": "resync"})
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+def _ensure_listener(dsn):
+    global _listener
+    # Started lazily so each gunicorn worker gets its own thread after the fork
+    with _lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = threading.Thread(target=_listen_forever, args=(dsn,), name="notification-listener", daemon=True)
+            _listener.start()
+
+
+def subscribe(dsn, user_id):
+    _ensure_listener(dsn)
+    sub = _Subscription(user_id)
+    with _lock:
+        if sum(len(subs) for subs in _subscribers.values()) >= NOTIFICATIONS_STREAM_MAX_CLIENTS:
+            _stats["rejected"] += 1
+            raise TooManyClients()
+        _subscribers.setdefault(sub.user_id, set()).add(sub)
+    return sub
+
+
+def unsubscribe(sub):
+    with _lock:
+        subs = _subscribers.get(sub.user_id)
+        if subs:
+            subs.discard(sub)
+            if not subs:
+                del _subscribers[sub.user_id]
+
+
+def stream_stats():
+    with _lock:
+        return dict(_stats,
+                    clients=sum(len(subs) for subs in _subscribers.values()),
+                    max_clients=NOTIFICATIONS_STREAM_MAX_CLIENTS,
+                    listening=_listener is not None and _listener.is_alive())
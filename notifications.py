@@ -0,0 +1,163 @@
+import base64
+import json
+import os
+import uuid
+from sqlalchemy import text, or_, update, tuple_, cast
+from models import db, NotificationModel, XID8
+
+# Set-based notification writes. Admin notifications are fanned out to every
+# admin when a complaint or suggestion is created, so reading them is a plain
+# indexed SELECT.
+
+NEW_COMPLAINT_MESSAGE = "New complaint has been received."
+NEW_SUGGESTION_MESSAGE = "New suggestion has been received"
+
+ADMIN_FANOUT_SQL = {
+    "complaint_id": text("""
+        INSERT INTO notifications
+            (notification_id, user_id, complaint_id, notifications_message, notification_created_at, notification_is_read)
+        SELECT gen_random_uuid(), users_id, :item_id, :message, now(), false
+        FROM users
+        WHERE users_role = 'admin'
+    """),
+    "suggestion_id": text("""
+        INSERT INTO notifications
+            (notification_id, user_id, suggestion_id, notifications_message, notification_created_at, notification_is_read)
+        SELECT gen_random_uuid(), users_id, :item_id, :message, now(), false
+        FROM users
+        WHERE users_role = 'admin'
+    """),
+}
+
+# One-off backfill for complaints/suggestions created before write-time fan-out
+BACKFILL_COMPLAINTS_SQL = text("""
+    INSERT INTO notifications
+        (notification_id, user_id, complaint_id, notifications_message, notification_created_at, notification_is_read)
+    SELECT gen_random_uuid(), u.users_id, c.complaint_id, :message, c.complaint_created_at, false
+    FROM complaints c
+    JOIN users u ON u.users_role = 'admin' AND c.complaint_created_at >= u.users_created_at
+    WHERE NOT EXISTS (
+        SELECT 1 FROM notifications n
+        WHERE n.user_id = u.users_id AND n.complaint_id = c.complaint_id
+    )
+""")
+
+BACKFILL_SUGGESTIONS_SQL = text("""
+    INSERT INTO notifications
+        (notification_id, user_id, suggestion_id, notifications_message, notification_created_at, notification_is_read)
+    SELECT gen_random_uuid(), u.users_id, s.suggestion_id, :message, s.suggestion_created_at, false
+    FROM suggestions s
+    JOIN users u ON u.users_role = 'admin' AND s.suggestion_created_at >= u.users_created_at
+    WHERE NOT EXISTS (
+        SELECT 1 FROM notifications n
+        WHERE n.user_id = u.users_id AND n.suggestion_id = s.suggestion_id
+    )
+""")
+
+
+def notify_admins(complaint_id=None, suggestion_id=None):
+    """Insert one notification per admin for a new complaint or suggestion (no commit)."""
+    if complaint_id is not None:
+        params = {"item_id": complaint_id, "message": NEW_COMPLAINT_MESSAGE}
+        return db.session.execute(ADMIN_FANOUT_SQL["complaint_id"], params).rowcount
+    params = {"item_id": suggestion_id, "message": NEW_SUGGESTION_MESSAGE}
+    return db.session.execute(ADMIN_FANOUT_SQL["suggestion_id"], params).rowcount
+
+
+def backfill_admin_notifications():
+    complaints = db.session.execute(BACKFILL_COMPLAINTS_SQL, {"message": NEW_COMPLAINT_MESSAGE}).rowcount
+    suggestions = db.session.execute(BACKFILL_SUGGESTIONS_SQL, {"message": NEW_SUGGESTION_MESSAGE}).rowcount
+    db.session.commit()
+    return complaints, suggestions
+
+
+# Incremental sync: clients pass back the cursor from their last poll and get only
+# the notifications created or changed since. Every row carries the xid of the
+# transaction that last wrote it (notification_xid, kept by a default and the
+# update trigger). A cursor's "floor" is the xmin of a snapshot taken during the
+# previous read: every transaction below it had finished, so everything it wrote
+# was already delivered, while anything at or above it is sent (again). Nothing
+# depends on clocks or on how long a writer keeps its transaction open. Clients
+# merge rows by id, since rows from transactions still open near the floor can
+# repeat. While has_more is set the cursor also carries the last (xid, id) sent,
+# plus the floor the next run starts from once this one is caught up.
+
+NOTIFICATIONS_SYNC_LIMIT = int(os.getenv("NOTIFICATIONS_SYNC_LIMIT", 200))
+
+SNAPSHOT_XMIN_SQL = text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text")
+
+
+def encode_sync_cursor(floor, after=None, next_floor=None):
+    payload = {"floor": str(floor)}
+    if after is not None:
+        payload.update(after=[str(after[0]), str(after[1])], next_floor=str(next_floor))
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_sync_cursor(token):
+    """Return {"floor", "after", "next_floor"} from a sync cursor; raises ValueError if it is malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        after = payload.get("after")
+        return {
+            "floor": int(payload["floor"]),
+            "after": (int(after[0]), uuid.UUID(after[1])) if after else None,
+            "next_floor": int(payload["next_floor"]) if after else None,
+        }
+    except (TypeError, ValueError, KeyError, IndexError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def notification_changes(user_id, cursor=None, limit=NOTIFICATIONS_SYNC_LIMIT):
+    """Return (notifications, next cursor, has_more) for a user's changes since the sync cursor."""
+    # Taken before the read, so every transaction the read cannot see is at or above it
+    snapshot_xmin = int(db.session.execute(SNAPSHOT_XMIN_SQL).scalar())
+
+    query = NotificationModel.query.filter(NotificationModel.user_id == user_id)
+    next_floor = snapshot_xmin
+    if cursor:
+        query = query.filter(NotificationModel.notification_xid >= cursor["floor"])
+        if cursor["after"]:
+            query = query.filter(tuple_(NotificationModel.notification_xid, NotificationModel.notification_id)
+                                 > tuple_(cast(str(cursor["after"][0]), XID8()), cursor["after"][1]))
+            # A continuation page: the run's floor was fixed by its first page
+            next_floor = cursor["next_floor"]
+    notifications = query.order_by(
+        NotificationModel.notification_xid, NotificationModel.notification_id
+    ).limit(limit + 1).all()
+
+    has_more = len(notifications) > limit
+    notifications = notifications[:limit]
+    if has_more:
+        last = notifications[-1]
+        floor = cursor["floor"] if cursor else 0
+        next_cursor = encode_sync_cursor(floor, (last.notification_xid, last.notification_id), next_floor)
+    else:
+        next_cursor = encode_sync_cursor(next_floor)
+    return notifications, next_cursor, has_more
+
+
+NOTIFICATIONS_MARK_READ_MAX_IDS = int(os.getenv("NOTIFICATIONS_MARK_READ_MAX_IDS", 500))
+
+
+def mark_notifications_read(user_id, notification_ids=None, cursor=None):
+    """Mark the user's unread notifications read in one UPDATE, by id or everything a sync cursor delivered (no commit).
+
+    Only the caller's own rows are touched; returns how many changed.
+    """
+    stmt = update(NotificationModel).where(
+        NotificationModel.user_id == user_id,
+        NotificationModel.notification_is_read.isnot(True),
+    )
+    if notification_ids is not None:
+        stmt = stmt.where(NotificationModel.notification_id.in_(notification_ids))
+    if cursor is not None:
+        # Everything below the floor has been delivered, plus this run's pages so far
+        delivered = NotificationModel.notification_xid < cursor["floor"]
+        if cursor["after"]:
+            delivered = or_(delivered, tuple_(NotificationModel.notification_xid, NotificationModel.notification_id)
+                            <= tuple_(cast(str(cursor["after"][0]), XID8()), cursor["after"][1]))
+        stmt = stmt.where(delivered)
+    stmt = stmt.values(notification_is_read=True).returning(NotificationModel.notification_id)
+    return len(db.session.execute(stmt, execution_options={"synchronize_session": False}).all())
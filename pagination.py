@@ -0,0 +1,76 @@
+import base64
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import tuple_
+
+# Keyset (cursor) pagination for list endpoints ordered by (created_at, id) DESC.
+# Cursors are opaque url-safe tokens holding the last row's created_at and id.
+
+ADMIN_PAGE_SIZE = int(os.getenv("ADMIN_PAGE_SIZE", 50))
+ADMIN_MAX_PAGE_SIZE = int(os.getenv("ADMIN_MAX_PAGE_SIZE", 200))
+
+
+def encode_cursor(created_at, row_id):
+    payload = json.dumps([created_at.isoformat(), str(row_id)])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """Return (created_at, id) from a cursor token; raises ValueError if it is malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (TypeError, ValueError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def page_limit(raw):
+    try:
+        limit = int(raw) if raw else ADMIN_PAGE_SIZE
+    except ValueError:
+        raise ValueError("Invalid limit")
+    return max(1, min(limit, ADMIN_MAX_PAGE_SIZE))
+
+
+def parse_date(raw, end=False):
+    """Parse YYYY-MM-DD (or ISO datetime); an end date includes the whole day."""
+    if not raw:
+        return None
+    try:
+        value = datetime.fromisoformat(raw)
+    except ValueError:
+        raise ValueError(f"Invalid date: {raw}")
+    if end and len(raw) <= 10:
+        value += timedelta(days=1)
+    return value
+
+
+def parse_enum(enum_cls, raw):
+    if not raw:
+        return None
+    for member in enum_cls:
+        if raw == member.name or raw == member.value or raw.lower() == member.name.lower():
+            return member
+    raise ValueError(f"Invalid {enum_cls.__name__}: {raw}")
+
+
+def keyset_filter(created_col, id_col, cursor):
+    """Rows strictly after the cursor in (created_at DESC, id DESC) order.
+
+    A row-value comparison, so Postgres turns it into a single range scan of the
+    (created_at DESC, id DESC) index.
+    """
+    created_at, row_id = cursor
+    return tuple_(created_col, id_col) < (created_at, row_id)
+
+
+def next_cursor(rows, limit, created_of, id_of):
+    """Given limit + 1 fetched rows, return (page, cursor for the next page or None)."""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(created_of(last), id_of(last))
@@ -0,0 +1,72 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Password hashing runs in a small process pool so scrypt/pbkdf2 work does not
+# hold request threads on the CPU, with at most PASSWORD_HASH_MAX_PENDING jobs
+# in flight per worker. PASSWORD_HASH_METHOD uses werkzeug's method syntax,
+# e.g. "scrypt:32768:8:1" or "pbkdf2:sha256:600000".
+#
+# The pool is created lazily inside threaded gunicorn workers, so its processes
+# are started with forkserver (spawn where that is unavailable): forking a
+# process that has other threads can copy a lock held mid-operation.
+
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 8))
+PASSWORD_HASH_START_METHOD = os.getenv(
+    "PASSWORD_HASH_START_METHOD",
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn",
+)
+
+_pool = None
+_pool_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(PASSWORD_HASH_MAX_PENDING)
+_method_prefix = None
+
+
+def _get_pool():
+    global _pool
+    if _pool is None and PASSWORD_HASH_WORKERS > 0:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS,
+                                            mp_context=multiprocessing.get_context(PASSWORD_HASH_START_METHOD))
+    return _pool
+
+
+def _run(fn, *args):
+    global _pool
+    with _pending:
+        pool = _get_pool()
+        if pool is None:
+            return fn(*args)
+        try:
+            return pool.submit(fn, *args).result()
+        except BrokenProcessPool:
+            with _pool_lock:
+                _pool = None
+            return fn(*args)
+
+
+def hash_password(password, method=None):
+    return _run(generate_password_hash, password, method or PASSWORD_HASH_METHOD)
+
+
+def verify_password(password_hash, password):
+    return _run(check_password_hash, password_hash, password)
+
+
+def method_prefix():
+    """The parameter string werkzeug writes before the salt, e.g. scrypt:32768:8:1."""
+    global _method_prefix
+    if _method_prefix is None:
+        _method_prefix = generate_password_hash("x", PASSWORD_HASH_METHOD).split("$", 1)[0]
+    return _method_prefix
+
+
+def needs_rehash(password_hash):
+    return password_hash.split("$", 1)[0] != method_prefix()
@@ -0,0 +1,111 @@
+import os
+from regulation_index import build_context, articles_used
+
+# Packs chat prompts into a fixed token budget, in priority order:
+#   1. retrieved regulation text
+#   2. a rolling summary of older turns
+#   3. the most recent turns, verbatim
+# Token counts are an offline approximation (about 4 characters per token),
+# which is close enough to keep prompt size and latency flat as sessions grow.
+
+CHAT_PROMPT_TOKEN_BUDGET = int(os.getenv("CHAT_PROMPT_TOKEN_BUDGET", 4000))
+CHAT_HISTORY_TURNS = int(os.getenv("CHAT_HISTORY_TURNS", 6))
+CHAT_SUMMARY_TOKENS = int(os.getenv("CHAT_SUMMARY_TOKENS", 300))
+
+HEADER = "You are a university assistant. Answer using the following articles of the internal regulations:"
+
+
+def count_tokens(text):
+    return (len(text) + 3) // 4 if text else 0
+
+
+def truncate_to_tokens(text, tokens):
+    limit = max(tokens, 0) * 4
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0]
+    return cut + " ..."
+
+
+def summarize_turns(turns, max_tokens):
+    """Extractive summary of older (sender, message) turns, newest first until max_tokens."""
+    lines = []
+    used = 0
+    for sender, message in reversed(turns):
+        first = " ".join(message.split())[:160]
+        line = f"- {'Student asked' if sender == 'user' else 'Assistant said'}: {first}"
+        cost = count_tokens(line) + 1
+        if used + cost > max_tokens:
+            break
+        lines.append(line)
+        used += cost
+    return "\n".join(reversed(lines))
+
+
+def render_turn(sender, message):
+    return f"{'Student' if sender == 'user' else 'Assistant'}: {message}"
+
+
+def build_budgeted_prompt(question, chunks, history=None, budget=None,
+                          history_turns=None, summary_tokens=None):
+    """Return (prompt, articles, stats) for ranked chunks and (sender, message) history."""
+    budget = budget or CHAT_PROMPT_TOKEN_BUDGET
+    history_turns = CHAT_HISTORY_TURNS if history_turns is None else history_turns
+    summary_tokens = CHAT_SUMMARY_TOKENS if summary_tokens is None else summary_tokens
+    history = history or []
+
+    question_block = f"Question: {question}"
+    remaining = budget - count_tokens(HEADER) - count_tokens(question_block) - 8
+
+    # 1. regulation text, best match first
+    picked = []
+    for chunk in chunks:
+        cost = count_tokens(chunk.render()) + 1
+        if cost <= remaining:
+            picked.append(chunk)
+            remaining -= cost
+    picked.sort(key=lambda c: c.position)
+    context = build_context(picked)
+    if not picked and chunks:
+        context = truncate_to_tokens(chunks[0].render(), remaining)
+        remaining -= count_tokens(context)
+        picked = [chunks[0]]
+
+    # 2. rolling summary of turns older than the recent window
+    recent = history[-history_turns:] if history_turns else []
+    older = history[:len(history) - len(recent)]
+    summary = ""
+    if older and remaining > 0:
+        summary = summarize_turns(older, min(summary_tokens, remaining))
+        remaining -= count_tokens(summary) + 2
+
+    # 3. recent turns, newest first until the budget runs out
+    kept = []
+    for sender, message in reversed(recent):
+        line = render_turn(sender, message)
+        cost = count_tokens(line) + 1
+        if cost > remaining:
+            break
+        kept.append(line)
+        remaining -= cost
+    kept.reverse()
+
+    parts = [HEADER, context]
+    if summary:
+        parts.append("Summary of the earlier conversation:\n" + summary)
+    if kept:
+        parts.append("Recent conversation:\n" + "\n".join(kept))
+    parts.append(question_block)
+    prompt = "\n\n".join(parts) + "\n"
+
+    articles = articles_used(picked)
+    stats = {
+        "prompt_tokens": count_tokens(prompt),
+        "budget": budget,
+        "context_tokens": count_tokens(context),
+        "summary_tokens": count_tokens(summary),
+        "history_tokens": sum(count_tokens(line) for line in kept),
+        "turns_included": len(kept),
+        "turns_summarized": len(older),
+    }
+    return prompt, articles, stats
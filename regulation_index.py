@@ -0,0 +1,142 @@
+import math
+import re
+from collections import Counter
+
+# Splits Internal_Regulation_EN.txt into articles and sub-clauses and ranks them
+# with BM25, so the chatbot only sends the relevant parts of the regulation.
+
+HEADER_RE = re.compile(r"^==\s*(.+?)\s*==\s*(.*)$")
+CLAUSE_START_RE = re.compile(r"^(?:[A-Ea-e]\.|for\.|and\.|And\.|•|\d+\.)")
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "he", "his", "if",
+    "in", "is", "it", "its", "of", "on", "or", "that", "the", "this", "to", "was",
+    "what", "which", "with", "i", "my", "me", "do", "does", "how", "can", "will",
+}
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+class Chunk:
+    def __init__(self, position, article, title, text):
+        self.position = position
+        self.article = article
+        self.title = title
+        self.text = text
+        self.tokens = tokenize(f"{title} {text}")
+
+    def render(self):
+        return f"== {self.article} == {self.title}\n{self.text}".rstrip()
+
+
+def split_articles(rules_text):
+    """Return (article, title, body) tuples, one per `== ... ==` section."""
+    articles = []
+    current = None
+    preamble = []
+    for line in rules_text.splitlines():
+        match = HEADER_RE.match(line)
+        if match:
+            if current:
+                articles.append(current)
+            current = [match.group(1), match.group(2), []]
+            continue
+        if current is None:
+            preamble.append(line)
+        else:
+            current[2].append(line)
+    if current:
+        articles.append(current)
+    if any(l.strip() for l in preamble):
+        articles.insert(0, ["Preamble", "", preamble])
+    return [(name, title, "\n".join(lines).strip()) for name, title, lines in articles]
+
+
+def split_clauses(body, max_chars):
+    """Group the lines of an article into clauses no longer than max_chars."""
+    clauses = []
+    current = []
+    size = 0
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        starts_clause = CLAUSE_START_RE.match(line.strip())
+        if current and (starts_clause and size >= max_chars // 4 or size + len(line) > max_chars):
+            clauses.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        clauses.append("\n".join(current))
+    return clauses
+
+
+class RegulationIndex:
+    def __init__(self, rules_text, chunk_chars=1500, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.chunks = []
+        for article, title, body in split_articles(rules_text):
+            for clause in split_clauses(body, chunk_chars) or [""]:
+                self.chunks.append(Chunk(len(self.chunks), article, title, clause))
+
+        self.term_freqs = [Counter(c.tokens) for c in self.chunks]
+        self.doc_lens = [len(c.tokens) for c in self.chunks]
+        self.avg_len = (sum(self.doc_lens) / len(self.doc_lens)) if self.chunks else 0.0
+        doc_freq = Counter()
+        for tf in self.term_freqs:
+            doc_freq.update(tf.keys())
+        n = len(self.chunks)
+        self.idf = {t: math.log(1 + (n - df + 0.5) / (df + 0.5)) for t, df in doc_freq.items()}
+
+    def score(self, query_tokens):
+        scores = [0.0] * len(self.chunks)
+        for term in set(query_tokens):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for i, tf in enumerate(self.term_freqs):
+                freq = tf.get(term)
+                if not freq:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lens[i] / (self.avg_len or 1))
+                scores[i] += idf * freq * (self.k1 + 1) / (freq + norm)
+        return scores
+
+    def search(self, question, top_k=4, max_chars=12000, in_order=True):
+        """Return the best chunks for a question, capped at max_chars.
+
+        Chunks come back in regulation order, or best match first when in_order is False.
+        """
+        scores = self.score(tokenize(question))
+        ranked = sorted(
+            (i for i, s in enumerate(scores) if s > 0),
+            key=lambda i: scores[i],
+            reverse=True,
+        )
+        picked = []
+        used = 0
+        for i in ranked:
+            if len(picked) >= top_k:
+                break
+            size = len(self.chunks[i].render())
+            if picked and used + size > max_chars:
+                continue
+            picked.append(i)
+            used += size
+        return [self.chunks[i] for i in (sorted(picked) if in_order else picked)]
+
+
+def build_context(chunks):
+    return "\n\n".join(c.render() for c in chunks)
+
+
+def articles_used(chunks):
+    seen = []
+    for c in chunks:
+        if c.article not in seen:
+            seen.append(c.article)
+    return seen
@@ -0,0 +1,180 @@
+import re
+
+# Structured lookups parsed out of Internal_Regulation_EN.txt (grade tables,
+# credit-hour thresholds, registration limits, observation/warning rules) and a
+# small intent matcher that answers those questions without calling the LLM.
+
+GRADE_ROW_RE = re.compile(
+    r"^(?P<label>[A-Za-z ]+): GPA (?P<gpa>\d\.\d), Letter (?P<letter>[A-F][+-]?), "
+    r"Percentage (?:(?P<low>\d+)% (?:to less than (?P<high>\d+)%|and above)|below (?P<below>\d+)%)"
+    r"(?: \((?P<result>passed|failed)\))?",
+    re.MULTILINE,
+)
+LEVEL_RE = re.compile(r"The (\w+) level:.*?\"\s*(\w+)\s*\"\s*(before|after) completing(?: it)? (\d+) credit hours", re.IGNORECASE)
+GRADUATION_RE = re.compile(r"successfully pass (\d+) hours")
+SUB_SPECIALIZATION_RE = re.compile(r"additional (\d+) credit hours of sub")
+REGISTRATION_RE = re.compile(r"minimum approved hours for registration in each semester is (\d+) credit hours, and the maximum is (\d+)")
+OBSERVATION_HOURS_RE = re.compile(r"academic observation is not allowed to register for more than \((\d+)\) credit hours")
+OBSERVATION_GPA_RE = re.compile(r"cumulative rate is less than \((\d\.\d+)\)")
+WARNING_RE = re.compile(r"absence in the course to (\d+)%.*?\n?The percentage is (\d+)%", re.DOTALL)
+
+LEVEL_ORDINALS = {"first": 1, "second": 2, "third": 3, "fourth": 4}
+
+
+class RegulationTables:
+    def __init__(self, rules_text):
+        self.course_grades = []
+        self.general_grades = []
+        for match in GRADE_ROW_RE.finditer(rules_text):
+            row = {
+                "label": match.group("label").strip(),
+                "gpa": float(match.group("gpa")),
+                "letter": match.group("letter"),
+                "min_percent": int(match.group("low")) if match.group("low") else 0,
+                "max_percent": int(match.group("high") or match.group("below") or 100),
+                "passed": match.group("result") != "failed" if match.group("result") else match.group("letter") != "F",
+            }
+            (self.general_grades if match.group("result") else self.course_grades).append(row)
+
+        self.levels = []
+        for ordinal, name, when, hours in LEVEL_RE.findall(rules_text):
+            self.levels.append({
+                "level": LEVEL_ORDINALS.get(ordinal.lower()),
+                "name": name.capitalize(),
+                "min_hours": 0 if when.lower() == "before" else int(hours),
+            })
+        self.levels.sort(key=lambda l: l["min_hours"])
+
+        self.graduation_hours = _first_int(GRADUATION_RE, rules_text)
+        self.sub_specialization_hours = _first_int(SUB_SPECIALIZATION_RE, rules_text)
+        registration = REGISTRATION_RE.search(rules_text)
+        self.min_registration = int(registration.group(1)) if registration else None
+        self.max_registration = int(registration.group(2)) if registration else None
+        self.observation_max_hours = _first_int(OBSERVATION_HOURS_RE, rules_text)
+        observation_gpa = OBSERVATION_GPA_RE.search(rules_text)
+        self.observation_gpa = float(observation_gpa.group(1)) if observation_gpa else None
+        warning = WARNING_RE.search(rules_text)
+        self.warning_absence = int(warning.group(1)) if warning else None
+        self.deprivation_absence = int(warning.group(2)) if warning else None
+
+    def grade_for_gpa(self, gpa, general=True):
+        table = self.general_grades if general and self.general_grades else self.course_grades
+        for row in sorted(table, key=lambda r: r["gpa"], reverse=True):
+            if gpa + 1e-9 >= row["gpa"]:
+                return row
+        return None
+
+    def grade_for_percent(self, percent):
+        for row in sorted(self.course_grades, key=lambda r: r["min_percent"], reverse=True):
+            if percent >= row["min_percent"]:
+                return row
+        return None
+
+    def level_for_hours(self, hours):
+        current = None
+        for level in self.levels:
+            if hours >= level["min_hours"]:
+                current = level
+        return current
+
+
+def _first_int(pattern, text):
+    match = pattern.search(text)
+    return int(match.group(1)) if match else None
+
+
+NUMBER_RE = r"(\d+(?:\.\d+)?)"
+GPA_Q_RE = re.compile(r"\b(?:gpa|cgpa|cumulative (?:average|rate)|average)\b[^\d]{0,20}" + NUMBER_RE, re.IGNORECASE)
+PERCENT_Q_RE = re.compile(NUMBER_RE + r"\s*(?:%|percent)", re.IGNORECASE)
+HOURS_Q_RE = re.compile(NUMBER_RE + r"\s*(?:credit\s*)?(?:hours|hrs|credits)\b", re.IGNORECASE)
+LETTER_WORDS_RE = re.compile(r"\b(letter|grade|estimate|appreciation|equivalent|rating)\b", re.IGNORECASE)
+LEVEL_WORDS_RE = re.compile(r"\b(level|year|sophomore|junior|senior|beginner|freshman)\b", re.IGNORECASE)
+GRADUATE_WORDS_RE = re.compile(r"\bgraduat\w*\b", re.IGNORECASE)
+HOW_MANY_HOURS_RE = re.compile(r"\bhow many\b.*\b(hours|credits)\b", re.IGNORECASE)
+REGISTER_WORDS_RE = re.compile(r"\bregist\w*\b", re.IGNORECASE)
+LIMIT_WORDS_RE = re.compile(r"\b(max\w*|min\w*|most|least|limit|how many)\b", re.IGNORECASE)
+OBSERVATION_WORDS_RE = re.compile(r"\b(observation|probation|warn\w*|dismiss\w*|separat\w*|absen\w*|attendance)\b", re.IGNORECASE)
+
+
+def _grade_answer(row, value, unit):
+    status = "passing" if row["passed"] else "failing"
+    return (
+        f"A {unit} of {value} corresponds to letter {row['letter']} ({row['label']}, "
+        f"{row['gpa']:.1f} points), which is a {status} grade according to Article (14)."
+    )
+
+
+def match_structured_question(tables, question):
+    """Return {"answer", "articles"} for table lookups, or None to fall through to the LLM."""
+    text = question.strip()
+
+    gpa = GPA_Q_RE.search(text)
+    if gpa and LETTER_WORDS_RE.search(text):
+        value = float(gpa.group(1))
+        if 0 <= value <= 4:
+            row = tables.grade_for_gpa(value)
+            if row:
+                return {"answer": _grade_answer(row, value, "GPA"), "articles": ["Article (14)"]}
+
+    percent = PERCENT_Q_RE.search(text)
+    if percent and LETTER_WORDS_RE.search(text) and not OBSERVATION_WORDS_RE.search(text):
+        value = float(percent.group(1))
+        if 0 <= value <= 100:
+            row = tables.grade_for_percent(value)
+            if row:
+                return {"answer": _grade_answer(row, f"{percent.group(1)}%", "score"), "articles": ["Article (14)"]}
+
+    hours = HOURS_Q_RE.search(text)
+    if hours and LEVEL_WORDS_RE.search(text) and tables.levels:
+        level = tables.level_for_hours(float(hours.group(1)))
+        if level:
+            return {
+                "answer": (
+                    f"With {hours.group(1)} completed credit hours you are at level {level['level']} "
+                    f"(\"{level['name']}\"), according to Article (5)."
+                ),
+                "articles": ["Article (5)"],
+            }
+
+    if GRADUATE_WORDS_RE.search(text) and HOW_MANY_HOURS_RE.search(text) and tables.graduation_hours:
+        answer = f"You must successfully pass {tables.graduation_hours} credit hours over at least eight semesters to graduate"
+        if tables.sub_specialization_hours:
+            answer += f", plus an additional {tables.sub_specialization_hours} credit hours if you choose a sub-specialization"
+        return {"answer": answer + " (Article (5)).", "articles": ["Article (5)"]}
+
+    if REGISTER_WORDS_RE.search(text) and LIMIT_WORDS_RE.search(text) and tables.max_registration:
+        answer = (
+            f"The minimum registration is {tables.min_registration} credit hours per semester and the maximum is "
+            f"{tables.max_registration} (Article (8))."
+        )
+        articles = ["Article (8)"]
+        if tables.observation_max_hours:
+            answer += (
+                f" Students under academic observation may not register for more than "
+                f"{tables.observation_max_hours} credit hours (Article (17))."
+            )
+            articles.append("Article (17)")
+        return {"answer": answer, "articles": articles}
+
+    if OBSERVATION_WORDS_RE.search(text) and re.search(r"\b(when|what|how|rule|rules)\b", text, re.IGNORECASE):
+        if re.search(r"absen|attendance|warn", text, re.IGNORECASE) and tables.warning_absence:
+            return {
+                "answer": (
+                    f"A warning is sent when your absence in a course reaches {tables.warning_absence}%. "
+                    f"At {tables.deprivation_absence}% you are barred from the final exam and get 0.0 in the "
+                    f"course (Articles (11) and (18))."
+                ),
+                "articles": ["Article (11)", "Article (18)"],
+            }
+        if tables.observation_gpa:
+            return {
+                "answer": (
+                    f"You are placed under academic observation if your cumulative GPA falls below "
+                    f"{tables.observation_gpa:.1f}. You must raise it to at least {tables.observation_gpa:.1f} "
+                    f"within three consecutive semesters, and while under observation you may register at most "
+                    f"{tables.observation_max_hours} credit hours (Article (17))."
+                ),
+                "articles": ["Article (17)"],
+            }
+
+    return None
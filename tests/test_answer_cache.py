@@ -0,0 +1,63 @@
+import pytest
+
+import answer_cache
+import chatbot_Gem
+from llm_backends import FakeBackend
+
+QUESTION = "What happens if a student misses the final exam?"
+
+
+class FailingBackend:
+    def stream(self, prompt, timeout=None):
+        yield "The student "
+        raise TimeoutError("stream dropped")
+
+
+class EmptyBackend:
+    def stream(self, prompt, timeout=None):
+        return iter(["", "  "])
+
+
+@pytest.fixture
+def stored(monkeypatch):
+    calls = []
+    monkeypatch.setattr(answer_cache, "get_cached_answer", lambda question: None)
+    monkeypatch.setattr(answer_cache, "store_answer", lambda question, result: calls.append((question, result)))
+    monkeypatch.setattr(chatbot_Gem, "_backend", FakeBackend(latency_ms=0, answer_words=30, chunks=4, seed=1))
+    return calls
+
+
+def test_completed_stream_is_cached(stored):
+    articles, stats, cached, parts = answer_cache.stream_cached_answer_rule_question(QUESTION)
+    answer = "".join(parts).strip()
+    assert not cached and answer.startswith("(offline answer)")
+    assert stored == [(QUESTION, {"answer": answer, "articles": articles})]
+
+
+def test_aborted_stream_is_not_cached(stored):
+    _, _, _, parts = answer_cache.stream_cached_answer_rule_question(QUESTION)
+    next(parts)
+    parts.close()  # what a client disconnect does to the response generator
+    assert stored == []
+
+
+def test_failed_stream_is_not_cached(stored):
+    chatbot_Gem.set_llm_backend(FailingBackend())
+    _, _, _, parts = answer_cache.stream_cached_answer_rule_question(QUESTION)
+    with pytest.raises(TimeoutError):
+        list(parts)
+    assert stored == []
+
+
+def test_empty_answer_is_not_cached(stored):
+    chatbot_Gem.set_llm_backend(EmptyBackend())
+    _, _, _, parts = answer_cache.stream_cached_answer_rule_question(QUESTION)
+    assert "".join(parts).strip() == ""
+    assert stored == []
+
+
+def test_follow_up_questions_are_not_cached(stored):
+    history = [("user", "Hello"), ("bot", "Hi")]
+    _, _, _, parts = answer_cache.stream_cached_answer_rule_question(QUESTION, history=history)
+    list(parts)
+    assert stored == []
@@ -0,0 +1,261 @@
+import base64
+import shutil
+import smtplib
+import socketserver
+import ssl
+import subprocess
+import threading
+
+import pytest
+
+import email_utils
+from email_utils import SMTPPool, build_message
+
+
+class FakeSMTP:
+    """Stands in for smtplib.SMTP; refuses recipients in `refuse`, drops after `drop_after` sends."""
+
+    instances = []
+    refuse = set()
+    drop_after = None
+    fail_login = False
+
+    def __init__(self, host, port, timeout=None):
+        self.sent = []
+        self.closed = False
+        FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        if FakeSMTP.fail_login:
+            raise smtplib.SMTPAuthenticationError(535, b"bad credentials")
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        if self.closed:
+            raise smtplib.SMTPServerDisconnected("closed")
+        if to_addrs[0] in FakeSMTP.refuse:
+            raise smtplib.SMTPRecipientsRefused({to_addrs[0]: (550, b"no such user")})
+        if FakeSMTP.drop_after is not None and len(self.sent) >= FakeSMTP.drop_after:
+            raise smtplib.SMTPDataError(451, b"try again later")
+        self.sent.append(to_addrs[0])
+        return {}
+
+    def noop(self):
+        return (250, b"ok")
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    FakeSMTP.instances = []
+    FakeSMTP.refuse = set()
+    FakeSMTP.drop_after = None
+    FakeSMTP.fail_login = False
+    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+    pool = SMTPPool("smtp.test", 587, user="u", password="p", size=1)
+    monkeypatch.setattr(email_utils, "smtp_pool", pool)
+    return pool
+
+
+def messages(*recipients):
+    built = [build_message(to, "subject", "body") for to in recipients]
+    for msg in built:
+        # EMAIL_USER is unset under test; a real server needs a sender address
+        del msg["From"]
+        msg["From"] = "noreply@x"
+    return built
+
+
+def test_batches_reuse_one_connection(pool):
+    assert pool.send_many(messages("a@x", "b@x")) == 2
+    assert pool.send_many(messages("c@x")) == 1
+    assert len(FakeSMTP.instances) == 1
+    assert FakeSMTP.instances[0].sent == ["a@x", "b@x", "c@x"]
+    assert pool.stats["connects"] == 1 and pool.stats["reuses"] == 1
+
+
+def test_refused_recipients_are_not_counted_as_sent(pool):
+    FakeSMTP.refuse = {"b@x"}
+    sent = email_utils.send_many([(to, "subject", "body") for to in ("a@x", "b@x", "c@x")])
+    assert sent == 2
+    assert pool.stats["sent"] == 2 and pool.stats["refused"] == 1
+    assert email_utils.send_notification_email("b@x", "subject", "body") is False
+
+
+def test_partial_failure_returns_count_already_sent(pool):
+    FakeSMTP.drop_after = 2
+    sent = email_utils.send_many([(to, "subject", "body") for to in ("a@x", "b@x", "c@x", "d@x")])
+    assert sent == 2
+    # The broken session is discarded rather than returned to the pool
+    assert pool.idle == [] and FakeSMTP.instances[0].closed
+    assert pool.slots.acquire(blocking=False)
+
+
+def test_login_failure_closes_the_socket(pool):
+    FakeSMTP.fail_login = True
+    with pytest.raises(smtplib.SMTPAuthenticationError):
+        pool.send_many(messages("a@x"))
+    assert FakeSMTP.instances[0].closed
+    assert pool.slots.acquire(blocking=False)
+
+
+# The same pool against a real SMTP conversation on localhost: EHLO, STARTTLS,
+# AUTH PLAIN, NOOP, refused RCPT and a server that hangs up between messages.
+
+class LocalSMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+        self.wfile.flush()
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        tls = False
+        delivered = 0
+        self.reply("220 localhost ESMTP test server")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().rstrip("\r\n")
+            verb, _, arg = command.partition(" ")
+            verb = verb.upper()
+            if verb in ("EHLO", "HELO"):
+                lines = ["localhost"]
+                if server.context and not tls:
+                    lines.append("STARTTLS")
+                lines.append("AUTH PLAIN")
+                for extension in lines[:-1]:
+                    self.reply(f"250-{extension}")
+                self.reply(f"250 {lines[-1]}")
+            elif verb == "STARTTLS":
+                self.reply("220 ready to start TLS")
+                self.request = server.context.wrap_socket(self.request, server_side=True)
+                self.rfile = self.request.makefile("rb")
+                self.wfile = self.request.makefile("wb")
+                tls = True
+            elif verb == "AUTH":
+                _, user, password = base64.b64decode(arg.split(" ", 1)[1]).decode().split("\0")
+                with server.lock:
+                    server.logins.append((user, tls))
+                self.reply("235 ok" if (user, password) == ("user", "secret") else "535 bad credentials")
+            elif verb == "RCPT":
+                address = arg.split(":", 1)[1].strip("<> ")
+                self.reply("550 no such user" if address in server.refuse else "250 ok")
+            elif verb == "DATA":
+                self.reply("354 go ahead")
+                body = []
+                for data in iter(self.rfile.readline, b""):
+                    if data == b".\r\n":
+                        break
+                    body.append(data)
+                with server.lock:
+                    server.messages.append(b"".join(body))
+                self.reply("250 queued")
+                delivered += 1
+                if server.max_per_connection and delivered >= server.max_per_connection:
+                    return  # hang up without QUIT, like a server recycling sessions
+            elif verb == "NOOP":
+                with server.lock:
+                    server.noops += 1
+                self.reply("250 ok")
+            elif verb == "QUIT":
+                self.reply("221 bye")
+                return
+            else:  # MAIL, RSET
+                self.reply("250 ok")
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, context=None):
+        super().__init__(("127.0.0.1", 0), LocalSMTPHandler)
+        self.context = context
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.logins = []
+        self.messages = []
+        self.noops = 0
+        self.refuse = set()
+        self.max_per_connection = None
+
+
+def self_signed_context(directory):
+    if not shutil.which("openssl"):
+        return None
+    cert, key = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                    "-subj", "/CN=localhost", "-keyout", str(key), "-out", str(cert)],
+                   check=True, capture_output=True)
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+@pytest.fixture(scope="module")
+def tls_context(tmp_path_factory):
+    return self_signed_context(tmp_path_factory.mktemp("smtp-tls"))
+
+
+@pytest.fixture
+def smtp_server(tls_context):
+    server = LocalSMTPServer(tls_context)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def local_pool(smtp_server):
+    pool = SMTPPool("127.0.0.1", smtp_server.server_address[1], user="user", password="secret",
+                    use_tls=smtp_server.context is not None, size=1, timeout=5)
+    yield pool
+    pool.close()
+
+
+def test_local_server_session_is_reused(smtp_server, local_pool):
+    assert local_pool.send_many(messages("a@x", "b@x")) == 2
+    assert local_pool.send_many(messages("c@x")) == 1
+    assert smtp_server.connections == 1
+    assert smtp_server.logins == [("user", smtp_server.context is not None)]
+    assert len(smtp_server.messages) == 3
+
+
+def test_local_server_idle_session_is_checked_with_noop(smtp_server, local_pool):
+    local_pool.idle_check = 0
+    local_pool.send_many(messages("a@x"))
+    local_pool.send_many(messages("b@x"))
+    assert smtp_server.noops == 1 and smtp_server.connections == 1
+
+
+def test_local_server_hangup_reconnects_and_resends(smtp_server, local_pool):
+    smtp_server.max_per_connection = 2
+    assert local_pool.send_many(messages("a@x", "b@x", "c@x")) == 3
+    assert smtp_server.connections == 2 and len(smtp_server.messages) == 3
+    assert local_pool.stats["reconnects"] == 1
+
+
+def test_local_server_refused_recipient_is_skipped(smtp_server, local_pool):
+    smtp_server.refuse = {"b@x"}
+    assert local_pool.send_many(messages("a@x", "b@x", "c@x")) == 2
+    assert local_pool.stats["refused"] == 1 and smtp_server.connections == 1
+
+
+def test_local_server_bad_login_closes_the_socket(smtp_server):
+    pool = SMTPPool("127.0.0.1", smtp_server.server_address[1], user="user", password="wrong",
+                    use_tls=smtp_server.context is not None, size=1, timeout=5)
+    with pytest.raises(smtplib.SMTPAuthenticationError):
+        pool.send_many(messages("a@x"))
+    assert pool.idle == [] and pool.slots.acquire(blocking=False)
@@ -0,0 +1,179 @@
+import hashlib
+import mimetypes
+import os
+import re
+import tempfile
+from flask import Request, current_app, request, send_from_directory, make_response
+from werkzeug.exceptions import RequestEntityTooLarge, NotFound
+from werkzeug.security import safe_join
+from werkzeug.utils import secure_filename
+
+# Content-addressed upload storage. The multipart parser writes each uploaded
+# file straight into a HashingSpool on the uploads volume, which hashes (SHA-256)
+# and counts bytes as they arrive and aborts with 413 once UPLOAD_MAX_BYTES is
+# passed. Stored files are named <sha256>.<ext>, so identical uploads share one
+# file and two students' report.pdf never overwrite each other.
+
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+# Whole-request cap (checked against Content-Length before reading): one file plus the form fields
+UPLOAD_MAX_REQUEST_BYTES = UPLOAD_MAX_BYTES + 64 * 1024
+UPLOAD_CHUNK_BYTES = 64 * 1024
+PUBLIC_BASE_URL = os.getenv("PUBLIC_BASE_URL", "https://web-production-93bbb.up.railway.app").rstrip("/")
+
+# How stored files are sent: "direct" streams them from the worker (with Range
+# support), "x-accel" hands nginx an internal redirect to UPLOAD_ACCEL_PREFIX,
+# "x-sendfile" sets X-Sendfile for Apache/lighttpd. In both proxy modes the
+# worker only checks the request and returns headers.
+#
+# nginx drops the upstream ETag on an X-Accel-Redirect and sends its own
+# mtime/size one, so clients would never send the content hash back and the
+# worker's 304 check above the redirect would never hit. Have the internal
+# location send the hash itself (Cache-Control from the worker is kept):
+#
+#   location ~ ^/protected-uploads/(complaints|suggestions)/(([0-9a-f]{64})(?:\.[a-z0-9]+)?)$ {
+#       internal;
+#       alias /app/static/uploads/$1/$2;
+#       etag off;
+#       add_header ETag "\"$3\"";
+#   }
+#   location /protected-uploads/ {   # files stored before content addressing
+#       internal;
+#       alias /app/static/uploads/;
+#   }
+UPLOAD_SERVE_MODE = os.getenv("UPLOAD_SERVE_MODE", "direct").lower()
+UPLOAD_ACCEL_PREFIX = os.getenv("UPLOAD_ACCEL_PREFIX", "/protected-uploads").rstrip("/")
+# Content-addressed names never change content, so they may be cached forever.
+# Uploads are students' own files: browsers may keep them, shared caches may not.
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+LEGACY_MAX_AGE = int(os.getenv("UPLOAD_LEGACY_MAX_AGE", 3600))
+HASHED_NAME_RE = re.compile(r"^([0-9a-f]{64})(\.[a-z0-9]+)?$")
+EXTENSION_RE = re.compile(r"[a-z0-9]{1,16}")
+
+
+class HashingSpool:
+    """Temporary upload file that hashes and size-checks everything written to it."""
+
+    def __init__(self, directory, max_bytes=UPLOAD_MAX_BYTES):
+        os.makedirs(directory, exist_ok=True)
+        self._file = tempfile.NamedTemporaryFile(dir=directory, prefix="upload-", delete=False)
+        self.path = self._file.name
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._stored = False
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            self.close()
+            raise RequestEntityTooLarge(f"Uploaded files are limited to {self.max_bytes / (1024 * 1024):g} MB")
+        self._hash.update(data)
+        return self._file.write(data)
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+    def store(self, folder, extension):
+        """Move the upload to folder/<sha256>.<ext> (or drop it if that file exists); returns the name."""
+        name = self.hexdigest() + (f".{extension}" if extension else "")
+        final_path = os.path.join(folder, name)
+        self._file.flush()
+        os.makedirs(folder, exist_ok=True)
+        if os.path.exists(final_path):
+            os.unlink(self.path)
+        else:
+            # mkstemp files are owner-only; a front proxy may serve these directly
+            os.chmod(self.path, 0o644)
+            os.replace(self.path, final_path)
+        self._stored = True
+        return name
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+        if not self._stored and os.path.exists(self.path):
+            os.unlink(self.path)
+            self._stored = True
+
+    def __getattr__(self, name):
+        # read/seek/tell etc. for anything else that handles the FileStorage
+        return getattr(self._file, name)
+
+
+class UploadRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return HashingSpool(current_app.config["UPLOAD_TMP_FOLDER"])
+
+
+def init_uploads(app, upload_root):
+    app.request_class = UploadRequest
+    app.config["MAX_CONTENT_LENGTH"] = UPLOAD_MAX_REQUEST_BYTES
+    # Same filesystem as the upload folders so storing is an atomic rename
+    app.config["UPLOAD_TMP_FOLDER"] = os.path.join(upload_root, ".incoming")
+    app.config["USE_X_SENDFILE"] = UPLOAD_SERVE_MODE == "x-sendfile"
+
+
+def file_extension(filename):
+    # Taken from the raw name: secure_filename drops non-ASCII stems together with the dot
+    extension = os.path.splitext(filename or "")[1][1:].lower()
+    return extension if EXTENSION_RE.fullmatch(extension) else ""
+
+
+def store_upload(file, folder):
+    """Store an uploaded FileStorage under its content hash; returns (stored name, display name)."""
+    spool = file.stream
+    if not isinstance(spool, HashingSpool):
+        spool = HashingSpool(current_app.config["UPLOAD_TMP_FOLDER"])
+        try:
+            for chunk in iter(lambda: file.stream.read(UPLOAD_CHUNK_BYTES), b""):
+                spool.write(chunk)
+        except Exception:
+            spool.close()
+            raise
+    try:
+        stored_name = spool.store(folder, file_extension(file.filename))
+    finally:
+        spool.close()
+    return stored_name, secure_filename(file.filename)
+
+
+def public_upload_url(kind, stored_name):
+    return f"{PUBLIC_BASE_URL}/static/uploads/{kind}/{stored_name}"
+
+
+def _cache_headers(response, content_hash):
+    response.cache_control.private = True
+    if content_hash:
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.max_age = LEGACY_MAX_AGE
+    return response
+
+
+def serve_upload(folder, kind, filename):
+    """Response for /static/uploads/<kind>/<filename>, honouring If-None-Match and Range."""
+    path = safe_join(folder, filename)
+    if path is None or not os.path.isfile(path):
+        raise NotFound()
+
+    match = HASHED_NAME_RE.match(filename)
+    # Files stored before content addressing keep the default mtime/size ETag
+    content_hash = match.group(1) if match else None
+
+    if content_hash and request.if_none_match.contains(content_hash):
+        response = make_response("", 304)
+        response.set_etag(content_hash)
+        return _cache_headers(response, content_hash)
+
+    if UPLOAD_SERVE_MODE == "x-accel":
+        response = make_response("")
+        response.headers["X-Accel-Redirect"] = f"{UPLOAD_ACCEL_PREFIX}/{kind}/{filename}"
+        response.headers["Content-Type"] = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        if content_hash:
+            response.set_etag(content_hash)
+        return _cache_headers(response, content_hash)
+
+    # send_file answers Range requests with 206 and, in x-sendfile mode, sends only the header
+    response = send_from_directory(folder, filename, etag=content_hash or True, conditional=True)
+    return _cache_headers(response, content_hash)